@@ -6,7 +6,17 @@ import useTranslation from '../hooks/useTranslation'
 import { shuffleArray } from '../utils/practiceUtils'
 import { getVocabulary, getVocabularyWords } from '../utils/vocabularyUtils'
 import './FillBlanks.css'
-import useInflections from '../utils/inflections'
+import useInflections, {
+  useExamples,
+  useFormIndex,
+  useForms,
+  exampleTokens,
+  entryForm,
+  formFor,
+  lookupForm,
+  morphFromHit,
+  pickFormHit
+} from '../utils/inflections'
 import SpeakerIcon from './SpeakerIcon'
 
 // Helper component to render word tooltip
@@ -63,6 +73,13 @@ export default function FillBlanks() {
   const allWords = getVocabularyWords(language)
   const vocabularyDataForLang = getVocabulary(language)
   const inflections = useInflections(language)
+  const formIndex = useFormIndex(language)
+  const examples = useExamples(language)
+  const forms = useForms(language)
+  const wordsById = useMemo(
+    () => new Map((vocabularyDataForLang.words || []).map(w => [w.id, w])),
+    [vocabularyDataForLang]
+  )
 
   const blankCount = settings.fillBlanks.blankCount
   const distractorCount = settings.fillBlanks.distractorCount
@@ -108,7 +125,13 @@ export default function FillBlanks() {
 
   // Look up a word in the vocabulary and inflections database
   const lookupWord = useCallback((wordText) => {
-    if (!vocabularyDataForLang || !inflections) return null
+    if (!vocabularyDataForLang || !(formIndex || inflections)) return null
+
+    // Prebuilt reverse index: a single hash probe
+    if (formIndex) {
+      const hit = pickFormHit(lookupForm(formIndex, wordText))
+      return hit ? wordsById.get(hit[0]) || null : null
+    }
 
     const wordNorm = normalize(wordText)
     const allVocabWords = vocabularyDataForLang.words || []
@@ -140,7 +163,7 @@ export default function FillBlanks() {
     }
 
     return null
-  }, [vocabularyDataForLang, inflections])
+  }, [vocabularyDataForLang, inflections, formIndex, wordsById])
 
   // Generate an exercise by picking a random word and creating blanks
   const generateExercise = useCallback(() => {
@@ -149,7 +172,9 @@ export default function FillBlanks() {
     // Pick a random word
     const selectedWord = filteredWords[Math.floor(Math.random() * filteredWords.length)]
     const example = selectedWord.example
-    const words = example.split(/\s+/)
+    // Pre-annotated tokens, when the precompute tools covered this sentence
+    const annotated = exampleTokens(examples, example)
+    const words = annotated ? annotated.map(tok => tok.text) : example.split(/\s+/)
 
     // Find the index of the selected word in the sentence to ensure it's always a blank
     const selectedWordIndex = words.findIndex(w =>
@@ -176,12 +201,13 @@ export default function FillBlanks() {
       return false
     }
     // Prefer indices that are not trivial tokens
-    let availableIndices = allIndices.filter(idx => !isStopToken(words[idx]))
+    const isStopIndex = (idx) => (annotated ? annotated[idx].stop : isStopToken(words[idx]))
+    let availableIndices = allIndices.filter(idx => !isStopIndex(idx))
     // If filtering removes everything, fall back to all indices
     if (availableIndices.length === 0) availableIndices = allIndices
     const numBlanks = Math.min(blankCount, availableIndices.length)
     // Start with the selected word's index only if it's not a trivial token
-    let blankIndices = selectedWordIndex >= 0 && !isStopToken(words[selectedWordIndex]) ? [selectedWordIndex] : []
+    let blankIndices = selectedWordIndex >= 0 && !isStopIndex(selectedWordIndex) ? [selectedWordIndex] : []
     // Add additional random indices to reach numBlanks
     if (numBlanks > blankIndices.length) {
       const remainingIndices = availableIndices.filter(idx => !blankIndices.includes(idx))
@@ -198,15 +224,25 @@ export default function FillBlanks() {
     const newBlanks = blankIndices.map((idx) => {
       const rawToken = words[idx]
       const punctMatch = rawToken.match(/[^a-zäöüßA-ZÄÖÜ]+$/)
-      const trailingPunct = punctMatch ? punctMatch[0] : ''
+      const trailingPunct = annotated ? annotated[idx].trailing : (punctMatch ? punctMatch[0] : '')
       const wordFromSentence = rawToken.replace(/[^a-zäöüßA-ZÄÖÜ]/g, '')
       const normSentence = normalize(wordFromSentence)
       
       // Try to match using observed forms first (if inflections available)
       let wordData = null
       let matchedViaObserved = false
+
+      // Prebuilt reverse index: a single hash probe replaces the scans below
+      const hasIndex = Boolean(annotated || formIndex)
+      if (annotated) {
+        const hit = annotated[idx].hit
+        wordData = hit ? wordsById.get(hit[0]) || null : null
+      } else if (hasIndex) {
+        const hit = pickFormHit(lookupForm(formIndex, wordFromSentence))
+        wordData = hit ? wordsById.get(hit[0]) || null : null
+      }
       
-      if (inflections && inflections.inflections) {
+      if (!hasIndex && inflections && inflections.inflections) {
         for (const [key, entry] of Object.entries(inflections.inflections)) {
           if (key === '__meta') continue
           const observed = entry.observed || []
@@ -231,7 +267,7 @@ export default function FillBlanks() {
       }
       
       // Fallback: try matching against generated inflections (if available)
-      if (!wordData && inflections && inflections.inflections) {
+      if (!wordData && !hasIndex && inflections && inflections.inflections) {
         for (const [k, entry] of Object.entries(inflections.inflections)) {
           if (k === '__meta') continue
           const lemma = entry.lemma || entry.base || k
@@ -286,8 +322,8 @@ export default function FillBlanks() {
         }
       }
       // Determine target morphological form (to inflect distractors similarly)
-      let targetMorph = null
-      if (inflections && inflections.inflections && wordData) {
+      let targetMorph = annotated ? morphFromHit(annotated[idx].hit, language) : null
+      if (!annotated && inflections && inflections.inflections && wordData) {
         const key = normalize(wordData.word)
         const entry = inflections.inflections[key] || inflections.inflections[normalize(stripArticle(wordData.word))]
         
@@ -383,32 +419,18 @@ export default function FillBlanks() {
     for (const cand of shuffledCandidates) {
       if (distractors.length >= distractorCount) break
 
-      // Try to pick a form for this candidate that matches any blank's targetMorph
+      // Pick the candidate's form in the first blank's cell the form table has,
+      // reading the inflection entry while the table is missing
       let candidateDisplay = null
-      if (language === 'de' && inflections && inflections.inflections) {
-        const candKey = normalize(cand.word)
-        const candEntry = inflections.inflections[candKey] || inflections.inflections[normalize(stripArticle(cand.word))]
-        if (candEntry) {
-          for (const blank of newBlanks) {
-            const tm = blank.targetMorph
-            if (!tm) continue
-            if (tm.type === 'plural' && candEntry.plural) {
-              candidateDisplay = candEntry.plural
-              break
-            }
-            if (tm.type === 'past_participle' && candEntry.past_participle) {
-              candidateDisplay = candEntry.past_participle
-              break
-            }
-            if (tm.type === 'present' && candEntry.present && candEntry.present[tm.person]) {
-              candidateDisplay = candEntry.present[tm.person]
-              break
-            }
-            if (tm.type === 'preterite' && candEntry.preterite && candEntry.preterite[tm.person]) {
-              candidateDisplay = candEntry.preterite[tm.person]
-              break
-            }
-          }
+      if (language === 'de') {
+        const candEntry = !forms && inflections && inflections.inflections
+          ? inflections.inflections[normalize(cand.word)] || inflections.inflections[normalize(stripArticle(cand.word))]
+          : null
+        for (const blank of newBlanks) {
+          candidateDisplay = forms
+            ? formFor(forms, cand.id, blank.targetMorph)
+            : entryForm(candEntry, blank.targetMorph)
+          if (candidateDisplay) break
         }
       }
 
@@ -435,7 +457,7 @@ export default function FillBlanks() {
       blanks: newBlanks,
       options: shuffleArray(optionsList)
     }
-  }, [filteredWords, blankCount, distractorCount, vocabularyDataForLang.words, inflections, language])
+  }, [filteredWords, blankCount, distractorCount, vocabularyDataForLang.words, inflections, formIndex, examples, forms, wordsById, language])
 
   // Initialize exercise on mount
   useEffect(() => {
@@ -455,7 +477,7 @@ export default function FillBlanks() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [])
 
-  // Regenerate when blankCount, distractorCount, or language changes
+  // Regenerate when blankCount, distractorCount, language or any precomputed data changes
   useEffect(() => {
     const exercise = generateExercise()
     if (exercise) {
@@ -469,7 +491,7 @@ export default function FillBlanks() {
       setIsCorrect(false)
     }
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [blankCount, distractorCount, language, inflections])
+  }, [blankCount, distractorCount, language, inflections, formIndex, examples, forms])
 
   // Clear error feedback when user modifies filled blanks (try again)
   useEffect(() => {
@@ -5,6 +5,7 @@ import { useLanguageStore } from '../store/languageStore'
 import useTranslation from '../hooks/useTranslation'
 import { getRandomWords, getDistractors, shuffleArray, getRandomTranslation } from '../utils/practiceUtils'
 import { getVocabularyWords, getDirections } from '../utils/vocabularyUtils'
+import { useDistractors } from '../utils/inflections'
 import './MultipleChoice.css'
 import SpeakerIcon from './SpeakerIcon'
 import { shouldShowTTSForMultipleChoice } from '../utils/ttsUtils'
@@ -30,6 +31,7 @@ export default function MultipleChoice() {
   const { t } = useTranslation()
   const langDirections = getDirections(language)
   const allWords = getVocabularyWords(language)
+  const distractorIndex = useDistractors(language)
 
   const [currentWord, setCurrentWord] = useState(null)
   const [options, setOptions] = useState([])
@@ -75,7 +77,7 @@ export default function MultipleChoice() {
       const correct = getRandomTranslation(word)
 
       // Get distractors (other Hungarian translations)
-      const distractorWords = getDistractors(word, filteredWords, optionCount - 1)
+      const distractorWords = getDistractors(word, filteredWords, optionCount - 1, distractorIndex)
       const distractorOptions = distractorWords.map(w => getRandomTranslation(w))
 
       // Combine and shuffle
@@ -87,7 +89,7 @@ export default function MultipleChoice() {
       const hungarianPrompt = getRandomTranslation(word)
 
       // Get distractor English words
-      const distractorWords = getDistractors(word, filteredWords, optionCount - 1)
+      const distractorWords = getDistractors(word, filteredWords, optionCount - 1, distractorIndex)
       const distractorOptions = distractorWords.map(w => w.word)
 
       // Combine and shuffle
@@ -98,7 +100,7 @@ export default function MultipleChoice() {
 
       return { word: wordWithPrompt, options: allOptions, correctAnswer: word.word }
     }
-  }, [filteredWords, direction, optionCount, langDirections.toNative])
+  }, [filteredWords, direction, optionCount, langDirections.toNative, distractorIndex])
 
   // Generate first question on mount only
   useEffect(() => {
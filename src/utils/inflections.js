@@ -1,57 +1,190 @@
 import { useState, useEffect } from 'react'
 
-// Hook to load precomputed inflections for German and English (if available in public/data)
-// Returns null if not available or for unsupported languages.
+// Hooks to load precomputed data for German and English (if available in public/data).
+// They return null until loaded, if not available, or for unsupported languages.
 const cache = {}
+const manifests = {}
 
-export default function useInflections(language) {
-  const [data, setData] = useState(cache[language] || null)
+const stripLeadingSlash = (p) => p.replace(/^\/+/, '')
 
-  useEffect(() => {
-    let mounted = true
-    async function load() {
-      if (language !== 'de' && language !== 'en') {
-        if (mounted) setData(null)
-        return
-      }
+async function fetchJson(name, integrity) {
+  const base = import.meta.env.BASE_URL || '/'
+  const res = await fetch(`${base}${stripLeadingSlash(name)}`, integrity ? { integrity } : undefined)
+  if (!res.ok) throw new Error(`${res.status} ${name}`)
+  return res.json()
+}
 
-      if (cache[language]) {
-        if (mounted) setData(cache[language])
-        return
-      }
+// The manifest listing a language's content-hashed data files, or null when
+// there is none (hashed copies are made at build time). Fetched once per language.
+function loadManifest(language) {
+  if (!(language in manifests)) {
+    manifests[language] = fetchJson(`data/vocabulary-${language}-manifest.json`).catch(() => null)
+  }
+  return manifests[language]
+}
 
-      const base = import.meta.env.BASE_URL || '/'
-      const stripLeadingSlash = (p) => p.replace(/^\/+/, '')
-      
-      // Build candidate URLs based on language
-      const langCode = language === 'de' ? 'de' : 'en'
-      const candidates = [
-        `${base}${stripLeadingSlash(`data/vocabulary-${langCode}-inflections.json`)}`,
-        `${base}${stripLeadingSlash(`vocabulary-${langCode}-inflections.json`)}`,
-        `${base}${stripLeadingSlash(`vocab_${langCode}_inflections.json`)}`,
-        `${base}${stripLeadingSlash(`data/vocab_${langCode}_inflections.json`)}`
-      ]
-
-      let loaded = null
-      for (const url of candidates) {
-        try {
-          const res = await fetch(url)
-          if (res.ok) {
-            loaded = await res.json()
-            break
-          }
-        } catch {
-          // ignore and try next
-        }
+// Fetch a data file once per kind and language. Builds with a manifest (see
+// tools/hash_outputs.py) load only the content-hashed file it names, verified
+// against its integrity digest; a kind the manifest lacks is an error rather
+// than a silent fallback to stale plain files. Without a manifest (the dev
+// server), the first candidate file that exists is loaded.
+async function loadData(language, kind, names, transform = (data) => data) {
+  const key = `${kind}:${language}`
+  if (key in cache) return cache[key]
+  const manifest = await loadManifest(language)
+  let loaded = null
+  if (manifest) {
+    const file = manifest.files && manifest.files[kind]
+    if (!file) throw new Error(`${kind} is missing from the ${language} data manifest`)
+    loaded = transform(await fetchJson(`data/${file.path}`, file.integrity))
+  } else {
+    for (const name of names) {
+      try {
+        loaded = transform(await fetchJson(name))
+        break
+      } catch {
+        // ignore and try next
       }
-
-      cache[language] = loaded
-      if (mounted) setData(loaded)
     }
+  }
+  cache[key] = loaded
+  return loaded
+}
 
-    load()
+function usePrecomputed(language, kind, names, transform) {
+  const key = `${kind}:${language}`
+  const [data, setData] = useState(cache[key] || null)
+
+  useEffect(() => {
+    let mounted = true
+    if (language !== 'de' && language !== 'en') {
+      setData(null)
+      return () => { mounted = false }
+    }
+    loadData(language, kind, names(language), transform)
+      .then(loaded => {
+        if (mounted) setData(loaded)
+      })
+      .catch(error => console.error(`Could not load ${kind} data:`, error))
     return () => { mounted = false }
-  }, [language])
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [key])
 
   return data
 }
+
+const inflectionFiles = (lang) => [
+  `data/vocabulary-${lang}-inflections.json`,
+  `vocabulary-${lang}-inflections.json`,
+  `vocab_${lang}_inflections.json`,
+  `data/vocab_${lang}_inflections.json`
+]
+
+export default function useInflections(language) {
+  return usePrecomputed(language, 'inflections', inflectionFiles, expandAliases)
+}
+
+// Reverse surface-form index, kept in its own file so the inflections load faster
+export function useFormIndex(language) {
+  return usePrecomputed(language, 'index', (lang) => [`data/vocabulary-${lang}-index.json`])
+}
+
+// Example sentences pre-annotated by the precompute tools
+export function useExamples(language) {
+  return usePrecomputed(language, 'examples', (lang) => [`data/vocabulary-${lang}-examples.json`])
+}
+
+// Surface form of each vocabulary word per paradigm cell ("present.er", "plural")
+export function useForms(language) {
+  return usePrecomputed(language, 'forms', (lang) => [`data/vocabulary-${lang}-forms.json`])
+}
+
+// Ranked distractor candidates per word id, built by tools/precompute_distractors.py
+export function useDistractors(language) {
+  return usePrecomputed(language, 'distractors', (lang) => [`data/vocabulary-${lang}-distractors.json`])
+}
+
+// Re-link alias keys of the compact layout to their canonical entries.
+// Entries are shared, not copied, so lookups by alias behave as before.
+export function expandAliases(data) {
+  if (!data || !data.aliases || !data.inflections) return data
+  for (const [alias, id] of Object.entries(data.aliases)) {
+    if (data.inflections[id] && !(alias in data.inflections)) {
+      data.inflections[alias] = data.inflections[id]
+    }
+  }
+  return data
+}
+
+// Normalize a surface form the same way the precompute tools key `index`
+export function normalizeForm(text) {
+  return String(text).replace(/^(der|die|das)\s+/i, '').toLowerCase().replace(/[^a-zäöüß]/g, '')
+}
+
+// Look up a surface form in the prebuilt reverse index.
+// Returns a list of [wordId, formType, features] hits, or [] when unknown.
+export function lookupForm(data, text) {
+  if (!data || !data.index) return []
+  return data.index[normalizeForm(text)] || []
+}
+
+// Pick the most specific hit: observed forms first, then the base word
+export function pickFormHit(hits) {
+  return hits.find(h => h[1] === 'observed') || hits.find(h => h[1] === 'base') || hits[0] || null
+}
+
+// Decode the annotated tokens of an example sentence, or null when it was not precomputed.
+// Each token is the whitespace-separated text with its trailing punctuation, stop-token
+// flag and, for vocabulary forms, the [wordId, formType, features] hit.
+export function exampleTokens(data, example) {
+  const tokens = data && data.examples && data.examples[example]
+  if (!tokens) return null
+  return tokens.map(([start, end, trailing, stop, wordId, formType, features]) => ({
+    text: example.slice(start, end),
+    trailing,
+    stop: Boolean(stop),
+    hit: wordId ? [wordId, formType, features || {}] : null
+  }))
+}
+
+// spaCy Person/Number features to the person keys of the inflection tables
+function personKey(language, feats) {
+  if (language === 'de') return { '1': 'ich', '2': 'du', '3': 'er' }[feats.Person] || 'er'
+  const p = feats.Person
+  const n = feats.Number
+  if (p === '1' && n === 'Sing') return 'I'
+  if (p === '1' && n === 'Plur') return 'we'
+  if (p === '2') return 'you'
+  if (p === '3' && n === 'Plur') return 'they'
+  return 'he'
+}
+
+// The form distractors should take to match a hit: {type, person?} or null
+export function morphFromHit(hit, language) {
+  if (!hit) return null
+  const [, formType, feats = {}] = hit
+  if (formType === 'plural' || formType === 'past_participle') return { type: formType }
+  if (formType === 'present' || formType === 'preterite') return { type: formType, person: feats.person }
+  if (formType !== 'observed') return null
+  if (feats.Number === 'Plur') return { type: 'plural' }
+  if (feats.VerbForm === 'Part') return { type: 'past_participle' }
+  if (feats.Tense === 'Past') return { type: 'preterite', person: personKey(language, feats) }
+  if (feats.Tense === 'Pres' && feats.Person) return { type: 'present', person: personKey(language, feats) }
+  return null
+}
+
+// The form of a word in the cell a morph descriptor names, or null
+export function formFor(data, wordId, morph) {
+  if (!data || !data.forms || !morph) return null
+  const cells = data.forms[wordId]
+  if (!cells) return null
+  return cells[morph.person ? `${morph.type}.${morph.person}` : morph.type] || null
+}
+
+// The same form read from an inflection entry, for when the form table is missing
+export function entryForm(entry, morph) {
+  if (!entry || !morph) return null
+  const value = entry[morph.type]
+  if (morph.person) return (value && value[morph.person]) || null
+  return typeof value === 'string' ? value : null
+}
@@ -0,0 +1,151 @@
+import { describe, it, expect } from 'vitest'
+import {
+  expandAliases,
+  normalizeForm,
+  lookupForm,
+  pickFormHit,
+  exampleTokens,
+  formFor,
+  entryForm,
+  morphFromHit
+} from './inflections'
+
+const data = {
+  inflections: {},
+  index: {
+    gibt: [['geben', 'present', { person: 'er' }]],
+    abend: [
+      ['abend', 'base', {}],
+      ['abend', 'observed', { Case: 'Dat', Gender: 'Masc', Number: 'Sing' }]
+    ]
+  }
+}
+
+describe('expandAliases', () => {
+  it('should point alias keys at the canonical entry', () => {
+    const entry = { base: 'abhängig', pos: 'adjective' }
+    const compact = { inflections: { abhaengig: entry }, aliases: { abhängig: 'abhaengig' } }
+    const result = expandAliases(compact)
+    expect(result.inflections['abhängig']).toBe(entry)
+  })
+
+  it('should leave data without aliases untouched', () => {
+    const legacy = { inflections: { abend: { base: 'der Abend' } } }
+    expect(expandAliases(legacy)).toBe(legacy)
+    expect(expandAliases(null)).toBeNull()
+  })
+})
+
+describe('normalizeForm', () => {
+  it('should strip German articles, case and punctuation', () => {
+    expect(normalizeForm('der Abend')).toBe('abend')
+    expect(normalizeForm('Straße,')).toBe('straße')
+    expect(normalizeForm('Über!')).toBe('über')
+  })
+})
+
+describe('lookupForm', () => {
+  it('should return index hits for a sentence token', () => {
+    expect(lookupForm(data, 'gibt.')).toEqual([['geben', 'present', { person: 'er' }]])
+  })
+
+  it('should return empty list for unknown forms', () => {
+    expect(lookupForm(data, 'nichts')).toEqual([])
+  })
+
+  it('should return empty list when no index is available', () => {
+    expect(lookupForm(null, 'gibt')).toEqual([])
+    expect(lookupForm({ inflections: {} }, 'gibt')).toEqual([])
+  })
+})
+
+describe('pickFormHit', () => {
+  it('should prefer observed hits over the base word', () => {
+    expect(pickFormHit(data.index.abend)[1]).toBe('observed')
+  })
+
+  it('should fall back to the first hit', () => {
+    expect(pickFormHit(data.index.gibt)[0]).toBe('geben')
+  })
+
+  it('should return null for no hits', () => {
+    expect(pickFormHit([])).toBeNull()
+  })
+})
+
+describe('exampleTokens', () => {
+  const sentence = 'Die Abgaben steigen.'
+  const examples = {
+    examples: {
+      [sentence]: [
+        [0, 3, '', 1],
+        [4, 11, '', 0, 'abgabe', 'observed', { Number: 'Plur' }],
+        [12, 20, '.', 0, 'steigen', 'present', { person: 'sie' }]
+      ]
+    }
+  }
+
+  it('should decode tokens with offsets, punctuation and hits', () => {
+    const tokens = exampleTokens(examples, sentence)
+    expect(tokens.map(t => t.text)).toEqual(['Die', 'Abgaben', 'steigen.'])
+    expect(tokens[0]).toEqual({ text: 'Die', trailing: '', stop: true, hit: null })
+    expect(tokens[2].trailing).toBe('.')
+    expect(tokens[1].hit).toEqual(['abgabe', 'observed', { Number: 'Plur' }])
+  })
+
+  it('should return null for sentences that were not precomputed', () => {
+    expect(exampleTokens(examples, 'Etwas anderes.')).toBeNull()
+    expect(exampleTokens(null, sentence)).toBeNull()
+  })
+})
+
+describe('morphFromHit', () => {
+  it('should keep table forms as they are', () => {
+    expect(morphFromHit(['geben', 'present', { person: 'er' }], 'de')).toEqual({ type: 'present', person: 'er' })
+    expect(morphFromHit(['abgabe', 'plural', {}], 'de')).toEqual({ type: 'plural' })
+    expect(morphFromHit(['abend', 'base', {}], 'de')).toBeNull()
+  })
+
+  it('should map observed features to person keys', () => {
+    const feats = { Tense: 'Past', Person: '1', Number: 'Sing', VerbForm: 'Fin' }
+    expect(morphFromHit(['go', 'observed', feats], 'en')).toEqual({ type: 'preterite', person: 'I' })
+    expect(morphFromHit(['gehen', 'observed', { ...feats, Tense: 'Pres', Person: '2' }], 'de'))
+      .toEqual({ type: 'present', person: 'du' })
+    expect(morphFromHit(['erhoehen', 'observed', { VerbForm: 'Part' }], 'de')).toEqual({ type: 'past_participle' })
+  })
+
+  it('should return null without a hit', () => {
+    expect(morphFromHit(null, 'de')).toBeNull()
+  })
+})
+
+describe('formFor', () => {
+  const forms = { forms: { geben: { 'present.er': 'gibt', past_participle: 'gegeben' } } }
+
+  it('should return the form in the cell of a morph', () => {
+    expect(formFor(forms, 'geben', { type: 'present', person: 'er' })).toBe('gibt')
+    expect(formFor(forms, 'geben', { type: 'past_participle' })).toBe('gegeben')
+  })
+
+  it('should return null for missing words, cells or data', () => {
+    expect(formFor(forms, 'geben', { type: 'plural' })).toBeNull()
+    expect(formFor(forms, 'haus', { type: 'plural' })).toBeNull()
+    expect(formFor(null, 'geben', { type: 'past_participle' })).toBeNull()
+    expect(formFor(forms, 'geben', null)).toBeNull()
+  })
+})
+
+describe('entryForm', () => {
+  const entry = { base: 'geben', present: { er: 'gibt' }, past_participle: 'gegeben' }
+
+  it('should read the cell of a morph from an inflection entry', () => {
+    expect(entryForm(entry, { type: 'present', person: 'er' })).toBe('gibt')
+    expect(entryForm(entry, { type: 'past_participle' })).toBe('gegeben')
+  })
+
+  it('should return null for missing cells or entries', () => {
+    expect(entryForm(entry, { type: 'preterite', person: 'er' })).toBeNull()
+    expect(entryForm(entry, { type: 'present' })).toBeNull()
+    expect(entryForm(null, { type: 'plural' })).toBeNull()
+  })
+})
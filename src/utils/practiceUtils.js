@@ -26,15 +26,59 @@ export function getRandomWords(pool, count, exclude = []) {
   return shuffled.slice(0, count)
 }
 
+// Candidate lists of the precomputed distractor index, most similar first
+const DISTRACTOR_LISTS = ['levelPos', 'level', 'pos', 'orthographic']
+
+// id -> word maps of word pools, built once per pool array
+const poolIndexes = new WeakMap()
+
+function indexPool(wordPool) {
+  let byId = poolIndexes.get(wordPool)
+  if (!byId) {
+    byId = new Map(wordPool.map(w => [w.id, w]))
+    poolIndexes.set(wordPool, byId)
+  }
+  return byId
+}
+
 /**
  * Find distractor words similar to the correct word
- * Prioritizes: same level > same part of speech > random
+ * Uses the precomputed distractor index when given (see useDistractors),
+ * drawing from its ranked candidate lists in order and keeping only words
+ * in the pool; otherwise, and to fill up, prioritizes:
+ * same level > same part of speech > random
  * @param {Object} correctWord - The correct word object
  * @param {Array} wordPool - Pool of all available words
  * @param {number} count - Number of distractors to return
+ * @param {Object} index - Precomputed distractor index (optional)
  * @returns {Array} - Array of distractor word objects
  */
-export function getDistractors(correctWord, wordPool, count) {
+export function getDistractors(correctWord, wordPool, count, index = null) {
+  const lists = index && index.distractors && index.distractors[correctWord.id]
+  if (!lists) return similarDistractors(correctWord, wordPool, count)
+
+  const byId = indexPool(wordPool)
+  const chosen = new Set([correctWord.id])
+  const distractors = []
+  for (const name of DISTRACTOR_LISTS) {
+    if (distractors.length >= count) break
+    const listed = (lists[name] || [])
+      .filter(id => byId.has(id) && !chosen.has(id))
+      .map(id => byId.get(id))
+    for (const w of getRandomWords(listed, count - distractors.length)) {
+      chosen.add(w.id)
+      distractors.push(w)
+    }
+  }
+  if (distractors.length < count) {
+    const remaining = wordPool.filter(w => !chosen.has(w.id))
+    distractors.push(...similarDistractors(correctWord, remaining, count - distractors.length))
+  }
+  return distractors
+}
+
+// Pick distractors by level and part of speech alone
+function similarDistractors(correctWord, wordPool, count) {
   // Exclude the correct word
   const candidates = wordPool.filter(w => w.id !== correctWord.id)
   
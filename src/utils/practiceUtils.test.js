@@ -134,6 +134,40 @@ describe('getDistractors', () => {
     const result = getDistractors(correctWord, [correctWord], 3)
     expect(result).toEqual([])
   })
+
+  it('should draw from the precomputed index in list order', () => {
+    const correctWord = mockWords[0] // abolish
+    const index = { distractors: { '1': { levelPos: ['6'], orthographic: ['5', '3'] } } }
+    const result = getDistractors(correctWord, mockWords, 3, index)
+    expect(result.map(w => w.id).sort()).toEqual(['3', '5', '6'])
+  })
+
+  it('should skip indexed words outside the pool and fill up', () => {
+    const correctWord = mockWords[0]
+    const pool = mockWords.filter(w => w.id !== '6')
+    const index = { distractors: { '1': { levelPos: ['6', '2'] } } }
+    const result = getDistractors(correctWord, pool, 3, index)
+    const ids = result.map(w => w.id)
+    expect(ids[0]).toBe('2')
+    expect(ids).toHaveLength(3)
+    expect(new Set(ids).size).toBe(3)
+    expect(ids).not.toContain('6')
+    expect(ids).not.toContain('1')
+  })
+
+  it('should index each word pool separately', () => {
+    const correctWord = mockWords[0]
+    const index = { distractors: { '1': { levelPos: ['6'] } } }
+    const pool = mockWords.filter(w => w.id !== '6')
+    expect(getDistractors(correctWord, pool, 1, index)[0].id).not.toBe('6')
+    expect(getDistractors(correctWord, mockWords, 1, index)[0].id).toBe('6')
+  })
+
+  it('should fall back when the word is not indexed', () => {
+    const correctWord = mockWords[0]
+    const result = getDistractors(correctWord, mockWords, 3, { distractors: {} })
+    expect(result.length).toBe(3)
+  })
 })
 
 describe('getRandomTranslation', () => {
@@ -0,0 +1,326 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pip>=26.0.1",
+#     "spacy>=3.8.11",
+# ]
+# ///
+"""
+Benchmark the inflection precompute tools on synthetic vocabularies.
+
+Synthetic words are drawn from the bundled vocabularies, so the part of
+speech mix matches real data. Words drawn more than once get new lemmas
+(prefixed verbs, compound nouns), and the rule caches are cleared before
+each timed phase, so larger sizes do proportionally more rule work.
+Example sentences are pairs of real examples, so most are distinct. Each phase is timed separately and
+the results are written as JSON. Pass --baseline to compare against an
+earlier results file and fail on regressions.
+
+Usage:
+  python tools/benchmark_inflections.py [options]
+  python tools/benchmark_inflections.py --no-spacy --sizes 1000,10000
+  python tools/benchmark_inflections.py --baseline .cache/benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import precompute_de_inflections
+import precompute_en_inflections
+from inflection_core import (
+    Analyzer,
+    build_form_index,
+    build_inflections,
+    build_payload,
+    collect_observed,
+    merge_observations,
+    model_version,
+    write_index,
+    write_payload,
+)
+
+TOOLS = {"de": precompute_de_inflections, "en": precompute_en_inflections}
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_OUTPUT = os.path.join(os.getcwd(), ".cache", "benchmarks", "inflections.json")
+DEFAULT_THRESHOLD = 0.25
+# Phases shorter than this are too noisy to flag as regressions
+MIN_SECONDS = 0.05
+
+RULES = ("conj_present", "conj_preterite", "past_participle", "pluralize_noun")
+# Position of the verb in multi-word verb entries ("sich anmelden", "give up")
+VERB_TOKEN = {"de": -1, "en": 0}
+
+
+def clear_rule_caches(tool):
+    """Empty the rule functions' lru_caches, so timings include the work."""
+    for value in vars(tool).values():
+        if callable(getattr(value, "cache_clear", None)):
+            value.cache_clear()
+
+
+def verb_prefixes(tool):
+    tables = tool.TABLES
+    if "verb_prefixes" in tables:
+        return tables["verb_prefixes"]
+    return tables["separable_prefixes"] + tables["inseparable_prefixes"]
+
+
+def vary_word(w, rng, prefixes, nouns, verb_token):
+    """Give a resampled word a new lemma, so rule caches cannot answer it.
+
+    Verbs get one or two real prefixes; nouns become compounds headed by
+    the original noun, which keeps its article.
+    """
+    word = w.get("word") or ""
+    pos = w.get("partOfSpeech")
+    if pos == "verb" and word:
+        tokens = word.split(" ")
+        tokens[verb_token] = "".join(rng.sample(prefixes, rng.choice((1, 2)))) + tokens[verb_token]
+        return {**w, "word": " ".join(tokens)}
+    if pos == "noun" and word and nouns:
+        article, _, head = word.rpartition(" ")
+        modifier = rng.choice(nouns).rpartition(" ")[2]
+        compound = modifier + head.lower() if article else modifier.lower() + head
+        return {**w, "word": f"{article} {compound}".lstrip()}
+    return w
+
+
+def synthetic_vocabulary(tool, size, seed=0):
+    """Return `size` words sampled from a tool's vocabulary, with unique ids."""
+    with open(tool.VOCAB_PATH, "r", encoding="utf-8") as fh:
+        words = json.load(fh).get("words") or []
+    examples = [w["example"] for w in words if w.get("example")]
+    nouns = [w["word"] for w in words if w.get("partOfSpeech") == "noun" and w.get("word")]
+    prefixes = verb_prefixes(tool)
+    verb_token = VERB_TOKEN[tool.LANGUAGE.code]
+    rng = random.Random(seed)
+    drawn = set()
+    result = []
+    for i in range(size):
+        j = rng.randrange(len(words))
+        w = dict(words[j])
+        if j in drawn:
+            w = vary_word(w, rng, prefixes, nouns, verb_token)
+        drawn.add(j)
+        w["id"] = f"{w.get('id')}-{i}"
+        if examples:
+            w["example"] = f"{rng.choice(examples)} {rng.choice(examples)}"
+        result.append(w)
+    return {"words": result}
+
+
+def time_rules(tool, words):
+    """Time each rule function over the words it applies to."""
+    verbs = [w["word"] for w in words if w.get("partOfSpeech") == "verb"]
+    nouns = [w["word"] for w in words if w.get("partOfSpeech") == "noun"]
+    persons = getattr(tool, "PERSONS", None) or tool.PERSON_KEYS
+    timings = {}
+    for name in RULES:
+        fn = getattr(tool, name)
+        clear_rule_caches(tool)
+        start = time.perf_counter()
+        if name == "pluralize_noun":
+            for noun in nouns:
+                fn(noun)
+        elif name == "past_participle":
+            for verb in verbs:
+                fn(verb)
+        else:
+            for verb in verbs:
+                for person in persons:
+                    fn(verb, person)
+        timings[f"rules.{name}"] = time.perf_counter() - start
+    return timings
+
+
+def run_once(code, vocab_path, use_spacy, workdir):
+    """Run the precompute pipeline once, returning per-phase seconds."""
+    tool = TOOLS[code]
+    language = tool.LANGUAGE
+    phases = {}
+
+    def timed(name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        phases[name] = time.perf_counter() - start
+        return result
+
+    words = timed("load", _load_words, vocab_path)
+    clear_rule_caches(tool)
+    inflections = timed("rules", build_inflections, language, words)
+    phases.update(time_rules(tool, words))
+
+    has_spacy, analyses = False, {}
+    if use_spacy:
+        analyzer = Analyzer(language.model, cache_dir=None)
+        timed("model_load", analyzer.load)
+        has_spacy, analyses = timed(
+            "analysis", analyzer.analyze, (w.get("example") or "" for w in words)
+        )
+
+    def merge():
+        observed = collect_observed(words, analyses, language.normalize)
+        return merge_observations(language, inflections, observed)
+
+    irregular = timed("merge", merge)
+    index = timed("index", build_form_index, words, inflections)
+
+    def serialize():
+        payload = build_payload(has_spacy, inflections, irregular)
+        write_payload(os.path.join(workdir, f"{code}.json"), payload)
+        write_index(os.path.join(workdir, f"{code}.json"), index)
+
+    timed("serialize", serialize)
+    return phases, has_spacy
+
+
+def _load_words(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh).get("words") or []
+
+
+def run_benchmarks(languages, sizes, use_spacy=True, repeat=1, seed=0):
+    """Benchmark each language and size; keeps the fastest of `repeat` runs."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for code in languages:
+            tool = TOOLS[code]
+            for size in sizes:
+                vocab_path = os.path.join(workdir, f"vocabulary-{code}-{size}.json")
+                with open(vocab_path, "w", encoding="utf-8") as fh:
+                    json.dump(
+                        synthetic_vocabulary(tool, size, seed),
+                        fh,
+                        ensure_ascii=False,
+                    )
+                best = None
+                for _ in range(repeat):
+                    phases, has_spacy = run_once(code, vocab_path, use_spacy, workdir)
+                    if best is None:
+                        best = phases
+                    else:
+                        best = {k: min(v, best.get(k, v)) for k, v in phases.items()}
+                name = f"{code}-{size}"
+                results[name] = {
+                    "language": code,
+                    "words": size,
+                    "spaCy": has_spacy,
+                    "phases": best,
+                    "total": sum(v for k, v in best.items() if "." not in k),
+                }
+                print(
+                    f"{name}: total {results[name]['total']:.3f}s",
+                    " ".join(
+                        f"{k}={v:.3f}" for k, v in best.items() if "." not in k
+                    ),
+                )
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return regressions as (benchmark, phase, baseline s, current s)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or previous.get("spaCy") != current["spaCy"]:
+            continue
+        for phase, seconds in current["phases"].items():
+            before = previous["phases"].get(phase)
+            if before is None or max(before, seconds) < MIN_SECONDS:
+                continue
+            if seconds > before * (1 + threshold):
+                regressions.append((name, phase, before, seconds))
+    return regressions
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the inflection precompute tools."
+    )
+    parser.add_argument(
+        "--lang",
+        default="de,en",
+        help="comma-separated language codes to benchmark",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma-separated synthetic vocabulary sizes",
+    )
+    parser.add_argument(
+        "--no-spacy",
+        dest="use_spacy",
+        action="store_false",
+        help="skip model loading and sentence analysis",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="runs per benchmark (fastest is kept)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT, help="where to write the JSON results"
+    )
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown per phase before it counts as a regression",
+    )
+    args = parser.parse_args()
+
+    languages = [code for code in args.lang.split(",") if code]
+    unknown = [code for code in languages if code not in TOOLS]
+    if unknown:
+        parser.error(f"unknown language(s): {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    use_spacy = args.use_spacy
+    if use_spacy and not all(model_version(TOOLS[c].SPACY_MODEL) for c in languages):
+        print("spaCy or a model is not installed, benchmarking without spaCy")
+        use_spacy = False
+
+    results = run_benchmarks(languages, sizes, use_spacy, args.repeat, args.seed)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "models": {
+                TOOLS[c].SPACY_MODEL: model_version(TOOLS[c].SPACY_MODEL)
+                for c in languages
+            },
+            "spaCy": use_spacy,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print("Wrote benchmark results to", args.output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.threshold)
+        for name, phase, before, seconds in regressions:
+            print(
+                f"REGRESSION {name} {phase}: {before:.3f}s -> {seconds:.3f}s",
+                f"(+{(seconds / before - 1) * 100:.0f}%)",
+            )
+        if regressions:
+            sys.exit(1)
+        print("No regressions against", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
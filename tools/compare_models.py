@@ -0,0 +1,273 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pip>=26.0.1",
+#     "spacy>=3.8.11",
+# ]
+# ///
+"""
+Compare spaCy models on the observed-forms phase of the precompute tools.
+
+Each model runs in a fresh worker process that loads it, parses every
+distinct example sentence of the vocabulary (without the analysis cache)
+and detects irregular forms from the observations, exactly as a build
+would. The report gives load time, memory and sentences per second for
+each model, and lists the irregular verb and noun forms and the observed
+forms each model finds or misses compared with the language's configured
+model. Results are written as JSON.
+
+Usage:
+  python tools/compare_models.py [options]
+  python tools/compare_models.py --lang de
+  python tools/compare_models.py --models en_core_web_sm,en_core_web_md,en_core_web_lg
+"""
+
+import argparse
+import importlib
+import importlib.metadata
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from inflection_core import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_N_PROCESS,
+    Analyzer,
+    build_inflections,
+    collect_observed,
+    merge_observations,
+    model_version,
+)
+from precompute_inflections import LANGUAGES
+
+DEFAULT_OUTPUT = os.path.join(os.getcwd(), ".cache", "benchmarks", "models.json")
+# Differences printed per model; the JSON report has all of them
+SHOWN = 10
+
+
+def installed_models(code):
+    """Names of the installed spaCy model packages for a language."""
+    names = (e.name for e in importlib.metadata.entry_points(group="spacy_models"))
+    return sorted(name for name in names if name.startswith(f"{code}_"))
+
+
+def _peak_rss_mib():
+    """Peak resident memory of this process in MiB, or None where unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+
+def irregular_cells(irregular):
+    """Flatten irregular overrides to "verbs/lemma/tense/person=form" strings."""
+    cells = []
+
+    def walk(path, value):
+        if isinstance(value, dict):
+            for key, inner in value.items():
+                walk(f"{path}/{key}", inner)
+        else:
+            cells.append(f"{path}={value}")
+
+    for kind in ("verbs", "nouns"):
+        for lemma_key, overrides in irregular.get(kind, {}).items():
+            walk(f"{kind}/{lemma_key}", overrides)
+    return sorted(cells)
+
+
+def _run_model(code, vocab_path, model, batch_size, n_process):
+    """Worker: load one model, parse the examples and detect irregulars."""
+    # Imported up front, so the memory measured is the model's own
+    import spacy  # noqa: F401
+
+    language = importlib.import_module(LANGUAGES[code]).LANGUAGE
+    with open(vocab_path, "r", encoding="utf-8") as fh:
+        words = json.load(fh).get("words") or []
+    sentences = list(dict.fromkeys(w.get("example") for w in words if w.get("example")))
+
+    analyzer = Analyzer(model, cache_dir=None, batch_size=batch_size, n_process=n_process)
+    before = _peak_rss_mib()
+    start = time.perf_counter()
+    if not analyzer.load():
+        return {"model": model, "error": "could not be loaded"}
+    load_seconds = time.perf_counter() - start
+    after = _peak_rss_mib()
+
+    start = time.perf_counter()
+    analyses = analyzer.parse(sentences)
+    parse_seconds = time.perf_counter() - start
+
+    observed = collect_observed(words, analyses, language.normalize)
+    inflections = build_inflections(language, words)
+    irregular = merge_observations(language, inflections, observed)
+    tokens = sum(len(t) for t in analyses.values())
+    return {
+        "model": model,
+        "version": analyzer.version,
+        "pipeline": list(analyzer.nlp.pipe_names),
+        "load_seconds": load_seconds,
+        "load_mib": None if before is None else after - before,
+        "peak_mib": _peak_rss_mib(),
+        "sentences": len(sentences),
+        "tokens": tokens,
+        "parse_seconds": parse_seconds,
+        "sentences_per_second": len(sentences) / parse_seconds if parse_seconds else None,
+        "tokens_per_second": tokens / parse_seconds if parse_seconds else None,
+        "irregular_verbs": len(irregular["verbs"]),
+        "irregular_nouns": len(irregular["nouns"]),
+        "irregular": irregular_cells(irregular),
+        "observed": sorted(
+            f"{lemma_key}/{text}"
+            for lemma_key, record in observed.items()
+            for text in record.forms
+        ),
+    }
+
+
+def run_model(code, vocab_path, model, batch_size, n_process):
+    """Run _run_model in a new process, so models do not share memory."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(
+            _run_model, code, vocab_path, model, batch_size, n_process
+        ).result()
+
+
+def diff(baseline, result, name):
+    """Entries of result[name] missing from the baseline and vice versa."""
+    before, after = set(baseline[name]), set(result[name])
+    return {"added": sorted(after - before), "removed": sorted(before - after)}
+
+
+def compare_models(code, models, batch_size=DEFAULT_BATCH_SIZE, n_process=DEFAULT_N_PROCESS):
+    """Run each model over a language's vocabulary and diff it with the first."""
+    module = importlib.import_module(LANGUAGES[code])
+    results = {}
+    for model in models:
+        print(f"{code}: running {model}")
+        results[model] = run_model(code, module.VOCAB_PATH, model, batch_size, n_process)
+
+    loaded = [r for r in results.values() if "error" not in r]
+    baseline = loaded[0] if loaded else None
+    for result in loaded[1:]:
+        result["diff"] = {
+            "irregular": diff(baseline, result, "irregular"),
+            "observed": diff(baseline, result, "observed"),
+        }
+    return {"baseline": baseline and baseline["model"], "models": results}
+
+
+def print_report(code, report):
+    print(f"\n{code} (differences against {report['baseline']}):")
+    print(
+        f"  {'model':<24} {'version':<8} {'load s':>7} {'load MiB':>9} "
+        f"{'sent/s':>8} {'tok/s':>9} {'irr. verbs':>10} {'irr. nouns':>10} {'observed':>9}"
+    )
+    for model, r in report["models"].items():
+        if "error" in r:
+            print(f"  {model:<24} {r['error']}")
+            continue
+        load_mib = "-" if r["load_mib"] is None else f"{r['load_mib']:.1f}"
+        print(
+            f"  {model:<24} {r['version']:<8} {r['load_seconds']:>7.2f} {load_mib:>9} "
+            f"{r['sentences_per_second'] or 0:>8.1f} {r['tokens_per_second'] or 0:>9.0f} "
+            f"{r['irregular_verbs']:>10} {r['irregular_nouns']:>10} {len(r['observed']):>9}"
+        )
+    for model, r in report["models"].items():
+        for name, changes in r.get("diff", {}).items():
+            print(
+                f"  {model} {name}: +{len(changes['added'])} -{len(changes['removed'])}"
+            )
+            for sign, key in (("+", "added"), ("-", "removed")):
+                for cell in changes[key][:SHOWN]:
+                    print(f"    {sign} {cell}")
+                if len(changes[key]) > SHOWN:
+                    print(f"    ... {len(changes[key]) - SHOWN} more")
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare spaCy models on speed and irregular-form detection."
+    )
+    parser.add_argument(
+        "--lang",
+        default=",".join(LANGUAGES),
+        help="comma-separated language codes to compare",
+    )
+    parser.add_argument(
+        "--models",
+        help="comma-separated spaCy models (default: every installed model of "
+        "each language); the language's configured model is the baseline",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="sentences per nlp.pipe batch",
+    )
+    parser.add_argument(
+        "--n-process",
+        type=int,
+        default=DEFAULT_N_PROCESS,
+        help="processes for nlp.pipe",
+    )
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT, help="where to write the JSON results"
+    )
+    args = parser.parse_args()
+
+    languages = [code for code in args.lang.split(",") if code]
+    unknown = [code for code in languages if code not in LANGUAGES]
+    if unknown:
+        parser.error(f"unknown language(s): {', '.join(unknown)}")
+    requested = list(dict.fromkeys(m for m in (args.models or "").split(",") if m))
+    stray = [m for m in requested if m.split("_")[0] not in languages]
+    if stray:
+        parser.error(f"model(s) for no requested language: {', '.join(stray)}")
+
+    reports = {}
+    for code in languages:
+        configured = importlib.import_module(LANGUAGES[code]).LANGUAGE.model
+        if requested:
+            models = [m for m in requested if m.startswith(f"{code}_")]
+        else:
+            models = installed_models(code)
+        missing = [m for m in models if not model_version(m)]
+        for model in missing:
+            print("spaCy model not installed:", model)
+        models = [m for m in models if m not in missing]
+        if not models:
+            print(f"{code}: no installed models to compare")
+            continue
+        # The configured model goes first, so the diffs are against production
+        models.sort(key=lambda m: m != configured)
+        reports[code] = compare_models(code, models, args.batch_size, args.n_process)
+        print_report(code, reports[code])
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "batch_size": args.batch_size,
+            "n_process": args.n_process,
+        },
+        "results": reports,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+    print("\nWrote model comparison to", args.output)
+
+
+if __name__ == "__main__":
+    main()
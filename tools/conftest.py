@@ -0,0 +1,103 @@
+"""
+Shared fixtures for the precompute tool tests.
+
+The tests run without spaCy: example sentences are "analysed" by
+fake_tokens, which returns tokens a model could produce for a word, so
+observed forms, irregulars and feature sets are exercised all the same.
+"""
+
+import json
+import os
+
+import pytest
+
+import precompute_de_inflections
+from inflection_core import Token
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Vocabulary words used per test, enough to cover every part of speech
+WORD_COUNT = 120
+
+
+def fake_tokens(word):
+    """Tokens a German model could return for a word's example sentence."""
+    lemma = (word.get("word") or "").split()[-1]
+    if not lemma.isalpha():
+        return []
+    if word.get("partOfSpeech") == "verb":
+        past = {"Number": "Sing", "Person": "3", "Tense": "Past", "VerbForm": "Fin"}
+        return [
+            Token(lemma, "VERB", lemma, {"VerbForm": "Inf"}),
+            # Differs from the rule-generated form, so it is irregular
+            Token(lemma[:-2] + "ot", "VERB", lemma, past),
+        ]
+    if word.get("partOfSpeech") == "noun":
+        return [Token(lemma + "er", "NOUN", lemma, {"Case": "Nom", "Number": "Plur"})]
+    return [Token(lemma, "ADJ", lemma, {"Degree": "Pos"})]
+
+
+class FakeAnalyzer:
+    """Stands in for Analyzer, answering every sentence with fake_tokens."""
+
+    enabled = True
+    version = "0.0.0"
+    batch_size = 1
+    download = False
+
+    def __init__(self, words):
+        self.analyses = {w["example"]: fake_tokens(w) for w in words if w.get("example")}
+
+    def lookup(self, examples):
+        unique = list(dict.fromkeys(e for e in examples if e))
+        return {e: self.analyses[e] for e in unique}, []
+
+    def analyze(self, examples):
+        return True, self.lookup(examples)[0]
+
+    def store(self, fresh):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def language():
+    return precompute_de_inflections.LANGUAGE
+
+
+@pytest.fixture
+def words():
+    path = os.path.join(ROOT_DIR, "src", "data", "vocabulary-de.json")
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)["words"][:WORD_COUNT]
+
+
+@pytest.fixture
+def vocab_path(tmp_path, words):
+    path = tmp_path / "vocabulary-de.json"
+    path.write_text(json.dumps({"words": words}, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def analyzer(words):
+    return FakeAnalyzer(words)
+
+
+@pytest.fixture
+def build_options():
+    """_precompute options for a plain single-file compact build."""
+    return {
+        "legacy_layout": False,
+        "shard_by": None,
+        "shard_count": 1,
+        "compress": False,
+        "binary": False,
+        "sqlite": False,
+        "jobs": 1,
+        "examples": False,
+        "hashed": False,
+        "corpus_store": None,
+        "corpus_min_count": 1,
+    }
@@ -0,0 +1,67 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""
+Publish content-hashed copies of the committed data files before a build.
+
+Only the plain outputs (vocabulary-<lang>-inflections.json and its
+companions, the distractor index) are committed; the hashed copies and
+the manifest the client loads them through are build artifacts. This
+copies whatever outputs exist for each language to their hashed names
+and writes the manifest (see publish_hashed), without rebuilding
+anything, so it needs neither spaCy nor the vocabulary.
+
+Usage:
+  python tools/hash_outputs.py [--lang de,en]
+"""
+
+import argparse
+import importlib
+import os
+
+from inflection_core import companion_path, publish_hashed
+from precompute_distractors import distractors_path
+from precompute_inflections import LANGUAGES
+
+# Companion kinds the client loads (see src/utils/inflections.js)
+KINDS = ("index", "examples", "forms")
+
+
+def hash_outputs(code):
+    """Publish hashed copies of a language's outputs; returns their paths."""
+    module = importlib.import_module(LANGUAGES[code])
+    out_path = module.OUT_PATH
+    paths = [out_path, *(companion_path(out_path, kind) for kind in KINDS)]
+    paths.append(distractors_path(module, code))
+    existing = [path for path in paths if os.path.exists(path)]
+    if out_path not in existing:
+        print("No", module.LANGUAGE.name, "outputs at", out_path)
+        return []
+    hashed = publish_hashed(out_path, existing)
+    print("Wrote", len(hashed), "hashed copies to", companion_path(out_path, "manifest"))
+    return hashed
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Publish content-hashed copies of the data files and their manifest."
+    )
+    parser.add_argument(
+        "--lang",
+        default=",".join(LANGUAGES),
+        help="comma-separated language codes (default: all)",
+    )
+    args = parser.parse_args()
+
+    codes = [code for code in args.lang.split(",") if code]
+    unknown = [code for code in codes if code not in LANGUAGES]
+    if unknown:
+        parser.error(f"unknown language(s): {', '.join(unknown)}")
+    for code in codes:
+        hash_outputs(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import json
+
+import precompute_de_inflections
+from hash_outputs import hash_outputs
+
+
+def test_hash_outputs(tmp_path, monkeypatch):
+    out_path = tmp_path / "vocabulary-de-inflections.json"
+    monkeypatch.setattr(precompute_de_inflections, "OUT_PATH", str(out_path))
+    out_path.write_text('{"inflections":{}}', encoding="utf-8")
+    (tmp_path / "vocabulary-de-forms.json").write_text('{"forms":{}}', encoding="utf-8")
+
+    first = hash_outputs("de")
+    assert hash_outputs("de") == first
+    manifest = json.loads((tmp_path / "vocabulary-de-manifest.json").read_text())
+    assert sorted(manifest["files"]) == ["forms", "inflections"]
+    for entry in manifest["files"].values():
+        assert (tmp_path / entry["path"]).exists()
+
+    out_path.write_text('{"inflections":{"a":{}}}', encoding="utf-8")
+    hash_outputs("de")
+    stale = tmp_path / manifest["files"]["inflections"]["path"]
+    assert not stale.exists()
+
+
+def test_hash_outputs_without_outputs(tmp_path, monkeypatch):
+    out_path = tmp_path / "vocabulary-de-inflections.json"
+    monkeypatch.setattr(precompute_de_inflections, "OUT_PATH", str(out_path))
+    assert hash_outputs("de") == []
+    assert list(tmp_path.iterdir()) == []
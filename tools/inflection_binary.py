@@ -0,0 +1,345 @@
+"""
+String-table binary encoding of a compact inflection payload, together
+with its reverse form index (see write_index), so that one file answers
+both entry and surface-form lookups.
+
+Every string is stored once in a string table and every feature dict once
+in a feature-set table; everything else is a little-endian uint32 that
+refers to them. A client can map the file with one DataView/Uint32Array
+and answer lookups by binary search, without allocating per entry.
+
+Layout (all integers are little-endian uint32 unless noted; NONE is
+0xFFFFFFFF and marks an absent value):
+
+  header       magic b"INFL", uint16 version, uint16 flags (bit 0: spaCy),
+               then 11 counts: strings, string_bytes, featsets, featpairs,
+               persons, entries, observed, aliases, irregular, index, hits
+  string_offs  strings + 1 offsets into string_bytes
+  string_bytes UTF-8 data, zero-padded to a multiple of 4
+  featset_offs featsets + 1 offsets into featpairs (in pairs)
+  featpairs    (name string, value string) pairs, in original key order
+  persons      string ids of the person keys, in conjugation order
+  entries      fixed records of 9 + 2 * persons words, sorted by key:
+                 key, base, pos, lemma, plural, past_participle,
+                 observed_start, observed_count, irregular,
+                 present[persons], preterite[persons]
+               irregular is a bitmask: bit i = present[i], bit persons + i =
+               preterite[i], bit 2 * persons = past_participle, bit
+               2 * persons + 1 = plural
+  observed     (form string, featset) pairs
+  aliases      (alias string, entry number) pairs, sorted by alias
+  irregular    (key string, kind, bitmask) triples in payload order; kind
+               0 = verbs, 1 = nouns. The key may be an alias; the entry
+               records hold the same cells merged onto the canonical key
+  index_keys   surface-form string ids, sorted by form
+  index_offs   index + 1 offsets into hits
+  hits         (entry number, form type string, featset) triples
+
+Sorting is by Unicode code point, which matches JavaScript string
+comparison for the BMP text the vocabularies contain.
+"""
+
+import os
+import struct
+
+MAGIC = b"INFL"
+VERSION = 2
+NONE = 0xFFFFFFFF
+FLAG_SPACY = 1
+IRREGULAR_KINDS = ("verbs", "nouns")
+
+_HEADER = struct.Struct("<4sHH11I")
+_ENTRY_FIXED = 9
+
+
+def _pack(values):
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+class _Interner:
+    """Assign stable ids to strings and feature sets in first-seen order."""
+
+    def __init__(self):
+        self.strings = {}
+        self.featsets = {}
+
+    def string(self, text):
+        if text is None:
+            return NONE
+        return self.strings.setdefault(text, len(self.strings))
+
+    def featset(self, feats):
+        pairs = tuple((self.string(k), self.string(v)) for k, v in feats.items())
+        return self.featsets.setdefault(pairs, len(self.featsets))
+
+
+def encode_payload(payload):
+    """Encode a compact payload (see build_payload) plus "index" into bytes."""
+    interner = _Interner()
+    entries = payload["inflections"]
+    keys = sorted(entries)
+    entry_no = {key: i for i, key in enumerate(keys)}
+    aliases = payload.get("aliases", {})
+
+    persons = []
+    for entry in entries.values():
+        for tense in ("present", "preterite"):
+            for person in entry.get(tense, {}):
+                if person not in persons:
+                    persons.append(person)
+    person_no = {p: i for i, p in enumerate(persons)}
+
+    def cell_bits(names):
+        bits = 0
+        for name in names:
+            tense, _, person = name.partition(".")
+            if tense == "present":
+                bits |= 1 << person_no[person]
+            elif tense == "preterite":
+                bits |= 1 << (len(persons) + person_no[person])
+            elif tense == "past_participle":
+                bits |= 1 << (2 * len(persons))
+            elif tense == "plural":
+                bits |= 1 << (2 * len(persons) + 1)
+        return bits
+
+    irregular_bits = {}
+    irregular_words = []
+    for kind, cells in payload.get("irregular", {}).items():
+        for key, names in cells.items():
+            bits = cell_bits(names)
+            irregular_words.extend((interner.string(key), IRREGULAR_KINDS.index(kind), bits))
+            canonical = aliases.get(key, key)
+            irregular_bits[canonical] = irregular_bits.get(canonical, 0) | bits
+
+    entry_words = []
+    observed_words = []
+    for key in keys:
+        entry = entries[key]
+        observed = entry.get("observed")
+        record = [
+            interner.string(key),
+            interner.string(entry.get("base")),
+            interner.string(entry.get("pos")),
+            interner.string(entry.get("lemma")),
+            interner.string(entry.get("plural")),
+            interner.string(entry.get("past_participle")),
+            NONE if observed is None else len(observed_words) // 2,
+            0 if observed is None else len(observed),
+            irregular_bits.get(key, 0),
+        ]
+        for tense in ("present", "preterite"):
+            forms = entry.get(tense, {})
+            record.extend(interner.string(forms.get(p)) for p in persons)
+        entry_words.extend(record)
+        for obs in observed or ():
+            observed_words.append(interner.string(obs["form"]))
+            observed_words.append(interner.featset(obs["features"]))
+
+    alias_words = []
+    for alias in sorted(aliases):
+        alias_words.extend((interner.string(alias), entry_no[aliases[alias]]))
+
+    index = payload.get("index", {})
+    index_keys = []
+    index_offs = [0]
+    hit_words = []
+    for form in sorted(index):
+        index_keys.append(interner.string(form))
+        for wid, form_type, feats in index[form]:
+            hit_words.extend(
+                (entry_no[wid], interner.string(form_type), interner.featset(feats))
+            )
+        index_offs.append(len(hit_words) // 3)
+
+    person_ids = [interner.string(p) for p in persons]
+
+    # All strings are interned by now; build the string and feature tables
+    blob = bytearray()
+    string_offs = [0]
+    for text in interner.strings:
+        blob += text.encode("utf-8")
+        string_offs.append(len(blob))
+    string_bytes = len(blob)
+    blob += b"\0" * (-len(blob) % 4)
+
+    featset_offs = [0]
+    featpairs = []
+    for pairs in interner.featsets:
+        for name, value in pairs:
+            featpairs.extend((name, value))
+        featset_offs.append(len(featpairs) // 2)
+
+    flags = FLAG_SPACY if payload.get("meta", {}).get("spaCy") else 0
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        len(interner.strings),
+        string_bytes,
+        len(interner.featsets),
+        len(featpairs) // 2,
+        len(persons),
+        len(keys),
+        len(observed_words) // 2,
+        len(alias_words) // 2,
+        len(irregular_words) // 3,
+        len(index_keys),
+        len(hit_words) // 3,
+    )
+    return b"".join(
+        (
+            header,
+            _pack(string_offs),
+            bytes(blob),
+            _pack(featset_offs),
+            _pack(featpairs),
+            _pack(person_ids),
+            _pack(entry_words),
+            _pack(observed_words),
+            _pack(alias_words),
+            _pack(irregular_words),
+            _pack(index_keys),
+            _pack(index_offs),
+            _pack(hit_words),
+        )
+    )
+
+
+def decode_payload(data):
+    """Decode bytes written by encode_payload back into a compact payload."""
+    (
+        magic,
+        version,
+        flags,
+        n_strings,
+        string_bytes,
+        n_featsets,
+        n_featpairs,
+        n_persons,
+        n_entries,
+        n_observed,
+        n_aliases,
+        n_irregular,
+        n_index,
+        n_hits,
+    ) = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not an inflection binary (or unsupported version)")
+
+    pos = _HEADER.size
+
+    def take(count):
+        nonlocal pos
+        values = struct.unpack_from(f"<{count}I", data, pos)
+        pos += 4 * count
+        return values
+
+    string_offs = take(n_strings + 1)
+    blob = data[pos : pos + string_bytes]
+    pos += string_bytes + (-string_bytes % 4)
+    strings = [
+        blob[string_offs[i] : string_offs[i + 1]].decode("utf-8")
+        for i in range(n_strings)
+    ]
+
+    def string(sid):
+        return None if sid == NONE else strings[sid]
+
+    featset_offs = take(n_featsets + 1)
+    featpairs = take(2 * n_featpairs)
+    featsets = [
+        {
+            strings[featpairs[2 * j]]: strings[featpairs[2 * j + 1]]
+            for j in range(featset_offs[i], featset_offs[i + 1])
+        }
+        for i in range(n_featsets)
+    ]
+    persons = [strings[sid] for sid in take(n_persons)]
+    width = _ENTRY_FIXED + 2 * n_persons
+    entry_words = take(n_entries * width)
+    observed_words = take(2 * n_observed)
+    alias_words = take(2 * n_aliases)
+    irregular_words = take(3 * n_irregular)
+    index_keys = take(n_index)
+    index_offs = take(n_index + 1)
+    hit_words = take(3 * n_hits)
+
+    keys = []
+    inflections = {}
+    for i in range(n_entries):
+        rec = entry_words[i * width : (i + 1) * width]
+        key = strings[rec[0]]
+        keys.append(key)
+        entry = {"base": string(rec[1]), "pos": string(rec[2])}
+        for field, sid in (("lemma", rec[3]), ("plural", rec[4])):
+            if sid != NONE:
+                entry[field] = strings[sid]
+        for t, tense in enumerate(("present", "preterite")):
+            cells = rec[_ENTRY_FIXED + t * n_persons : _ENTRY_FIXED + (t + 1) * n_persons]
+            if any(sid != NONE for sid in cells):
+                entry[tense] = {
+                    p: strings[sid] for p, sid in zip(persons, cells) if sid != NONE
+                }
+        if rec[5] != NONE:
+            entry["past_participle"] = strings[rec[5]]
+        if rec[6] != NONE:
+            entry["observed"] = [
+                {
+                    "form": strings[observed_words[2 * j]],
+                    "features": featsets[observed_words[2 * j + 1]],
+                }
+                for j in range(rec[6], rec[6] + rec[7])
+            ]
+        inflections[key] = entry
+
+    def cell_names(bits):
+        names = []
+        for t, tense in enumerate(("present", "preterite")):
+            for p, person in enumerate(persons):
+                if bits & (1 << (t * n_persons + p)):
+                    names.append(f"{tense}.{person}")
+        if bits & (1 << (2 * n_persons)):
+            names.append("past_participle")
+        if bits & (1 << (2 * n_persons + 1)):
+            names.append("plural")
+        return names
+
+    irregular = {kind: {} for kind in IRREGULAR_KINDS}
+    for i in range(n_irregular):
+        sid, kind, bits = irregular_words[3 * i : 3 * i + 3]
+        irregular[IRREGULAR_KINDS[kind]][strings[sid]] = cell_names(bits)
+
+    aliases = {
+        strings[alias_words[2 * i]]: keys[alias_words[2 * i + 1]]
+        for i in range(n_aliases)
+    }
+    index = {}
+    for i, sid in enumerate(index_keys):
+        index[strings[sid]] = [
+            [
+                keys[hit_words[3 * j]],
+                strings[hit_words[3 * j + 1]],
+                featsets[hit_words[3 * j + 2]],
+            ]
+            for j in range(index_offs[i], index_offs[i + 1])
+        ]
+
+    payload = {
+        "meta": {"spaCy": bool(flags & FLAG_SPACY), "layout": "compact"},
+        "inflections": inflections,
+        "aliases": aliases,
+    }
+    if irregular["verbs"] or irregular["nouns"]:
+        payload["irregular"] = irregular
+    payload["index"] = index
+    return payload
+
+
+def write_binary(path, payload):
+    """Encode a compact payload and write it to path, replacing it atomically."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(encode_payload(payload))
+    os.replace(tmp_path, path)
+    return path
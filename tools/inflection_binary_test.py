@@ -0,0 +1,52 @@
+import json
+import os
+
+from inflection_binary import decode_payload, encode_payload, write_binary
+from inflection_core import (
+    build_form_index,
+    build_inflections,
+    build_payload,
+    collect_observed,
+    merge_observations,
+)
+from inflection_model import to_json
+
+
+def _payload(language, words, analyzer):
+    inflections = build_inflections(language, words)
+    _, analyses = analyzer.analyze(w.get("example") for w in words)
+    observed = collect_observed(words, analyses, language.normalize)
+    irregular = merge_observations(language, inflections, observed)
+    payload = build_payload(True, inflections, irregular, inputs={"tool": "test"})
+    return {**payload, "index": build_form_index(words, inflections)}
+
+
+def _plain(payload):
+    """The payload as JSON would carry it; the binary keeps no inputs."""
+    plain = json.loads(json.dumps(payload, default=to_json))
+    plain["meta"].pop("inputs", None)
+    return plain
+
+
+def test_round_trip(language, words, analyzer):
+    payload = _payload(language, words, analyzer)
+    assert payload["irregular"]["verbs"] and payload["irregular"]["nouns"]
+    assert decode_payload(encode_payload(payload)) == _plain(payload)
+
+
+def test_round_trip_without_observed(language, words):
+    inflections = build_inflections(language, words)
+    payload = build_payload(False, inflections, {"verbs": {}, "nouns": {}})
+    payload["index"] = build_form_index(words, inflections)
+    assert decode_payload(encode_payload(payload)) == _plain(payload)
+
+
+def test_write_binary_replaces_file(tmp_path, language, words, analyzer):
+    path = str(tmp_path / "vocabulary-de-inflections.bin")
+    with open(path, "wb") as fh:
+        fh.write(b"stale")
+    payload = _payload(language, words, analyzer)
+    assert write_binary(path, payload) == path
+    assert os.listdir(tmp_path) == ["vocabulary-de-inflections.bin"]
+    with open(path, "rb") as fh:
+        assert decode_payload(fh.read()) == _plain(payload)
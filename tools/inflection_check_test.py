@@ -0,0 +1,32 @@
+import json
+
+from inflection_core import _precompute, check_outputs
+from inflection_profile import NULL_PROFILER
+
+
+def _build(language, vocab_path, out_path, analyzer, build_options, **options):
+    options = {**build_options, **options}
+    _precompute(language, vocab_path, out_path, analyzer, NULL_PROFILER, **options)
+
+
+def test_check_single_file(tmp_path, language, vocab_path, analyzer, build_options):
+    out_path = str(tmp_path / "vocabulary-de-inflections.json")
+    _build(language, vocab_path, out_path, analyzer, build_options)
+    assert check_outputs(language, vocab_path, out_path)
+    assert not check_outputs(language, vocab_path, out_path, legacy_layout=True)
+    assert not check_outputs(language, vocab_path, out_path, shard_by="hash")
+
+
+def test_check_sharded_ignores_single_file(
+    tmp_path, language, vocab_path, words, analyzer, build_options
+):
+    out_path = str(tmp_path / "vocabulary-de-inflections.json")
+    _build(language, vocab_path, out_path, analyzer, build_options, shard_by="hash")
+    assert check_outputs(language, vocab_path, out_path, shard_by="hash")
+    assert not check_outputs(language, vocab_path, out_path, shard_by="level")
+
+    # A current single file must not vouch for the stale shards
+    with open(vocab_path, "w", encoding="utf-8") as fh:
+        json.dump({"words": words[1:]}, fh)
+    _build(language, vocab_path, out_path, analyzer, build_options)
+    assert not check_outputs(language, vocab_path, out_path, shard_by="hash")
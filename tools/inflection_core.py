@@ -0,0 +1,1458 @@
+"""
+Shared helpers for the precompute_*_inflections tools.
+
+Both language tools import this module from the same directory, so it must
+not depend on anything beyond the standard library and (optionally) spaCy.
+"""
+
+import base64
+import gzip
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+
+from inflection_binary import write_binary
+from inflection_model import ObservedLemma, to_json
+from inflection_profile import NULL_PROFILER, Profiler
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_N_PROCESS = 1
+DEFAULT_JOBS = 1
+DEFAULT_CACHE_DIR = os.path.join(os.getcwd(), ".cache", "inflections")
+DEFAULT_SHARD_COUNT = 16
+SHARD_MODES = ("hash", "level")
+DEFAULT_CHUNK_SIZE = 1000
+# Corpus forms seen fewer times than this are ignored as likely misanalyses
+DEFAULT_CORPUS_MIN_COUNT = 2
+# Hex digits of the content hash in hashed output file names
+HASH_LENGTH = 12
+TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+# Sources besides the language module whose changes make outputs stale:
+# every module that builds or writes outputs in some mode
+TOOL_FILES = (
+    "inflection_core.py",
+    "inflection_model.py",
+    "inflection_binary.py",
+    "inflection_corpus.py",
+    "inflection_parallel.py",
+    "inflection_sqlite.py",
+    "inflection_stream.py",
+    "inflection_watch.py",
+)
+
+# SQLite caps the number of bound parameters per statement.
+_SQL_CHUNK = 500
+
+# Pipeline components whose output the tools never read (pos_, lemma_ and
+# morph come from the tagger, morphologizer, attribute_ruler and lemmatizer).
+UNUSED_COMPONENTS = ("parser", "senter", "ner", "entity_ruler", "entity_linker")
+
+# Lightweight, picklable view of a spaCy token: only what the tools read.
+Token = namedtuple("Token", ["text", "pos", "lemma", "morph"])
+
+# Language-specific hooks provided by each precompute_*_inflections tool.
+Language = namedtuple(
+    "Language",
+    [
+        "name",
+        "code",
+        "model",
+        "normalize",
+        "word_entry",
+        "lemma_entry",
+        "merge_observed",
+        "stop_tokens",
+    ],
+)
+
+# spaCy coarse POS tags whose tokens are collected as observed forms
+OBSERVED_POS = {"VERB": "verb", "NOUN": "noun", "ADJ": "adjective"}
+
+
+def load_tables(code):
+    """Load the bundled rule tables of a language (tables/<code>.json)."""
+    with open(os.path.join(TABLES_DIR, f"{code}.json"), "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def load_spacy(model_name, download=False):
+    """Load an installed spaCy model without the components the tools ignore.
+
+    No network access happens unless download is set and the model is missing.
+    Returns (has_spacy, nlp).
+    """
+    try:
+        import spacy
+        from spacy.util import is_package
+    except ImportError:
+        return False, None
+
+    if not is_package(model_name):
+        if not download:
+            print("spaCy model not installed:", model_name)
+            return False, None
+        if not download_spacy(model_name):
+            return False, None
+
+    start = time.perf_counter()
+    try:
+        nlp = spacy.load(model_name, exclude=UNUSED_COMPONENTS)
+    except Exception:
+        return False, None
+    elapsed = time.perf_counter() - start
+    print(
+        f"Loaded {model_name} {nlp.meta.get('version', '')} in {elapsed:.2f}s",
+        f"(pipeline: {', '.join(nlp.pipe_names)})",
+    )
+    return True, nlp
+
+
+def download_spacy(model_name):
+    """Download a spaCy model package unless it is installed, without loading it.
+
+    Returns True when the package is installed afterwards.
+    """
+    try:
+        from spacy.cli import download as download_model
+        from spacy.util import is_package
+    except ImportError:
+        return False
+    if is_package(model_name):
+        return True
+    try:
+        download_model(model_name)
+    except (Exception, SystemExit):
+        print("Could not download spaCy model:", model_name)
+        return False
+    return True
+
+
+def analyze_examples(
+    nlp, examples, batch_size=DEFAULT_BATCH_SIZE, n_process=DEFAULT_N_PROCESS
+):
+    """Analyse example sentences with nlp.pipe, each distinct text only once.
+
+    Returns a dict mapping sentence text to a list of Token tuples.
+    """
+    unique = list(dict.fromkeys(e for e in examples if e))
+    docs = nlp.pipe(unique, batch_size=batch_size, n_process=n_process)
+    analyses = {}
+    for text, doc in zip(unique, docs):
+        analyses[text] = [
+            Token(tok.text, tok.pos_, tok.lemma_, tok.morph.to_dict()) for tok in doc
+        ]
+    return analyses
+
+
+def model_version(model_name):
+    """Return the installed version of a spaCy model package, or None.
+
+    Reads package metadata only, so spaCy itself is not imported.
+    """
+    if importlib.util.find_spec("spacy") is None:
+        return None
+    try:
+        return importlib.metadata.version(model_name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+class AnalysisCache:
+    """Content-addressed SQLite store of per-sentence token analyses.
+
+    Callers that share a cache between threads must serialize access.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses "
+            "(key TEXT PRIMARY KEY, tokens TEXT NOT NULL)"
+        )
+
+    @staticmethod
+    def key(model_key, text):
+        """Hash sentence text together with the model that analysed it."""
+        return hashlib.sha256(f"{model_key}\n{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model_key, texts):
+        """Return cached analyses for the given texts, keyed by text."""
+        by_key = {self.key(model_key, t): t for t in texts}
+        keys = list(by_key)
+        found = {}
+        for i in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[i : i + _SQL_CHUNK]
+            rows = self.conn.execute(
+                "SELECT key, tokens FROM analyses WHERE key IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, tokens in rows:
+                found[by_key[key]] = [Token(*t) for t in json.loads(tokens)]
+        return found
+
+    def put_many(self, model_key, analyses):
+        """Store analyses (a dict of text to Token lists)."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO analyses (key, tokens) VALUES (?, ?)",
+                (
+                    (
+                        self.key(model_key, text),
+                        json.dumps([list(t) for t in tokens], ensure_ascii=False),
+                    )
+                    for text, tokens in analyses.items()
+                ),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class Analyzer:
+    """Analyse sentences with a lazily loaded spaCy model and a cache.
+
+    The model is loaded on the first cache miss and then kept for later
+    calls, so one Analyzer can serve many batches of sentences. A disabled
+    Analyzer (--no-spacy) never imports spaCy and analyses nothing.
+    """
+
+    def __init__(
+        self,
+        model_name,
+        cache_dir=DEFAULT_CACHE_DIR,
+        download=False,
+        batch_size=DEFAULT_BATCH_SIZE,
+        n_process=DEFAULT_N_PROCESS,
+        profiler=NULL_PROFILER,
+        enabled=True,
+    ):
+        self.model_name = model_name
+        self.enabled = enabled
+        self.download = download
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.profiler = profiler
+        self.version = model_version(model_name) if enabled else None
+        self.nlp = None
+        self.failed = False
+        self.hits = 0
+        self.misses = 0
+        self.cache = None
+        if enabled and cache_dir and self.version:
+            self.cache = AnalysisCache(os.path.join(cache_dir, "analyses.sqlite3"))
+        self.cache_dir = cache_dir
+
+    @property
+    def model_key(self):
+        return f"{self.model_name}-{self.version}"
+
+    def load(self):
+        """Load the model once; returns False when spaCy is unavailable."""
+        if self.nlp is None and not self.failed:
+            with self.profiler.phase("model_load"):
+                has_spacy, self.nlp = load_spacy(self.model_name, download=self.download)
+            self.failed = not has_spacy
+            if has_spacy:
+                self.version = self.nlp.meta.get("version", self.version)
+        return self.nlp is not None
+
+    def lookup(self, examples):
+        """Return (cached analyses, sentences still to parse) for sentences."""
+        unique = list(dict.fromkeys(e for e in examples if e))
+        analyses = {}
+        if self.cache:
+            analyses = self.cache.get_many(self.model_key, unique)
+        missing = [t for t in unique if t not in analyses]
+        self.hits += len(unique) - len(missing)
+        self.misses += len(missing)
+        return analyses, missing
+
+    def parse(self, sentences):
+        """Run sentences through the model; returns None without spaCy."""
+        if not self.load():
+            return None
+        start = time.perf_counter()
+        fresh = analyze_examples(
+            self.nlp, sentences, batch_size=self.batch_size, n_process=self.n_process
+        )
+        self.profiler.record_analysis(
+            len(fresh),
+            sum(len(tokens) for tokens in fresh.values()),
+            time.perf_counter() - start,
+        )
+        return fresh
+
+    def store(self, fresh):
+        """Write freshly parsed sentences to the cache, if there is one."""
+        if not self.cache_dir or not fresh:
+            return
+        if self.cache is None:
+            self.cache = AnalysisCache(os.path.join(self.cache_dir, "analyses.sqlite3"))
+        self.cache.put_many(self.model_key, fresh)
+
+    def analyze(self, examples):
+        """Return (has_spacy, analyses) for the given sentences."""
+        if not self.enabled:
+            return False, {}
+        analyses, missing = self.lookup(examples)
+        if missing or not self.version:
+            fresh = self.parse(missing)
+            if fresh is None:
+                return False, {}
+            self.store(fresh)
+            analyses.update(fresh)
+        return True, analyses
+
+    def close(self):
+        """Report cache statistics and release the cache."""
+        if self.cache:
+            print(
+                f"Analysis cache: {self.hits} hits, {self.misses} misses",
+                f"({self.cache.path})",
+            )
+            self.cache.close()
+            self.cache = None
+
+
+def build_inflections(language, words, inflections=None):
+    """Add rule-generated entries for vocabulary words.
+
+    Each entry is stored under its word id and, unless taken, under its
+    normalized key as an alias (the same dict object).
+    """
+    return register_entries((language.word_entry(w) for w in words), inflections)
+
+
+def register_entries(built, inflections=None):
+    """Store (word id, normalized key, entry) triples from word_entry.
+
+    None items (incomplete words) are skipped; see build_inflections.
+    """
+    inflections = {} if inflections is None else inflections
+    for item in built:
+        if item is None:
+            continue
+        wid, norm_key, entry = item
+        inflections[wid] = entry
+        if norm_key and norm_key not in inflections:
+            inflections[norm_key] = entry
+    return inflections
+
+
+def collect_observed(words, analyses, normalize, observed=None):
+    """Group verb, noun and adjective tokens of example sentences by lemma."""
+    observed = {} if observed is None else observed
+    for w in words:
+        example = w.get("example") or ""
+        for tok in analyses.get(example, ()):
+            if not tok.text.isalpha():
+                continue
+            p = OBSERVED_POS.get(tok.pos)
+            if p is None:
+                continue
+
+            lemma_key = normalize(tok.lemma or tok.text)
+            if not lemma_key:
+                continue
+
+            record = observed.get(lemma_key)
+            if record is None:
+                record = observed[lemma_key] = ObservedLemma(p, tok.lemma or tok.text)
+            # Deduplicated by form text and interned feature set as it is added
+            record.add(tok.text, tok.morph)
+    return observed
+
+
+def merge_collected(observed, partial):
+    """Append observations collected from later words, as if in one pass."""
+    for lemma_key, record in partial.items():
+        if lemma_key in observed:
+            observed[lemma_key].merge(record)
+        else:
+            observed[lemma_key] = record
+    return observed
+
+
+def flatten_forms(forms):
+    """List each observed form with the first feature set seen for it."""
+    return [
+        {"form": form.form, "features": form.features[0][1]}
+        for form in forms.values()
+        if form.features
+    ]
+
+
+def merge_observations(language, inflections, observed):
+    """Merge observed forms into the entries and detect irregular forms.
+
+    Lemmas without a vocabulary entry get a new rule-generated one.
+    Returns the irregular dict (verbs and nouns keyed by lemma key).
+    """
+    irregular = {"verbs": {}, "nouns": {}}
+    for lemma_key, record in observed.items():
+        forms_list = flatten_forms(record.forms)
+        entry = inflections.get(lemma_key)
+        if not entry:
+            entry = language.lemma_entry(record.lemma, record.pos)
+            inflections[lemma_key] = entry
+        language.merge_observed(entry, lemma_key, record.pos, forms_list, irregular)
+    return irregular
+
+
+def client_normalize(text):
+    """Normalize a surface form exactly like the FillBlanks client does."""
+    text = re.sub(r"^(der|die|das)\s+", "", str(text), flags=re.I)
+    return re.sub(r"[^a-zäöüß]", "", text.lower())
+
+
+def build_form_index(words, inflections):
+    """Map normalized surface forms to [word id, form type, features] hits.
+
+    Only vocabulary words are indexed; hits keep vocabulary order.
+    """
+    index = {}
+
+    def add(form, hit):
+        key = client_normalize(form) if form else ""
+        if not key:
+            return
+        hits = index.setdefault(key, [])
+        if hit not in hits:
+            hits.append(hit)
+
+    for w in words:
+        wid = w.get("id")
+        entry = inflections.get(wid)
+        if not entry:
+            continue
+        add(w.get("word"), [wid, "base", {}])
+        for obs in entry.get("observed", []):
+            add(obs["form"], [wid, "observed", obs["features"]])
+        for tense in ("present", "preterite"):
+            for person, form in entry.get(tense, {}).items():
+                add(form, [wid, tense, {"person": person}])
+        for form_type in ("past_participle", "plural"):
+            add(entry.get(form_type), [wid, form_type, {}])
+    return index
+
+
+def form_cells(entry):
+    """Yield (cell name, surface form) for the paradigm cells of an entry.
+
+    Cell names are those of compact_irregular ("present.er", "plural"): the
+    {type, person} descriptor FillBlanks derives for a blank, joined by a dot.
+    """
+    for tense in ("present", "preterite"):
+        for person, form in entry.get(tense, {}).items():
+            yield f"{tense}.{person}", form
+    for form_type in ("past_participle", "plural"):
+        if entry.get(form_type):
+            yield form_type, entry[form_type]
+
+
+def person_key(feats, person_features):
+    """The person key whose features the observed features include, or None."""
+    if "Person" not in feats:
+        return None
+    for person, wanted in person_features.items():
+        if all(feats.get(name) == value for name, value in wanted.items()):
+            return person
+    return None
+
+
+def build_form_table(words, inflections):
+    """Map vocabulary word ids to their surface form in every cell.
+
+    Clients inflect a distractor for a blank with one lookup here instead
+    of reading the paradigm out of the inflection entry.
+    """
+    table = {}
+    for w in words:
+        wid = w.get("id")
+        entry = inflections.get(wid)
+        if entry and wid not in table:
+            cells = dict(form_cells(entry))
+            if cells:
+                table[wid] = cells
+    return table
+
+
+def missing_forms(words, inflections, table):
+    """Return {word id: [cell names]} other entries of its part of speech have.
+
+    A word missing a cell falls back to its base form as a distractor.
+    """
+    entries = {}
+    for w in words:
+        wid = w.get("id")
+        if wid in inflections and wid not in entries:
+            entries[wid] = inflections[wid].get("pos")
+    expected = {}
+    for wid, pos in entries.items():
+        expected.setdefault(pos, {}).update(dict.fromkeys(table.get(wid, ())))
+    missing = {}
+    for wid, pos in entries.items():
+        cells = table.get(wid, {})
+        lacking = [name for name in expected[pos] if name not in cells]
+        if lacking:
+            missing[wid] = lacking
+    return missing
+
+
+def report_missing_forms(words, inflections, table):
+    """Print the vocabulary words whose form table lacks cells."""
+    missing = missing_forms(words, inflections, table)
+    if missing:
+        shown = ", ".join(
+            f"{wid} ({', '.join(cells)})" for wid, cells in list(missing.items())[:5]
+        )
+        more = f" and {len(missing) - 5} more" if len(missing) > 5 else ""
+        print(f"{len(missing)} word(s) lack forms: {shown}{more}")
+    return missing
+
+
+# Letters kept in a sentence token by the FillBlanks client
+_NON_LETTERS = re.compile(r"[^a-zäöüßA-ZÄÖÜ]")
+_TRAILING_PUNCT = re.compile(r"[^a-zäöüßA-ZÄÖÜ]+$")
+
+
+def pick_form_hit(hits):
+    """Pick the most specific index hit, like pickFormHit in the client."""
+    for form_type in ("observed", "base"):
+        for hit in hits:
+            if hit[1] == form_type:
+                return hit
+    return hits[0] if hits else None
+
+
+def _align_tokens(example, tokens):
+    """Map the character offset of each analysed token to the token."""
+    aligned = {}
+    cursor = 0
+    for tok in tokens:
+        start = example.find(tok.text, cursor)
+        if start < 0:
+            continue
+        aligned[start] = tok
+        cursor = start + len(tok.text)
+    return aligned
+
+
+def annotate_example(example, index, tokens, stop_tokens):
+    """Split an example sentence on whitespace and annotate every token.
+
+    Each token is [start, end, trailing punctuation, stop] with, when the
+    token is a vocabulary form, [word id, form type, features] appended.
+    start and end delimit the whitespace-separated token in the sentence.
+    Observed forms take their features from this sentence's analysis.
+    """
+    aligned = _align_tokens(example, tokens)
+    annotated = []
+    for match in re.finditer(r"\S+", example):
+        raw = match.group()
+        trailing = _TRAILING_PUNCT.search(raw)
+        word = _NON_LETTERS.sub("", raw)
+        stop = not word or word.lower() in stop_tokens
+        token = [match.start(), match.end(), trailing.group() if trailing else "", int(stop)]
+        hit = pick_form_hit(index.get(client_normalize(word), [])) if word else None
+        if hit:
+            wid, form_type, features = hit
+            if form_type == "observed":
+                for start in range(match.start(), match.end()):
+                    tok = aligned.get(start)
+                    if tok is not None and tok.text == word:
+                        features = tok.morph
+                        break
+            token.extend((wid, form_type, features))
+        annotated.append(token)
+    return annotated
+
+
+def build_examples(language, words, analyses, index):
+    """Annotate the example sentences of the vocabulary, keyed by sentence."""
+    examples = {}
+    for w in words:
+        example = w.get("example") or ""
+        if example.strip() and example not in examples:
+            examples[example] = annotate_example(
+                example, index, analyses.get(example, ()), language.stop_tokens
+            )
+    return examples
+
+
+def companion_path(out_path, kind):
+    """Path of a file written next to the inflections, e.g. -index.json."""
+    base = os.path.splitext(out_path)[0]
+    return f"{base.removesuffix('-inflections')}-{kind}.json"
+
+
+def write_examples(out_path, has_spacy, examples):
+    """Write the annotated examples next to the inflections output."""
+    path = companion_path(out_path, "examples")
+    write_payload(path, {"meta": {"spaCy": has_spacy}, "examples": examples})
+    return path
+
+
+def write_index(out_path, index):
+    """Write the reverse form index next to the inflections output.
+
+    It is kept out of the inflections payload, which clients need first
+    and which it would otherwise make half as large again.
+    """
+    path = companion_path(out_path, "index")
+    write_payload(path, {"index": index})
+    return path
+
+
+def _short_digest(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def word_digests(words, digests=None):
+    """Map word ids to a digest of their vocabulary records.
+
+    Records sharing an id are digested together, in vocabulary order.
+    """
+    digests = {} if digests is None else digests
+    for w in words:
+        wid = w.get("id")
+        if wid:
+            record = json.dumps(w, ensure_ascii=False, sort_keys=True)
+            digests[wid] = _short_digest((digests.get(wid, "") + record).encode("utf-8"))
+    return digests
+
+
+def input_fingerprint(language, vocab_path, has_spacy, corpus=None):
+    """Fingerprint the inputs an output is built from, for its meta.
+
+    vocabulary, tables and tool are content digests of the vocabulary
+    file, the language's rule tables and the tool sources (TOOL_FILES and
+    the language module); model is the spaCy model and version, or None
+    when no model was used. corpus (see corpus_digest) is only recorded
+    when corpus counts were merged.
+    """
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    sources = [os.path.join(tools_dir, name) for name in TOOL_FILES]
+    sources.append(sys.modules[language.word_entry.__module__].__file__)
+    tool = hashlib.sha256()
+    for source in sources:
+        with open(source, "rb") as fh:
+            tool.update(fh.read())
+    with open(os.path.join(TABLES_DIR, f"{language.code}.json"), "rb") as fh:
+        tables = _short_digest(fh.read())
+    version = model_version(language.model)
+    fingerprint = {
+        "vocabulary": content_digest(vocab_path)[0][:16],
+        "tables": tables,
+        "tool": tool.hexdigest()[:16],
+        "model": f"{language.model}-{version}" if has_spacy and version else None,
+    }
+    if corpus:
+        fingerprint["corpus"] = corpus
+    return fingerprint
+
+
+def write_word_digests(out_path, digests):
+    """Write the per-word input digests --check compares against."""
+    path = companion_path(out_path, "inputs")
+    write_payload(path, {"words": digests})
+    return path
+
+
+def check_outputs(
+    language,
+    vocab_path,
+    out_path,
+    use_spacy=True,
+    corpus_store=None,
+    corpus_min_count=DEFAULT_CORPUS_MIN_COUNT,
+    shard_by=None,
+    legacy_layout=False,
+):
+    """Report whether the outputs are current without rebuilding them.
+
+    The outputs of the layout shard_by and legacy_layout select are checked
+    (the shard manifest or the single file), and must have been built in
+    that layout. The inputs fingerprint in their meta is compared with the
+    current inputs, which only takes hashing a few files; spaCy is not
+    imported. When the vocabulary changed, the added, changed and removed
+    word ids are named. Returns True when the outputs are current.
+    """
+    from inflection_stream import read_meta
+
+    if shard_by:
+        meta_path = os.path.splitext(out_path)[0] + ".manifest.json"
+        layout = {"layout": "sharded", "shardBy": shard_by}
+    else:
+        meta_path = out_path
+        layout = {"layout": None if legacy_layout else "compact"}
+    if not os.path.exists(meta_path):
+        print("Not built yet:", meta_path)
+        return False
+    meta = read_meta(meta_path) or {}
+    built_layout = {name: meta.get(name) for name in layout}
+    if built_layout != layout:
+        print(
+            language.name,
+            "outputs were built in another layout:",
+            meta_path,
+            f"({built_layout} instead of {layout})",
+        )
+        return False
+    built = meta.get("inputs")
+    if not built:
+        print("No inputs fingerprint in", meta_path, "- rebuild once to add it")
+        return False
+
+    has_spacy = use_spacy and model_version(language.model) is not None
+    corpus = None
+    if corpus_store:
+        from inflection_corpus import corpus_digest
+
+        corpus = corpus_digest(corpus_store, corpus_min_count)
+    current = input_fingerprint(language, vocab_path, has_spacy, corpus=corpus)
+    names = list(current) + [name for name in built if name not in current]
+    stale = [name for name in names if current.get(name) != built.get(name)]
+    if not stale:
+        print(language.name, "outputs are up to date:", out_path)
+        return True
+
+    print(language.name, "outputs are stale:", out_path)
+    for name in stale:
+        if name != "vocabulary":
+            print(f"  {name} changed ({built.get(name)} -> {current.get(name)}): every word")
+    if "vocabulary" in stale:
+        with open(vocab_path, "r", encoding="utf-8") as fh:
+            digests = word_digests(json.load(fh).get("words") or [])
+        try:
+            with open(companion_path(out_path, "inputs"), "r", encoding="utf-8") as fh:
+                previous = json.load(fh).get("words") or {}
+        except FileNotFoundError:
+            previous = {}
+        changes = {
+            "added": [wid for wid in digests if wid not in previous],
+            "changed": [
+                wid for wid in digests if wid in previous and previous[wid] != digests[wid]
+            ],
+            "removed": [wid for wid in previous if wid not in digests],
+        }
+        print("  vocabulary changed:")
+        for kind, ids in changes.items():
+            if ids:
+                print(f"    {kind} ({len(ids)}): {', '.join(ids)}")
+        if not any(changes.values()):
+            print("    no word ids changed (order or words without an id)")
+    return False
+
+
+def write_forms(out_path, table):
+    """Write the per-word form table next to the inflections output."""
+    path = companion_path(out_path, "forms")
+    write_payload(path, {"forms": table})
+    return path
+
+
+def compact_irregular(irregular):
+    """Reduce irregular forms to the cell names they override.
+
+    The forms themselves already live in the inflection entries.
+    """
+    cells = {"verbs": {}, "nouns": {}}
+    for key, info in irregular["verbs"].items():
+        names = []
+        for tense in ("present", "preterite"):
+            names.extend(f"{tense}.{person}" for person in info.get(tense, {}))
+        if "past_participle" in info:
+            names.append("past_participle")
+        cells["verbs"][key] = names
+    for key in irregular["nouns"]:
+        cells["nouns"][key] = ["plural"]
+    return cells
+
+
+def build_payload(has_spacy, inflections, irregular, legacy_layout=False, inputs=None):
+    """Assemble the JSON document written by the tools.
+
+    The compact layout stores each entry once under its canonical key (the
+    first key it was registered under) and lists alias keys separately.
+    The legacy layout repeats aliased entries and embeds __meta.irregular.
+    inputs (see input_fingerprint) is recorded in the meta when given.
+    """
+    extra = {"inputs": inputs} if inputs else {}
+    if legacy_layout:
+        if irregular["verbs"] or irregular["nouns"]:
+            inflections = {**inflections, "__meta": {"irregular": irregular}}
+        return {"meta": {"spaCy": has_spacy, **extra}, "inflections": inflections}
+
+    canonical = {}
+    entries = {}
+    aliases = {}
+    for key, entry in inflections.items():
+        first = canonical.setdefault(id(entry), key)
+        if first == key:
+            entries[key] = entry
+        else:
+            aliases[key] = first
+    payload = {
+        "meta": {"spaCy": has_spacy, "layout": "compact", **extra},
+        "inflections": entries,
+        "aliases": aliases,
+    }
+    if irregular["verbs"] or irregular["nouns"]:
+        payload["irregular"] = compact_irregular(irregular)
+    return payload
+
+
+def write_payload(out_path, payload, legacy_layout=False):
+    """Write the payload; the compact layout drops all whitespace.
+
+    The file is replaced atomically, so readers never see a partial write.
+    """
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        if legacy_layout:
+            json.dump(payload, fh, ensure_ascii=False, indent=2, default=to_json)
+        else:
+            json.dump(
+                payload, fh, ensure_ascii=False, separators=(",", ":"), default=to_json
+            )
+    os.replace(tmp_path, out_path)
+
+
+def shard_name(key, shard_by, levels, shard_count=DEFAULT_SHARD_COUNT):
+    """Return the shard a canonical inflection key belongs to.
+
+    Level sharding uses the CEFR level of the vocabulary word; entries that
+    only come from example sentences have no level and go to "extra".
+    """
+    if shard_by == "level":
+        return levels.get(key) or "extra"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return f"{int(digest[:8], 16) % shard_count:02d}"
+
+
+def write_shards(
+    out_path, payload, words, shard_by="hash", shard_count=DEFAULT_SHARD_COUNT
+):
+    """Split a compact payload into shard files plus a manifest.
+
+    Shards are written to a directory named after out_path (without .json)
+    and the manifest to <name>.manifest.json next to it. Each shard is a
+    compact payload holding its entries, their aliases and irregular cells.
+    The form index stays in one file (see write_index), named in the
+    manifest: a sentence token resolves to a word id there and the word id
+    to its shard through "keys". Returns the manifest.
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"unknown shard mode: {shard_by}")
+    levels = {w.get("id"): w.get("level") for w in words if w.get("id")}
+    keys = {}
+    shards = {}
+    for key, entry in payload["inflections"].items():
+        name = shard_name(key, shard_by, levels, shard_count)
+        keys[key] = name
+        shard = shards.setdefault(name, {"inflections": {}, "aliases": {}})
+        shard["inflections"][key] = entry
+    for alias, key in payload["aliases"].items():
+        keys[alias] = keys[key]
+        shards[keys[key]]["aliases"][alias] = key
+    for kind, entries in payload.get("irregular", {}).items():
+        for key, cells in entries.items():
+            irregular = shards[keys[key]].setdefault(
+                "irregular", {"verbs": {}, "nouns": {}}
+            )
+            irregular[kind][key] = cells
+
+    base = os.path.splitext(out_path)[0]
+    shard_dir = os.path.basename(base)
+    os.makedirs(base, exist_ok=True)
+    for stale in os.listdir(base):
+        if stale.endswith((".json", ".json.gz", ".json.br")):
+            os.remove(os.path.join(base, stale))
+
+    manifest = {
+        "meta": {**payload["meta"], "layout": "sharded", "shardBy": shard_by},
+        "index": os.path.basename(companion_path(out_path, "index")),
+        "shards": {},
+        "keys": keys,
+    }
+    for name in sorted(shards):
+        shard = shards[name]
+        shard_payload = {
+            "meta": {**payload["meta"], "shard": name},
+            "inflections": shard["inflections"],
+            "aliases": shard["aliases"],
+        }
+        if "irregular" in shard:
+            shard_payload["irregular"] = shard["irregular"]
+        write_payload(os.path.join(base, f"{name}.json"), shard_payload)
+        manifest["shards"][name] = {
+            "path": f"{shard_dir}/{name}.json",
+            "entries": len(shard["inflections"]),
+        }
+    write_payload(f"{base}.manifest.json", manifest)
+    return manifest
+
+
+def shard_paths(out_path, manifest):
+    """Return every file written by write_shards, manifest first."""
+    base = os.path.splitext(out_path)[0]
+    data_dir = os.path.dirname(base)
+    return [f"{base}.manifest.json"] + [
+        os.path.join(data_dir, info["path"]) for info in manifest["shards"].values()
+    ]
+
+
+def compress_file(path, block_size=1 << 20):
+    """Write maximum-compression .gz and .br siblings of a file.
+
+    The file is compressed block by block, so memory stays bounded.
+    Brotli is optional; without the brotli package only .gz is written.
+    Returns a dict of byte sizes keyed by "raw", "gz" and (maybe) "br".
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    sizes = {"raw": os.path.getsize(path)}
+    br_out = open(path + ".br", "wb") if brotli else None
+    try:
+        br = brotli.Compressor(quality=11, lgwin=24) if brotli else None
+        # An empty name and mtime=0 keep the gzip header reproducible
+        with open(path, "rb") as src, open(path + ".gz", "wb") as gz_out:
+            with gzip.GzipFile("", "wb", 9, gz_out, mtime=0) as gz:
+                for block in iter(lambda: src.read(block_size), b""):
+                    gz.write(block)
+                    if br:
+                        br_out.write(br.process(block))
+        if br:
+            br_out.write(br.finish())
+    finally:
+        if br_out:
+            br_out.close()
+    sizes["gz"] = os.path.getsize(path + ".gz")
+    if brotli:
+        sizes["br"] = os.path.getsize(path + ".br")
+    return sizes
+
+
+def compress_outputs(paths):
+    """Compress every output file and print a size summary."""
+    totals = {}
+    for path in paths:
+        for kind, size in compress_file(path).items():
+            totals[kind] = totals.get(kind, 0) + size
+    if "br" not in totals:
+        print("brotli not installed, skipped .br files")
+    raw = totals["raw"]
+    summary = ", ".join(
+        f"{kind} {size:,} B ({raw / size:.1f}x)"
+        for kind, size in totals.items()
+        if kind != "raw"
+    )
+    print(f"Compressed {len(paths)} file(s): raw {raw:,} B, {summary}")
+    return totals
+
+
+def content_digest(path, block_size=1 << 20):
+    """Return (SHA-256 hex digest, subresource-integrity string, byte size)."""
+    sha256 = hashlib.sha256()
+    sha384 = hashlib.sha384()
+    size = 0
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            sha256.update(block)
+            sha384.update(block)
+            size += len(block)
+    integrity = "sha384-" + base64.b64encode(sha384.digest()).decode("ascii")
+    return sha256.hexdigest(), integrity, size
+
+
+def output_kind(out_path, path):
+    """Manifest name of an output: "inflections", a companion kind or "binary"."""
+    if path == out_path:
+        return "inflections"
+    if path.endswith(".bin"):
+        return "binary"
+    base = os.path.splitext(out_path)[0].removesuffix("-inflections")
+    return os.path.splitext(path)[0][len(base) + 1 :]
+
+
+def _remove_with_siblings(path):
+    for stale in (path, path + ".gz", path + ".br"):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def publish_hashed(out_path, paths):
+    """Copy outputs to content-hashed names and list them in the manifest.
+
+    A file named vocabulary-<code>-inflections.<hash>.json never changes, so
+    it can be served with immutable cache headers. The manifest
+    (companion_path(out_path, "manifest")) maps each output kind to its
+    hashed file name, byte size, SHA-256 and subresource-integrity digest;
+    entries of kinds not in paths are kept, and replaced hashed files are
+    removed. Returns the paths of the hashed copies.
+    """
+    data_dir = os.path.dirname(out_path)
+    manifest_path = companion_path(out_path, "manifest")
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as fh:
+            files = json.load(fh).get("files") or {}
+    except FileNotFoundError:
+        files = {}
+
+    hashed = []
+    for path in paths:
+        kind = output_kind(out_path, path)
+        digest, integrity, size = content_digest(path)
+        stem, ext = os.path.splitext(path)
+        target = f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+        previous = files.get(kind)
+        if previous and previous["path"] != os.path.basename(target):
+            _remove_with_siblings(os.path.join(data_dir, previous["path"]))
+        if not os.path.exists(target):
+            shutil.copyfile(path, target)
+        files[kind] = {
+            "path": os.path.basename(target),
+            "bytes": size,
+            "sha256": digest,
+            "integrity": integrity,
+        }
+        hashed.append(target)
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump({"files": files}, fh, ensure_ascii=False, indent=2, sort_keys=True)
+        fh.write("\n")
+    os.replace(tmp_path, manifest_path)
+    return hashed
+
+
+def precompute(
+    language,
+    vocab_path,
+    out_path,
+    batch_size=DEFAULT_BATCH_SIZE,
+    n_process=DEFAULT_N_PROCESS,
+    download_model=False,
+    cache_dir=DEFAULT_CACHE_DIR,
+    legacy_layout=False,
+    shard_by=None,
+    shard_count=DEFAULT_SHARD_COUNT,
+    compress=False,
+    binary=False,
+    sqlite=False,
+    sqlite_path=None,
+    stream=False,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    profile=False,
+    profile_output=None,
+    use_spacy=True,
+    jobs=DEFAULT_JOBS,
+    watch=False,
+    examples=True,
+    hashed=False,
+    check=False,
+    corpus=False,
+    corpus_store=None,
+    corpus_min_count=DEFAULT_CORPUS_MIN_COUNT,
+):
+    """Precompute inflections for one language and write the outputs.
+
+    Returns the inflections dict (entries and aliases), or None when the
+    vocabulary file does not exist. In stream mode the words are processed
+    in chunks with bounded memory and only the word count is returned.
+    With profile set, per-phase timings are printed at the end of the run.
+    Without use_spacy only the paradigm tables are used. With jobs other
+    than 1, rules and analysis run in that many worker processes. In watch
+    mode the output is rebuilt on every vocabulary change until Ctrl+C.
+    With examples set, the annotated example sentences are written next
+    to the output (except in stream mode). With hashed set, every output
+    is also copied to a content-hashed name listed in a manifest. With
+    sqlite set, an indexed SQLite database is written as well, to
+    sqlite_path or by default under the cache directory (see
+    inflection_sqlite). With corpus set, the form counts ingested from
+    text corpora (see inflection_corpus) are merged into the observed
+    forms, weighted by frequency per paradigm cell. With check set nothing is built: see check_outputs, whose result
+    is returned.
+    """
+    if (shard_by or binary or sqlite) and legacy_layout:
+        raise ValueError("sharded, binary and SQLite output require the compact layout")
+    if stream and (legacy_layout or shard_by or binary or sqlite):
+        raise ValueError("stream mode only writes the single-file compact layout")
+    if stream and jobs != 1:
+        raise ValueError("stream mode runs in a single process")
+    if watch and (stream or shard_by or binary or sqlite or jobs != 1):
+        raise ValueError("watch mode rebuilds a single output file in one process")
+    if hashed and shard_by:
+        raise ValueError("hashed output requires a single output file")
+    if corpus and (stream or watch):
+        raise ValueError("corpus counts are only merged in a full in-memory build")
+    if corpus_store and not corpus:
+        raise ValueError("--corpus-store requires --corpus")
+    if corpus:
+        from inflection_corpus import corpus_store_path
+
+        corpus_store = corpus_store or corpus_store_path(language.code)
+    else:
+        corpus_store = None
+    if sqlite_path and not sqlite:
+        raise ValueError("--sqlite-path requires --sqlite")
+    if sqlite:
+        from inflection_sqlite import sqlite_path as default_sqlite_path
+
+        sqlite = sqlite_path or default_sqlite_path(language.code)
+    else:
+        sqlite = None
+
+    if not os.path.exists(vocab_path):
+        print("Vocabulary file not found:", vocab_path)
+        return None
+    if check:
+        return check_outputs(
+            language,
+            vocab_path,
+            out_path,
+            use_spacy=use_spacy,
+            corpus_store=corpus_store,
+            corpus_min_count=corpus_min_count,
+            shard_by=shard_by,
+            legacy_layout=legacy_layout,
+        )
+    if corpus_store and not os.path.exists(corpus_store):
+        raise ValueError(f"no corpus counts at {corpus_store}; run tools/ingest_corpus.py")
+
+    profiler = Profiler(output=profile_output) if profile or profile_output else NULL_PROFILER
+    analyzer = Analyzer(
+        language.model,
+        cache_dir=cache_dir,
+        download=download_model,
+        batch_size=batch_size,
+        n_process=n_process,
+        profiler=profiler,
+        enabled=use_spacy,
+    )
+    profiler.start()
+    try:
+        if watch:
+            from inflection_watch import watch as watch_vocabulary
+
+            return watch_vocabulary(
+                language,
+                vocab_path,
+                out_path,
+                analyzer,
+                legacy_layout=legacy_layout,
+                compress=compress,
+                examples=examples,
+                hashed=hashed,
+            )
+        if stream:
+            from inflection_stream import precompute_streaming
+
+            if examples:
+                print(
+                    "Stream mode does not write annotated examples; "
+                    "run without --stream to write them"
+                )
+            return precompute_streaming(
+                language,
+                vocab_path,
+                out_path,
+                analyzer,
+                chunk_size=chunk_size,
+                compress=compress,
+                hashed=hashed,
+                profiler=profiler,
+            )
+        return _precompute(
+            language,
+            vocab_path,
+            out_path,
+            analyzer,
+            profiler,
+            legacy_layout=legacy_layout,
+            shard_by=shard_by,
+            shard_count=shard_count,
+            compress=compress,
+            binary=binary,
+            sqlite=sqlite,
+            jobs=jobs,
+            examples=examples,
+            hashed=hashed,
+            corpus_store=corpus_store,
+            corpus_min_count=corpus_min_count,
+        )
+    finally:
+        analyzer.close()
+        profiler.finish()
+
+
+def _precompute(
+    language,
+    vocab_path,
+    out_path,
+    analyzer,
+    profiler,
+    legacy_layout,
+    shard_by,
+    shard_count,
+    compress,
+    binary,
+    sqlite,
+    jobs,
+    examples,
+    hashed,
+    corpus_store,
+    corpus_min_count,
+):
+    with profiler.phase("load"):
+        with open(vocab_path, "r", encoding="utf-8") as fh:
+            vocab = json.load(fh)
+
+    words = vocab.get("words") or []
+    print("Loaded", len(words), language.name, "vocabulary entries")
+
+    if jobs != 1:
+        from inflection_parallel import analyze_sharded
+
+        # Generate inflections and collect observed forms in worker processes
+        with profiler.phase("shards"):
+            has_spacy, inflections, observed, analyses = analyze_sharded(
+                language, words, analyzer, jobs
+            )
+        print("spaCy available:", has_spacy)
+    else:
+        # Generate inflections for each vocabulary word
+        with profiler.phase("rules"):
+            inflections = build_inflections(language, words)
+
+        # Collect observed forms from example sentences
+        with profiler.phase("analysis"):
+            has_spacy, analyses = analyzer.analyze(w.get("example") or "" for w in words)
+        print("spaCy available:", has_spacy)
+        with profiler.phase("collect"):
+            observed = collect_observed(words, analyses, language.normalize)
+
+    # Merge observed forms and detect irregulars
+    corpus = None
+    with profiler.phase("merge"):
+        if corpus_store:
+            from inflection_corpus import corpus_digest, corpus_observed, merge_corpus
+
+            merge_corpus(
+                observed,
+                corpus_observed(corpus_store, corpus_min_count, language, inflections),
+            )
+            corpus = corpus_digest(corpus_store, corpus_min_count)
+        irregular = merge_observations(language, inflections, observed)
+
+    with profiler.phase("index"):
+        index = build_form_index(words, inflections)
+        forms = build_form_table(words, inflections)
+    report_missing_forms(words, inflections, forms)
+
+    # Write output
+    with profiler.phase("serialize"):
+        inputs = input_fingerprint(language, vocab_path, has_spacy, corpus=corpus)
+        payload = build_payload(
+            has_spacy, inflections, irregular, legacy_layout=legacy_layout, inputs=inputs
+        )
+        if shard_by:
+            manifest = write_shards(
+                out_path, payload, words, shard_by=shard_by, shard_count=shard_count
+            )
+            print("Wrote", len(manifest["shards"]), "shards for", out_path)
+            written = shard_paths(out_path, manifest)
+        else:
+            write_payload(out_path, payload, legacy_layout=legacy_layout)
+            print("Wrote", language.name, "inflections to", out_path)
+            written = [out_path]
+        written.append(write_index(out_path, index))
+        written.append(write_forms(out_path, forms))
+        write_word_digests(out_path, word_digests(words))
+
+    if binary:
+        with profiler.phase("binary"):
+            bin_path = write_binary(
+                os.path.splitext(out_path)[0] + ".bin", {**payload, "index": index}
+            )
+        print("Wrote binary encoding to", bin_path)
+        written.append(bin_path)
+
+    if sqlite:
+        from inflection_sqlite import write_sqlite
+
+        # For server-side lookups, so it is written outside the published data
+        with profiler.phase("sqlite"):
+            db_path = write_sqlite(sqlite, language, payload, words)
+        print("Wrote SQLite database to", db_path)
+
+    if examples:
+        with profiler.phase("examples"):
+            annotated = build_examples(language, words, analyses, index)
+            examples_out = write_examples(out_path, has_spacy, annotated)
+        print("Wrote", len(annotated), "annotated examples to", examples_out)
+        written.append(examples_out)
+
+    if hashed:
+        with profiler.phase("hash"):
+            written.extend(publish_hashed(out_path, written))
+        print("Wrote content-hashed copies to", companion_path(out_path, "manifest"))
+
+    if compress:
+        with profiler.phase("compress"):
+            compress_outputs(written)
+    return inflections
+
+
+def add_common_arguments(parser):
+    """Register the command-line options shared by both tools."""
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="number of example sentences per nlp.pipe batch",
+    )
+    parser.add_argument(
+        "--n-process",
+        type=int,
+        default=DEFAULT_N_PROCESS,
+        help="number of spaCy worker processes (-1 for all cores)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help="worker processes for rules and sentence analysis (0 for all cores)",
+    )
+    parser.add_argument(
+        "--no-spacy",
+        dest="use_spacy",
+        action="store_false",
+        help="use only the paradigm tables; do not load spaCy",
+    )
+    parser.add_argument(
+        "--no-examples",
+        dest="examples",
+        action="store_false",
+        help="do not write the annotated example sentences",
+    )
+    parser.add_argument(
+        "--download-model",
+        action="store_true",
+        help="download the spaCy model if it is not installed",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="directory of the sentence analysis cache",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="analyse every sentence afresh without reading or writing the cache",
+    )
+    parser.add_argument(
+        "--legacy-layout",
+        action="store_true",
+        help="write the old indented layout with duplicated alias entries",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=SHARD_MODES,
+        help="write per-shard files and a manifest instead of one file",
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=DEFAULT_SHARD_COUNT,
+        help="number of shards for --shard-by hash",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="also write maximum-compression .gz and .br files",
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="also write a string-table binary encoding (<name>.bin)",
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="also write an indexed SQLite database for form lookups",
+    )
+    parser.add_argument(
+        "--sqlite-path",
+        help="where --sqlite writes the database "
+        "(default: .cache/inflections/inflections-<lang>.sqlite3)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report whether the outputs are current (exit status 1 if stale)",
+    )
+    parser.add_argument(
+        "--hashed",
+        action="store_true",
+        help="also write content-hashed copies and a manifest for immutable caching",
+    )
+    parser.add_argument(
+        "--corpus",
+        action="store_true",
+        help="merge the form counts ingested with tools/ingest_corpus.py",
+    )
+    parser.add_argument(
+        "--corpus-store",
+        help="corpus counts to merge (default: .cache/inflections/corpus-<lang>.sqlite3)",
+    )
+    parser.add_argument(
+        "--corpus-min-count",
+        type=int,
+        default=DEFAULT_CORPUS_MIN_COUNT,
+        help="ignore corpus forms seen fewer times than this",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="process the vocabulary in chunks with bounded memory",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="number of words per chunk in --stream mode",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep the model loaded and rebuild whenever the vocabulary changes",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-phase wall time, peak memory and spaCy throughput",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="write a cProfile dump, or a Chrome trace if the name ends in .json",
+    )
+    return parser
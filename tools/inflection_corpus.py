@@ -0,0 +1,444 @@
+"""
+Observed forms harvested from large plain-text corpora.
+
+ingest_corpus streams text files line by line through spaCy in worker
+processes (each loads the model once) and counts, per vocabulary lemma,
+every (surface form, feature set) it sees; tokens whose lemma is not a
+vocabulary lemma are dropped in the worker. Counts accumulate in a SQLite
+store on disk, so memory stays bounded by the batches in flight. Each
+finished batch is committed together with the byte offset it ends at,
+in file order, so an interrupted ingestion resumes where it stopped.
+
+A build with --corpus reads the store back with corpus_observed: for
+each lemma and feature set only the most frequent surface form is kept,
+seen at least min_count times, and the forms are merged after those of
+the example sentences in ascending frequency. merge_observed lets later
+observations override earlier ones, so a cell ends up with its most
+frequent form. Forms are also weighed per paradigm cell against the
+rule-generated form: a variant only reaches merge_observed, and so only
+counts as irregular, if the corpus shows it more often than the
+generated form of its cell.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+from inflection_core import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CORPUS_MIN_COUNT,
+    OBSERVED_POS,
+    form_cells,
+    load_spacy,
+    load_tables,
+    model_version,
+    person_key,
+)
+from inflection_model import ObservedLemma
+
+# Lines of text sent to a worker at a time
+DEFAULT_LINES = 1000
+# Batches queued per worker; with DEFAULT_LINES this bounds the text in flight
+IN_FLIGHT = 2
+# Longer lines are split at whitespace before parsing
+MAX_CHARS = 10000
+CORPUS_SUFFIXES = (".txt",)
+PROGRESS_SECONDS = 10
+# spaCy Tense of the finite verb cells
+TENSE_CELLS = {"Pres": "present", "Past": "preterite"}
+
+
+def corpus_store_path(code):
+    """Default location of a language's corpus counts."""
+    return os.path.join(DEFAULT_CACHE_DIR, f"corpus-{code}.sqlite3")
+
+
+def corpus_files(paths):
+    """Expand directories to the text files below them, in sorted order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, _, names in os.walk(path):
+                found.extend(
+                    os.path.join(root, name)
+                    for name in names
+                    if name.endswith(CORPUS_SUFFIXES)
+                )
+            files.extend(sorted(found))
+        else:
+            files.append(path)
+    return [os.path.abspath(path) for path in files]
+
+
+def vocabulary_lemmas(language, words):
+    """Normalized keys of the vocabulary words, as word_entry registers them."""
+    return frozenset(
+        item[1] for item in map(language.word_entry, words) if item and item[1]
+    )
+
+
+class CorpusStore:
+    """Form counts and per-file progress of an ingestion, in SQLite."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, "
+            "offset INTEGER NOT NULL, lines INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS lemmas (lemma_key TEXT PRIMARY KEY, "
+            "pos TEXT NOT NULL, lemma TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS counts (lemma_key TEXT NOT NULL, "
+            "form TEXT NOT NULL, features TEXT NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (lemma_key, form, features)) WITHOUT ROWID;"
+        )
+
+    def meta(self):
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def set_meta(self, values):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", values.items()
+            )
+
+    def progress(self, path):
+        """Return (byte offset, lines) reached in a file so far."""
+        row = self.conn.execute(
+            "SELECT offset, lines FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        return row or (0, 0)
+
+    def add(self, path, offset, lines, counts, lemmas):
+        """Add a batch's counts and move the file's checkpoint, atomically."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO lemmas (lemma_key, pos, lemma) VALUES (?, ?, ?)",
+                ((key, pos, lemma) for key, (pos, lemma) in lemmas.items()),
+            )
+            self.conn.executemany(
+                "INSERT INTO counts (lemma_key, form, features, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (lemma_key, form, features) "
+                "DO UPDATE SET count = count + excluded.count",
+                ((key, form, feats, n) for (key, form, feats), n in counts),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, offset, lines) VALUES (?, ?, ?)",
+                (path, offset, lines),
+            )
+
+    def totals(self):
+        """Return (files, lines, counted tokens, distinct lemmas)."""
+        files, lines = self.conn.execute("SELECT count(*), total(lines) FROM files").fetchone()
+        tokens, lemmas = self.conn.execute(
+            "SELECT total(count), count(DISTINCT lemma_key) FROM counts"
+        ).fetchone()
+        return files, int(lines), int(tokens), lemmas
+
+    def close(self):
+        self.conn.close()
+
+
+def _pieces(line):
+    """Split an over-long line at whitespace into parts of at most MAX_CHARS."""
+    while len(line) > MAX_CHARS:
+        cut = line.rfind(" ", 0, MAX_CHARS)
+        if cut <= 0:
+            cut = MAX_CHARS
+        yield line[:cut]
+        line = line[cut:].lstrip()
+    if line:
+        yield line
+
+
+def read_batches(path, offset=0, lines=DEFAULT_LINES):
+    """Yield (texts, end offset, line count) batches of a file from offset."""
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        texts, count = [], 0
+        for raw in fh:
+            offset += len(raw)
+            count += 1
+            texts.extend(_pieces(raw.decode("utf-8", errors="replace").strip()))
+            if count == lines:
+                yield texts, offset, count
+                texts, count = [], 0
+        if count:
+            yield texts, offset, count
+
+
+# Per-process state of the ingestion workers, set by _init_worker
+_WORKER = {}
+
+
+def _init_worker(language, lemmas, batch_size):
+    has_spacy, nlp = load_spacy(language.model)
+    if not has_spacy:
+        raise RuntimeError(f"spaCy model {language.model} could not be loaded")
+    _WORKER.update(nlp=nlp, normalize=language.normalize, lemmas=lemmas, batch_size=batch_size)
+
+
+def _count_batch(texts):
+    """Worker: count (lemma key, form, features) of vocabulary lemmas in texts.
+
+    Returns (counts as a list of pairs, {lemma key: (pos, lemma)}).
+    """
+    normalize, lemmas = _WORKER["normalize"], _WORKER["lemmas"]
+    counts = Counter()
+    names = {}
+    for doc in _WORKER["nlp"].pipe(texts, batch_size=_WORKER["batch_size"]):
+        for tok in doc:
+            # Same selection as collect_observed
+            if not tok.text.isalpha():
+                continue
+            pos = OBSERVED_POS.get(tok.pos_)
+            if pos is None:
+                continue
+            lemma = tok.lemma_ or tok.text
+            key = normalize(lemma)
+            if key not in lemmas:
+                continue
+            feats = json.dumps(tok.morph.to_dict(), ensure_ascii=False)
+            counts[key, tok.text, feats] += 1
+            names.setdefault(key, (pos, lemma))
+    return list(counts.items()), names
+
+
+def _open_readonly(path):
+    return sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True)
+
+
+def _lemmas_digest(lemmas):
+    return hashlib.sha256("\n".join(sorted(lemmas)).encode("utf-8")).hexdigest()[:16]
+
+
+def ingest_corpus(
+    language,
+    words,
+    paths,
+    store_path,
+    jobs=1,
+    lines=DEFAULT_LINES,
+    batch_size=DEFAULT_BATCH_SIZE,
+    restart=False,
+):
+    """Count the vocabulary lemmas' forms in text files, resuming if possible.
+
+    The store remembers the model and vocabulary lemmas it was filled
+    with; continuing with different ones raises ValueError unless restart
+    is set, which discards the store first. Returns the store totals (see
+    CorpusStore.totals), or None when the spaCy model is not installed.
+    """
+    version = model_version(language.model)
+    if not version:
+        print("spaCy model not installed:", language.model)
+        return None
+    files = corpus_files(paths)
+    missing = [path for path in files if not os.path.isfile(path)]
+    if missing:
+        raise ValueError(f"corpus file(s) not found: {', '.join(missing)}")
+    if restart and os.path.exists(store_path):
+        os.remove(store_path)
+
+    lemmas = vocabulary_lemmas(language, words)
+    expected = {"model": f"{language.model}-{version}", "lemmas": _lemmas_digest(lemmas)}
+    store = CorpusStore(store_path)
+    try:
+        previous = store.meta()
+        changed = [k for k in expected if previous.get(k, expected[k]) != expected[k]]
+        if changed:
+            raise ValueError(
+                f"{store_path} holds counts for a different {' and '.join(changed)}"
+                "; pass --restart to start over"
+            )
+        store.set_meta(expected)
+        _ingest(store, language, lemmas, files, max(jobs, 1), lines, batch_size)
+        return store.totals()
+    finally:
+        store.close()
+
+
+def _ingest(store, language, lemmas, files, jobs, lines, batch_size):
+    pending = deque()
+    start = last = time.perf_counter()
+    ingested = 0
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(language, lemmas, batch_size),
+    ) as pool:
+
+        def commit():
+            nonlocal ingested, last
+            path, offset, total, count, future = pending.popleft()
+            counts, names = future.result()
+            store.add(path, offset, total, counts, names)
+            ingested += count
+            now = time.perf_counter()
+            if now - last >= PROGRESS_SECONDS:
+                last = now
+                print(
+                    f"{ingested} lines ({ingested / (now - start):.0f}/s),",
+                    f"at {os.path.basename(path)} line {total}",
+                )
+
+        try:
+            for path in files:
+                offset, total = store.progress(path)
+                size = os.path.getsize(path)
+                if offset > size:
+                    raise ValueError(f"{path} shrank since it was ingested; pass --restart")
+                if offset == size:
+                    continue
+                if offset:
+                    print(f"Resuming {path} at line {total}")
+                for texts, end, count in read_batches(path, offset, lines):
+                    total += count
+                    future = pool.submit(_count_batch, texts)
+                    pending.append((path, end, total, count, future))
+                    # Checkpoints advance in file order, so wait for the oldest batch
+                    while len(pending) >= jobs * IN_FLIGHT:
+                        commit()
+            while pending:
+                commit()
+        except BaseException:
+            # Batches not yet committed are parsed again on resume
+            pool.shutdown(cancel_futures=True)
+            raise
+    print(f"Ingested {ingested} new lines in {time.perf_counter() - start:.1f}s")
+
+
+def form_cell(pos, feats, person_features):
+    """The paradigm cell ("present.er", "plural") a form fills, or None."""
+    if pos == "noun":
+        return "plural" if feats.get("Number") == "Plur" else None
+    if pos != "verb":
+        return None
+    if feats.get("VerbForm") == "Part":
+        return "past_participle"
+    tense = TENSE_CELLS.get(feats.get("Tense"))
+    person = person_key(feats, person_features)
+    return f"{tense}.{person}" if tense and person else None
+
+
+def _weigh_cells(best_forms, totals, names, language, inflections):
+    """Keep per paradigm cell the most frequent form, if it beats the generated one."""
+    person_features = load_tables(language.code).get("person_features", {})
+    normalized = Counter()
+    for (key, form), count in totals.items():
+        normalized[key, language.normalize(form)] += count
+
+    kept = {}
+    cells = {}
+    for (key, feats), (form, count) in best_forms.items():
+        cell = form_cell(names[key][0], json.loads(feats), person_features)
+        if cell is None:
+            kept[key, feats] = (form, count)
+            continue
+        current = cells.get((key, cell))
+        if current is None or totals[key, form] > totals[key, current[1]]:
+            cells[key, cell] = (feats, form, count)
+
+    generated = {}
+    for (key, cell), (feats, form, count) in cells.items():
+        if key not in generated:
+            pos, lemma = names[key]
+            entry = inflections.get(key) or language.lemma_entry(lemma, pos)
+            generated[key] = dict(form_cells(entry))
+        own = generated[key].get(cell)
+        if own:
+            mine, theirs = language.normalize(form), language.normalize(own)
+            if mine != theirs and normalized[key, mine] <= normalized[key, theirs]:
+                continue
+        kept[key, feats] = (form, count)
+    return kept
+
+
+def corpus_observed(
+    store_path, min_count=DEFAULT_CORPUS_MIN_COUNT, language=None, inflections=None
+):
+    """Read the counts as {lemma key: ObservedLemma}, most frequent form last.
+
+    Each form keeps its most frequent feature set, and of the forms sharing
+    a feature set only the most frequent one is kept. Given the language
+    and its rule-generated inflections, only the most frequent form of
+    each paradigm cell is kept, and only if the corpus shows it more often
+    than the generated form of that cell.
+    """
+    conn = _open_readonly(store_path)
+    try:
+        names = {
+            key: (pos, lemma)
+            for key, pos, lemma in conn.execute("SELECT lemma_key, pos, lemma FROM lemmas")
+        }
+        totals = Counter()
+        best_feats = {}
+        for key, form, feats, count in conn.execute(
+            "SELECT lemma_key, form, features, count FROM counts "
+            "ORDER BY lemma_key, form, count DESC, features"
+        ):
+            totals[key, form] += count
+            if count >= min_count:
+                best_feats.setdefault((key, form), (feats, count))
+    finally:
+        conn.close()
+
+    best_forms = {}
+    for (key, form), (feats, count) in best_feats.items():
+        current = best_forms.get((key, feats))
+        if current is None or count > current[1]:
+            best_forms[key, feats] = (form, count)
+    if language is not None and inflections is not None:
+        best_forms = _weigh_cells(best_forms, totals, names, language, inflections)
+
+    by_lemma = {}
+    for (key, feats), (form, count) in best_forms.items():
+        by_lemma.setdefault(key, []).append((count, form, feats))
+    observed = {}
+    for key in sorted(by_lemma):
+        pos, lemma = names[key]
+        record = observed[key] = ObservedLemma(pos, lemma)
+        for _, form, feats in sorted(by_lemma[key]):
+            record.add(form, json.loads(feats))
+    return observed
+
+
+def merge_corpus(observed, corpus):
+    """Append corpus forms the example sentences did not show; returns observed."""
+    for key, record in corpus.items():
+        mine = observed.get(key)
+        if mine is None:
+            observed[key] = record
+            continue
+        for text, form in record.forms.items():
+            if text not in mine.forms:
+                mine.forms[text] = form
+    return observed
+
+
+def corpus_digest(store_path, min_count=DEFAULT_CORPUS_MIN_COUNT):
+    """Fingerprint of the counts a build would merge, or None without a store."""
+    if not os.path.exists(store_path):
+        return None
+    conn = _open_readonly(store_path)
+    try:
+        meta = sorted(conn.execute("SELECT key, value FROM meta"))
+        files = sorted(conn.execute("SELECT path, offset FROM files"))
+        rows, tokens = conn.execute(
+            "SELECT count(*), total(count) FROM counts WHERE count >= ?", (min_count,)
+        ).fetchone()
+        # Rarer forms still weigh against the variants of their cell
+        (seen,) = conn.execute("SELECT total(count) FROM counts").fetchone()
+    finally:
+        conn.close()
+    data = json.dumps([min_count, meta, files, rows, tokens, seen])
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from inflection_core import precompute
+from inflection_corpus import CorpusStore, corpus_observed
+
+PRESENT = {"Number": "Sing", "Person": "3", "Tense": "Pres", "VerbForm": "Fin"}
+PAST = {**PRESENT, "Tense": "Past"}
+PARTICIPLE = {"VerbForm": "Part"}
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    """A corpus store with counts for "backen" (generated: backt, backte, gebackt)."""
+    path = str(tmp_path / "corpus-de.sqlite3")
+    counts = [
+        ("bäckt", {**PRESENT, "Mood": "Ind"}, 5),
+        ("backt", PRESENT, 4),
+        ("backet", {**PRESENT, "Mood": "Sub"}, 2),
+        ("backte", PAST, 3),
+        ("buk", {**PAST, "Mood": "Ind"}, 1),
+        ("gebacken", PARTICIPLE, 6),
+        ("gebackt", PARTICIPLE, 1),
+    ]
+    store = CorpusStore(path)
+    store.add(
+        "corpus.txt",
+        0,
+        1,
+        [(("backen", form, json.dumps(feats)), n) for form, feats, n in counts],
+        {"backen": ("verb", "backen")},
+    )
+    store.close()
+    return path
+
+
+def _forms(observed):
+    return list(observed["backen"].forms)
+
+
+def test_counts_only(store_path):
+    # Without inflections to weigh against, each feature set keeps its top form
+    observed = corpus_observed(store_path, 1)
+    assert _forms(observed) == ["buk", "backet", "backte", "backt", "bäckt", "gebacken"]
+
+
+def test_weighs_forms_per_cell(store_path, language):
+    inflections = {"backen": language.lemma_entry("backen", "verb")}
+    observed = corpus_observed(store_path, 1, language, inflections)
+    # Only the most frequent form of present.er is kept, and it beats backt;
+    # the rare buk loses preterite.er to the generated backte
+    assert _forms(observed) == ["backte", "bäckt", "gebacken"]
+
+
+def test_corpus_store_requires_corpus(tmp_path, language, vocab_path, store_path):
+    out_path = str(tmp_path / "vocabulary-de-inflections.json")
+    with pytest.raises(ValueError, match="--corpus-store requires --corpus"):
+        precompute(language, vocab_path, out_path, corpus_store=store_path)
@@ -0,0 +1,161 @@
+"""
+Compact in-memory model of the inflection data.
+
+Person tables are lists aligned to a tuple of person keys shared by every
+table of a language, and observed forms are slotted records whose feature
+sets are interned tuples, deduplicated as they are added. to_json turns
+the records back into the plain dicts the JSON layout is made of, so the
+written files do not change.
+"""
+
+# Feature items tuple -> the one shared tuple and dict for that feature set
+_FEATURES = {}
+# Person keys tuple -> {person: position}, shared by all tables of a language
+_POSITIONS = {}
+
+
+def intern_features(morph):
+    """Return the shared (items tuple, dict) pair for a feature dict."""
+    items = tuple(morph.items())
+    interned = _FEATURES.get(items)
+    if interned is None:
+        interned = _FEATURES[items] = (items, dict(items))
+    return interned
+
+
+def _positions(persons):
+    persons = tuple(persons)
+    positions = _POSITIONS.get(persons)
+    if positions is None:
+        positions = _POSITIONS[persons] = {p: i for i, p in enumerate(persons)}
+    return positions
+
+
+class PersonTable:
+    """The forms of one tense, stored by position in a shared key tuple.
+
+    Reads like the {person: form} dict it replaces; persons outside the
+    key tuple raise KeyError on assignment.
+    """
+
+    __slots__ = ("positions", "forms")
+
+    def __init__(self, persons, forms):
+        self.positions = _positions(persons)
+        self.forms = list(forms)
+
+    @classmethod
+    def build(cls, persons, conjugate):
+        """Conjugate for every person key, in order."""
+        table = cls.__new__(cls)
+        table.positions = _positions(persons)
+        table.forms = [conjugate(p) for p in table.positions]
+        return table
+
+    def __getitem__(self, person):
+        return self.forms[self.positions[person]]
+
+    def __setitem__(self, person, form):
+        self.forms[self.positions[person]] = form
+
+    def __contains__(self, person):
+        return person in self.positions
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def __len__(self):
+        return len(self.forms)
+
+    def __eq__(self, other):
+        if isinstance(other, PersonTable):
+            return self.positions is other.positions and self.forms == other.forms
+        return isinstance(other, dict) and self.to_dict() == other
+
+    def __repr__(self):
+        return f"PersonTable({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return tuple(self.positions), self.forms
+
+    def __setstate__(self, state):
+        persons, forms = state
+        self.__init__(persons, forms)
+
+    def get(self, person, default=None):
+        i = self.positions.get(person)
+        return default if i is None else self.forms[i]
+
+    def keys(self):
+        return self.positions.keys()
+
+    def values(self):
+        return list(self.forms)
+
+    def items(self):
+        return zip(self.positions, self.forms)
+
+    def to_dict(self):
+        return dict(zip(self.positions, self.forms))
+
+
+class ObservedForm:
+    """A surface form seen in example sentences and its distinct feature sets."""
+
+    __slots__ = ("form", "features")
+
+    def __init__(self, form):
+        self.form = form
+        self.features = []
+
+    def add(self, features):
+        """Record an interned feature set unless it was seen already."""
+        if features not in self.features:
+            self.features.append(features)
+
+    def __getstate__(self):
+        return self.form, [items for items, _ in self.features]
+
+    def __setstate__(self, state):
+        self.form, items = state
+        self.features = [intern_features(dict(i)) for i in items]
+
+
+class ObservedLemma:
+    """The forms seen for one lemma, in first-seen order."""
+
+    __slots__ = ("pos", "lemma", "forms")
+
+    def __init__(self, pos, lemma):
+        self.pos = pos
+        self.lemma = lemma
+        self.forms = {}
+
+    def add(self, text, morph):
+        form = self.forms.get(text)
+        if form is None:
+            form = self.forms[text] = ObservedForm(text)
+        form.add(intern_features(morph))
+
+    def merge(self, other):
+        """Append the forms and feature sets of another record for the lemma."""
+        for text, form in other.forms.items():
+            mine = self.forms.get(text)
+            if mine is None:
+                self.forms[text] = form
+            else:
+                for features in form.features:
+                    mine.add(features)
+
+    def __getstate__(self):
+        return self.pos, self.lemma, self.forms
+
+    def __setstate__(self, state):
+        self.pos, self.lemma, self.forms = state
+
+
+def to_json(obj):
+    """json default hook: person tables serialize as the dicts they replace."""
+    if type(obj) is PersonTable:
+        return dict(zip(obj.positions, obj.forms))
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
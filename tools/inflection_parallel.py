@@ -0,0 +1,114 @@
+"""
+Process-pool sharding for the precompute tools (--jobs).
+
+The vocabulary is split into contiguous shards. Each worker builds the
+rule-generated entries of its shard, parses the shard's uncached example
+sentences and collects the observed forms. The parent replays the partial
+results in shard order, so entries, observations and therefore the output
+are identical for any number of jobs. Irregular detection needs the merged
+entries and stays in the parent, as does writing the analysis cache.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from inflection_core import (
+    Analyzer,
+    collect_observed,
+    download_spacy,
+    merge_collected,
+    register_entries,
+)
+
+
+def split_shards(words, count):
+    """Split words into at most count contiguous shards of near-equal size."""
+    size, extra = divmod(len(words), count)
+    shards = []
+    start = 0
+    for i in range(count):
+        end = start + size + (i < extra)
+        if end > start:
+            shards.append(words[start:end])
+        start = end
+    return shards
+
+
+def _run_shard(language, words, cached, missing, model_options):
+    """Worker: build entries, parse missing sentences and collect observations.
+
+    Returns (built entries, observed, fresh analyses, model version, parse
+    seconds); fresh is None when spaCy could not be loaded.
+    """
+    built = [language.word_entry(w) for w in words]
+    fresh, version, seconds = {}, None, 0.0
+    if missing:
+        analyzer = Analyzer(language.model, cache_dir=None, n_process=1, **model_options)
+        start = time.perf_counter()
+        fresh = analyzer.parse(missing)
+        seconds = time.perf_counter() - start
+        version = analyzer.version
+    observed = {}
+    if fresh is not None:
+        observed = collect_observed(words, {**cached, **fresh}, language.normalize)
+    return built, observed, fresh, version, seconds
+
+
+def analyze_sharded(language, words, analyzer, jobs):
+    """Build entries and collect observations across worker processes.
+
+    Returns (has_spacy, inflections, observed, analyses) as the serial
+    build, analyze and collect steps produce them. jobs < 1 uses every core.
+    """
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+    shards = split_shards(words, jobs)
+    examples = [[w.get("example") or "" for w in shard] for shard in shards]
+
+    cached, missing = {}, []
+    has_spacy = analyzer.enabled
+    if has_spacy:
+        cached, missing = analyzer.lookup(e for shard in examples for e in shard)
+        if not missing and not analyzer.version:
+            has_spacy = analyzer.parse([]) is not None
+        elif missing and analyzer.download:
+            # Download the model once here rather than in every worker; only
+            # the workers load it
+            has_spacy = download_spacy(analyzer.model_name)
+    missing = set(missing) if has_spacy else set()
+
+    model_options = {"batch_size": analyzer.batch_size}
+    inflections = {}
+    observed = {}
+    fresh_all = {}
+    with ProcessPoolExecutor(max_workers=max(len(shards), 1)) as pool:
+        futures = [
+            pool.submit(
+                _run_shard,
+                language,
+                shard,
+                {e: cached[e] for e in shard_examples if e in cached},
+                [e for e in dict.fromkeys(shard_examples) if e in missing],
+                model_options,
+            )
+            for shard, shard_examples in zip(shards, examples)
+        ]
+        for future in futures:
+            built, partial, fresh, version, seconds = future.result()
+            register_entries(built, inflections)
+            merge_collected(observed, partial)
+            if fresh is None:
+                has_spacy = False
+                continue
+            if fresh:
+                analyzer.version = analyzer.version or version
+                analyzer.profiler.record_analysis(
+                    len(fresh), sum(len(tokens) for tokens in fresh.values()), seconds
+                )
+                fresh_all.update(fresh)
+
+    if not has_spacy:
+        return False, inflections, {}, {}
+    analyzer.store(fresh_all)
+    return True, inflections, observed, {**cached, **fresh_all}
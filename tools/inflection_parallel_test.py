@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from inflection_core import _precompute, companion_path
+from inflection_parallel import split_shards
+from inflection_profile import NULL_PROFILER
+
+
+def test_split_shards_keeps_order(words):
+    shards = split_shards(words, 7)
+    assert len(shards) == 7
+    assert [w for shard in shards for w in shard] == words
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_jobs_output_is_identical(
+    tmp_path, language, vocab_path, analyzer, build_options, jobs
+):
+    outputs = {}
+    for n in (1, jobs):
+        out_dir = tmp_path / str(n)
+        out_dir.mkdir()
+        out_path = str(out_dir / "vocabulary-de-inflections.json")
+        options = {**build_options, "jobs": n, "examples": True}
+        _precompute(language, vocab_path, out_path, analyzer, NULL_PROFILER, **options)
+        outputs[n] = {}
+        for kind in ("index", "forms", "inputs", "examples"):
+            path = companion_path(out_path, kind)
+            with open(path, "rb") as fh:
+                outputs[n][os.path.basename(path)] = fh.read()
+        with open(out_path, "rb") as fh:
+            outputs[n]["inflections"] = fh.read()
+    assert outputs[jobs] == outputs[1]
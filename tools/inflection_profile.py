@@ -0,0 +1,132 @@
+"""
+Phase profiling for the precompute tools (--profile).
+
+A Profiler times named phases, records the tracemalloc peak of each and
+prints a summary at the end of a run. Phases with the same name accumulate,
+so per-chunk phases of the streaming mode add up. The disabled profiler
+(NULL_PROFILER) costs next to nothing and is used when --profile is off.
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Profiler:
+    """Collect per-phase wall time and peak memory, plus spaCy throughput."""
+
+    def __init__(self, enabled=True, output=None):
+        self.enabled = enabled
+        self.output = output
+        self.phases = {}
+        self.events = []
+        self.sentences = 0
+        self.tokens = 0
+        self.pipe_seconds = 0.0
+        self.origin = time.perf_counter()
+        self.cprofile = None
+        # Peaks seen so far by each open phase; nested phases reset the
+        # tracemalloc peak, so they hand theirs back to the enclosing phase
+        self.stack = []
+
+    def start(self):
+        """Start tracing memory (and cProfile when writing a .prof file)."""
+        if not self.enabled:
+            return
+        tracemalloc.start()
+        if self.output and not self.output.endswith(".json"):
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase; repeated phases accumulate."""
+        if not self.enabled:
+            yield
+            return
+        if self.stack:
+            self.stack[-1] = max(self.stack[-1], tracemalloc.get_traced_memory()[1])
+        self.stack.append(0)
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = max(self.stack.pop(), tracemalloc.get_traced_memory()[1])
+            if self.stack:
+                self.stack[-1] = max(self.stack[-1], peak)
+            stats = self.phases.setdefault(name, {"seconds": 0.0, "peak": 0, "calls": 0})
+            stats["seconds"] += elapsed
+            stats["peak"] = max(stats["peak"], peak)
+            stats["calls"] += 1
+            self.events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+    def record_analysis(self, sentences, tokens, seconds):
+        """Add sentences and tokens that went through nlp.pipe."""
+        self.sentences += sentences
+        self.tokens += tokens
+        self.pipe_seconds += seconds
+
+    def summary(self):
+        """Return the collected measurements as a plain dict."""
+        result = {"phases": self.phases}
+        if self.pipe_seconds:
+            result["spacy"] = {
+                "sentences": self.sentences,
+                "tokens": self.tokens,
+                "seconds": self.pipe_seconds,
+                "sentences_per_second": self.sentences / self.pipe_seconds,
+                "tokens_per_second": self.tokens / self.pipe_seconds,
+            }
+        return result
+
+    def finish(self):
+        """Stop tracing, print the summary and write the profile output."""
+        if not self.enabled:
+            return None
+        if self.cprofile:
+            self.cprofile.disable()
+        tracemalloc.stop()
+
+        summary = self.summary()
+        print("Profile:")
+        for name, stats in self.phases.items():
+            calls = f" x{stats['calls']}" if stats["calls"] > 1 else ""
+            print(
+                f"  {name:<12} {stats['seconds']:8.3f}s"
+                f"  peak {stats['peak'] / 2**20:8.1f} MiB{calls}"
+            )
+        if "spacy" in summary:
+            spacy = summary["spacy"]
+            print(
+                f"  spaCy: {spacy['sentences']} sentences, {spacy['tokens']} tokens,",
+                f"{spacy['sentences_per_second']:.1f} sentences/s,",
+                f"{spacy['tokens_per_second']:.1f} tokens/s",
+            )
+
+        if self.output:
+            os.makedirs(os.path.dirname(self.output) or ".", exist_ok=True)
+            if self.cprofile:
+                self.cprofile.dump_stats(self.output)
+            else:
+                with open(self.output, "w", encoding="utf-8") as fh:
+                    json.dump({"traceEvents": self.events, "summary": summary}, fh)
+            print("Wrote profile to", self.output)
+        return summary
+
+
+NULL_PROFILER = Profiler(enabled=False)
@@ -0,0 +1,269 @@
+"""
+Indexed SQLite export of a compact inflection payload (--sqlite), for
+graders and content tools that look up surface forms at high volume
+without loading and scanning the JSON in every process.
+
+Tables:
+
+  meta      key, value            payload meta, values JSON-encoded
+  words     id, key, base, pos, lemma, vocabulary
+            one row per entry; key is its inflection key (word id or lemma
+            key), lemma the language-normalized base, vocabulary 1 when key
+            is a vocabulary word id
+  aliases   alias, word           further keys of shared entries
+  forms     word, surface, normalized, form_type, person, tense, number,
+            irregular, features
+            the base, paradigm cells and observed forms of each entry;
+            normalized is client_normalize(surface) as in the form index,
+            person is the language's person key, tense and number are
+            Universal Dependencies values (Pres/Past, Sing/Plur), and
+            irregular is 1 for cells overridden from observed forms
+  features  id, name, value       feature sets of observed forms
+
+forms is indexed on normalized and words on lemma. The database is built
+in a temporary file and moved into place, so readers never see a partial
+file; open_database opens it read-only and memory-mapped, so processes
+reading the same file share its pages.
+"""
+
+import json
+import os
+import sqlite3
+from urllib.parse import quote
+
+from inflection_core import (
+    DEFAULT_CACHE_DIR,
+    client_normalize,
+    form_cells,
+    load_tables,
+    person_key,
+)
+
+# Bytes of the database file readers memory-map (SQLite clamps it to the file size)
+DEFAULT_MMAP_SIZE = 1 << 28
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    base TEXT NOT NULL,
+    pos TEXT,
+    lemma TEXT NOT NULL,
+    vocabulary INTEGER NOT NULL
+);
+CREATE TABLE aliases (
+    alias TEXT PRIMARY KEY,
+    word INTEGER NOT NULL REFERENCES words (id)
+);
+CREATE TABLE features (
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (id, name)
+) WITHOUT ROWID;
+CREATE TABLE forms (
+    word INTEGER NOT NULL REFERENCES words (id),
+    surface TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    form_type TEXT NOT NULL,
+    person TEXT,
+    tense TEXT,
+    number TEXT,
+    irregular INTEGER NOT NULL,
+    features INTEGER
+);
+"""
+INDEXES = """
+CREATE INDEX forms_normalized ON forms (normalized);
+CREATE INDEX words_lemma ON words (lemma);
+"""
+
+_TENSES = {"present": "Pres", "preterite": "Past", "past_participle": "Past"}
+
+
+def sqlite_path(code):
+    """Default location of a language's database, outside the published data."""
+    return os.path.join(DEFAULT_CACHE_DIR, f"inflections-{code}.sqlite3")
+
+
+def _entry_forms(entry, person_features):
+    """Yield (surface, form type, person, tense, number, features) for an entry."""
+    yield (
+        entry["base"],
+        "base",
+        None,
+        None,
+        "Sing" if entry.get("pos") == "noun" else None,
+        None,
+    )
+    for cell, form in form_cells(entry):
+        form_type, _, person = cell.partition(".")
+        if person:
+            number = person_features.get(person, {}).get("Number")
+        else:
+            number = "Plur" if form_type == "plural" else None
+        yield form, form_type, person or None, _TENSES.get(form_type), number, None
+    for obs in entry.get("observed", []):
+        feats = obs["features"]
+        yield (
+            obs["form"],
+            "observed",
+            person_key(feats, person_features),
+            feats.get("Tense"),
+            feats.get("Number"),
+            feats,
+        )
+
+
+def _irregular_cells(payload):
+    """Return {canonical key: set of overridden cell names}."""
+    aliases = payload.get("aliases", {})
+    cells = {}
+    for names in payload.get("irregular", {}).values():
+        for key, cell_names in names.items():
+            cells.setdefault(aliases.get(key, key), set()).update(cell_names)
+    return cells
+
+
+def write_sqlite(path, language, payload, words):
+    """Write a compact payload as an indexed SQLite database; returns path."""
+    person_features = load_tables(language.code).get("person_features", {})
+    vocabulary = {w.get("id") for w in words}
+    irregular = _irregular_cells(payload)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # A new file that is only moved into place once complete needs no journal
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            (
+                (key, json.dumps(value, ensure_ascii=False, sort_keys=True))
+                for key, value in payload["meta"].items()
+            ),
+        )
+
+        featsets = {}
+        word_ids = {}
+        form_rows = []
+        for key, entry in payload["inflections"].items():
+            word_id = word_ids[key] = len(word_ids) + 1
+            conn.execute(
+                "INSERT INTO words (id, key, base, pos, lemma, vocabulary) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    word_id,
+                    key,
+                    entry["base"],
+                    entry.get("pos"),
+                    language.normalize(entry.get("lemma") or entry["base"]),
+                    int(key in vocabulary),
+                ),
+            )
+            overridden = irregular.get(key, ())
+            seen = set()
+            for surface, form_type, person, tense, number, feats in _entry_forms(
+                entry, person_features
+            ):
+                featset = None
+                if feats is not None:
+                    items = tuple(feats.items())
+                    featset = featsets.setdefault(items, len(featsets) + 1)
+                normalized = client_normalize(surface) if surface else ""
+                row = (word_id, surface, form_type, person, featset)
+                # Forms without letters are not indexed, as in build_form_index
+                if not normalized or row in seen:
+                    continue
+                seen.add(row)
+                cell = f"{form_type}.{person}" if person else form_type
+                form_rows.append(
+                    (
+                        word_id,
+                        surface,
+                        normalized,
+                        form_type,
+                        person,
+                        tense,
+                        number,
+                        int(form_type != "observed" and cell in overridden),
+                        featset,
+                    )
+                )
+        conn.executemany(
+            "INSERT INTO forms (word, surface, normalized, form_type, person, tense, "
+            "number, irregular, features) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            form_rows,
+        )
+        conn.executemany(
+            "INSERT INTO features (id, name, value) VALUES (?, ?, ?)",
+            (
+                (featset, name, value)
+                for items, featset in featsets.items()
+                for name, value in items
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO aliases (alias, word) VALUES (?, ?)",
+            ((alias, word_ids[key]) for alias, key in payload.get("aliases", {}).items()),
+        )
+        conn.executescript(INDEXES)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def open_database(path, mmap_size=DEFAULT_MMAP_SIZE):
+    """Open an exported database read-only, memory-mapped for shared reads."""
+    conn = sqlite3.connect(
+        f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True, check_same_thread=False
+    )
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    return conn
+
+
+def lookup(conn, text):
+    """Return the words and forms a surface token may belong to.
+
+    Each match is a dict of the forms columns plus the word's key, base, pos
+    and vocabulary flag; features is the feature dict of observed forms.
+    """
+    rows = conn.execute(
+        "SELECT w.key, w.base, w.pos, w.vocabulary, f.surface, f.form_type, "
+        "f.person, f.tense, f.number, f.irregular, f.features "
+        "FROM forms f JOIN words w ON w.id = f.word "
+        "WHERE f.normalized = ? ORDER BY f.rowid",
+        (client_normalize(text),),
+    ).fetchall()
+    featsets = {}
+    matches = []
+    for key, base, pos, vocab, surface, form_type, person, tense, number, irr, feat_id in rows:
+        if feat_id is not None and feat_id not in featsets:
+            featsets[feat_id] = dict(
+                conn.execute("SELECT name, value FROM features WHERE id = ?", (feat_id,))
+            )
+        matches.append(
+            {
+                "key": key,
+                "base": base,
+                "pos": pos,
+                "vocabulary": bool(vocab),
+                "surface": surface,
+                "form_type": form_type,
+                "person": person,
+                "tense": tense,
+                "number": number,
+                "irregular": bool(irr),
+                "features": featsets.get(feat_id, {}),
+            }
+        )
+    return matches
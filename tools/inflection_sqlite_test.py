@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from inflection_core import DEFAULT_CACHE_DIR, _precompute, precompute
+from inflection_profile import NULL_PROFILER
+from inflection_sqlite import lookup, open_database, sqlite_path
+
+
+def test_default_path_is_outside_public_data():
+    path = sqlite_path("de")
+    assert os.path.dirname(path) == DEFAULT_CACHE_DIR
+    assert "public" not in os.path.relpath(path, os.getcwd()).split(os.sep)
+
+
+def test_write_and_lookup(tmp_path, language, vocab_path, words, analyzer, build_options):
+    out_path = str(tmp_path / "data" / "vocabulary-de-inflections.json")
+    db_path = str(tmp_path / "db" / "inflections-de.sqlite3")
+    os.mkdir(tmp_path / "data")
+    options = {**build_options, "sqlite": db_path}
+    _precompute(language, vocab_path, out_path, analyzer, NULL_PROFILER, **options)
+    assert sorted(os.listdir(tmp_path / "db")) == ["inflections-de.sqlite3"]
+    assert not any(name.endswith(".sqlite3") for name in os.listdir(tmp_path / "data"))
+
+    verb = next(w for w in words if w.get("partOfSpeech") == "verb")
+    conn = open_database(db_path)
+    try:
+        matches = lookup(conn, verb["word"])
+    finally:
+        conn.close()
+    assert any(m["key"] == verb["id"] and m["form_type"] == "base" for m in matches)
+
+
+def test_sqlite_path_requires_sqlite(tmp_path, language, vocab_path):
+    out_path = str(tmp_path / "vocabulary-de-inflections.json")
+    with pytest.raises(ValueError, match="--sqlite-path requires --sqlite"):
+        precompute(language, vocab_path, out_path, sqlite_path=str(tmp_path / "x.sqlite3"))
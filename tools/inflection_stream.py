@@ -0,0 +1,514 @@
+"""
+Streaming precompute for vocabularies too large to hold in memory.
+
+Words are read incrementally from the vocabulary file and processed in
+bounded chunks. Everything that has to survive a chunk (entries, keys,
+observed forms, index hits, form table rows) lives in a temporary SQLite scratch database,
+and the compact layout is written from it row by row. The output matches
+what inflection_core.precompute writes for the compact layout.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+from inflection_core import (
+    DEFAULT_CHUNK_SIZE,
+    build_form_index,
+    build_form_table,
+    collect_observed,
+    companion_path,
+    compact_irregular,
+    compress_outputs,
+    input_fingerprint,
+    publish_hashed,
+    word_digests,
+)
+from inflection_model import to_json
+from inflection_profile import NULL_PROFILER
+
+READ_BYTES = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+# Characters that may continue a number ("1." and "1e" decode as 1)
+_NUMBER_TAIL = frozenset("0123456789.eE+-")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=to_json)
+
+
+class _JSONReader:
+    """Pull JSON values one at a time from a text file."""
+
+    def __init__(self, fh, read_bytes=READ_BYTES):
+        self.fh = fh
+        self.read_bytes = read_bytes
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        data = self.fh.read(self.read_bytes)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ("" at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def take(self, *expected):
+        ch = self.peek()
+        if ch not in expected:
+            raise ValueError(f"expected one of {expected!r}, found {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number or literal may continue in the next chunk
+            if (
+                not self.eof
+                and (end == len(self.buf) or isinstance(value, (int, float)))
+                and _NUMBER_TAIL.issuperset(self.buf[end:])
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(path, key="words", read_bytes=READ_BYTES):
+    """Yield the items of the top-level array member `key` one at a time."""
+    with open(path, "r", encoding="utf-8") as fh:
+        reader = _JSONReader(fh, read_bytes)
+        reader.take("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            name = reader.value()
+            reader.take(":")
+            if name == key and reader.peek() == "[":
+                reader.take("[")
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value()
+                        if reader.take(",", "]") == "]":
+                            break
+            else:
+                reader.value()
+            if reader.take(",", "}") == "}":
+                return
+
+
+def read_meta(path, read_bytes=READ_BYTES):
+    """Return the leading "meta" member of an output file, or None.
+
+    Only the start of the file is read, however large the rest is.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        reader = _JSONReader(fh, read_bytes)
+        reader.take("{")
+        if reader.peek() == "}" or reader.value() != "meta":
+            return None
+        reader.take(":")
+        return reader.value()
+
+
+def iter_chunks(items, size):
+    """Group an iterable into lists of at most `size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ScratchStore:
+    """Temporary SQLite database holding the cross-chunk precompute state.
+
+    Keys map to entry ids (several keys may share one entry, like the
+    aliases of the in-memory dict); seq columns preserve insertion order.
+    """
+
+    SCHEMA = """
+        CREATE TABLE entries (eid INTEGER PRIMARY KEY, entry TEXT NOT NULL);
+        CREATE TABLE keys (key TEXT PRIMARY KEY, seq INTEGER, eid INTEGER);
+        CREATE INDEX keys_eid ON keys (eid, seq);
+        CREATE TABLE words (seq INTEGER PRIMARY KEY, id TEXT, word TEXT);
+        CREATE TABLE lemmas (
+            lemma_key TEXT PRIMARY KEY, seq INTEGER, pos TEXT, lemma TEXT
+        );
+        CREATE TABLE forms (
+            lemma_key TEXT, form TEXT, seq INTEGER, features TEXT,
+            PRIMARY KEY (lemma_key, form)
+        );
+        CREATE TABLE irregular (seq INTEGER PRIMARY KEY, kind TEXT, key TEXT,
+            cells TEXT);
+        CREATE TABLE index_forms (form TEXT PRIMARY KEY, seq INTEGER);
+        CREATE TABLE index_hits (
+            form TEXT, seq INTEGER, hit TEXT, PRIMARY KEY (form, hit)
+        );
+        CREATE TABLE form_table (id TEXT PRIMARY KEY, seq INTEGER, cells TEXT);
+        CREATE TABLE word_digests (id TEXT PRIMARY KEY, seq INTEGER, digest TEXT);
+    """
+
+    def __init__(self, directory=None):
+        fd, self.path = tempfile.mkstemp(suffix=".sqlite3", dir=directory)
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(self.SCHEMA)
+        self.seq = 0
+
+    def next_seq(self):
+        self.seq += 1
+        return self.seq
+
+    def add_entry(self, entry):
+        cur = self.conn.execute("INSERT INTO entries (entry) VALUES (?)", (_dumps(entry),))
+        return cur.lastrowid
+
+    def set_key(self, key, eid):
+        """Point key at eid, keeping the key's position if it exists."""
+        self.conn.execute(
+            "INSERT INTO keys (key, seq, eid) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET eid = excluded.eid",
+            (key, self.next_seq(), eid),
+        )
+
+    def add_alias(self, key, eid):
+        """Point key at eid unless the key is already taken."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO keys (key, seq, eid) VALUES (?, ?, ?)",
+            (key, self.next_seq(), eid),
+        )
+
+    def lookup(self, key):
+        """Return (eid, entry) for a key, or (None, None)."""
+        row = self.conn.execute(
+            "SELECT e.eid, e.entry FROM keys k JOIN entries e ON e.eid = k.eid "
+            "WHERE k.key = ?",
+            (key,),
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else (None, None)
+
+    def update_entry(self, eid, entry):
+        self.conn.execute(
+            "UPDATE entries SET entry = ? WHERE eid = ?", (_dumps(entry), eid)
+        )
+
+    def close(self):
+        self.conn.close()
+        os.remove(self.path)
+
+
+def _add_words(store, language, chunk):
+    """Rule-generate entries for a chunk of words (see build_inflections)."""
+    for w in chunk:
+        store.conn.execute(
+            "INSERT INTO words (seq, id, word) VALUES (?, ?, ?)",
+            (store.next_seq(), w.get("id"), w.get("word")),
+        )
+        if w.get("id"):
+            row = store.conn.execute(
+                "SELECT digest FROM word_digests WHERE id = ?", (w["id"],)
+            ).fetchone()
+            digest = word_digests([w], {w["id"]: row[0]} if row else None)[w["id"]]
+            store.conn.execute(
+                "INSERT INTO word_digests (id, seq, digest) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET digest = excluded.digest",
+                (w["id"], store.next_seq(), digest),
+            )
+        built = language.word_entry(w)
+        if built is None:
+            continue
+        wid, norm_key, entry = built
+        eid = store.add_entry(entry)
+        store.set_key(wid, eid)
+        if norm_key:
+            store.add_alias(norm_key, eid)
+
+
+def _add_observed(store, observed):
+    """Record first-seen lemmas and forms (see collect_observed)."""
+    for lemma_key, record in observed.items():
+        store.conn.execute(
+            "INSERT OR IGNORE INTO lemmas (lemma_key, seq, pos, lemma) "
+            "VALUES (?, ?, ?, ?)",
+            (lemma_key, store.next_seq(), record.pos, record.lemma),
+        )
+        for form in record.forms.values():
+            # flatten_forms keeps the first feature set seen for a form
+            store.conn.execute(
+                "INSERT OR IGNORE INTO forms (lemma_key, form, seq, features) "
+                "VALUES (?, ?, ?, ?)",
+                (lemma_key, form.form, store.next_seq(), _dumps(form.features[0][1])),
+            )
+
+
+def _merge(store, language):
+    """Merge observed forms lemma by lemma (see merge_observations)."""
+    cursor = store.conn.execute("SELECT lemma_key, pos, lemma FROM lemmas ORDER BY seq")
+    while True:
+        rows = cursor.fetchmany(DEFAULT_CHUNK_SIZE)
+        if not rows:
+            break
+        for lemma_key, pos, lemma in rows:
+            forms_list = [
+                {"form": form, "features": json.loads(features)}
+                for form, features in store.conn.execute(
+                    "SELECT form, features FROM forms WHERE lemma_key = ? "
+                    "ORDER BY seq",
+                    (lemma_key,),
+                )
+            ]
+            eid, entry = store.lookup(lemma_key)
+            if not entry:
+                entry = language.lemma_entry(lemma, pos)
+                eid = store.add_entry(entry)
+                store.set_key(lemma_key, eid)
+            irregular = {"verbs": {}, "nouns": {}}
+            language.merge_observed(entry, lemma_key, pos, forms_list, irregular)
+            store.update_entry(eid, entry)
+            for kind, cells in compact_irregular(irregular).items():
+                for key, names in cells.items():
+                    store.conn.execute(
+                        "INSERT INTO irregular (seq, kind, key, cells) "
+                        "VALUES (?, ?, ?, ?)",
+                        (store.next_seq(), kind, key, _dumps(names)),
+                    )
+
+
+def _build_index(store):
+    """Collect reverse-index hits and form table rows word by word.
+
+    See build_form_index and build_form_table.
+    """
+    words = store.conn.execute("SELECT id, word FROM words ORDER BY seq")
+    while True:
+        rows = words.fetchmany(DEFAULT_CHUNK_SIZE)
+        if not rows:
+            break
+        for wid, word in rows:
+            if wid is None:
+                continue
+            _, entry = store.lookup(wid)
+            if entry is None:
+                continue
+            hits = build_form_index([{"id": wid, "word": word}], {wid: entry})
+            for cells in build_form_table([{"id": wid}], {wid: entry}).values():
+                store.conn.execute(
+                    "INSERT OR IGNORE INTO form_table (id, seq, cells) VALUES (?, ?, ?)",
+                    (wid, store.next_seq(), _dumps(cells)),
+                )
+            for form, form_hits in hits.items():
+                store.conn.execute(
+                    "INSERT OR IGNORE INTO index_forms (form, seq) VALUES (?, ?)",
+                    (form, store.next_seq()),
+                )
+                for hit in form_hits:
+                    store.conn.execute(
+                        "INSERT OR IGNORE INTO index_hits (form, seq, hit) "
+                        "VALUES (?, ?, ?)",
+                        (form, store.next_seq(), _dumps(hit)),
+                    )
+
+
+def _write_members(fh, rows):
+    """Write "key":value pairs from (key, raw JSON) rows."""
+    first = True
+    for key, raw in rows:
+        if not first:
+            fh.write(",")
+        fh.write(_dumps(key))
+        fh.write(":")
+        fh.write(raw)
+        first = False
+
+
+@contextmanager
+def _replacing(path):
+    """Write to a temporary file that atomically replaces path when done."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        yield fh
+    os.replace(tmp_path, path)
+
+
+def _write_output(store, out_path, has_spacy, inputs):
+    """Write the compact layout straight from the scratch database."""
+    conn = store.conn
+    first_seq = "(SELECT MIN(k2.seq) FROM keys k2 WHERE k2.eid = k.eid)"
+    with _replacing(out_path) as fh:
+        fh.write('{"meta":')
+        fh.write(_dumps({"spaCy": has_spacy, "layout": "compact", "inputs": inputs}))
+        fh.write(',"inflections":{')
+        _write_members(
+            fh,
+            conn.execute(
+                "SELECT k.key, e.entry FROM keys k JOIN entries e ON e.eid = k.eid "
+                f"WHERE k.seq = {first_seq} ORDER BY k.seq"
+            ),
+        )
+        fh.write('},"aliases":{')
+        _write_members(
+            fh,
+            (
+                (alias, _dumps(canonical))
+                for alias, canonical in conn.execute(
+                    "SELECT k.key, (SELECT k2.key FROM keys k2 WHERE k2.eid = k.eid "
+                    "ORDER BY k2.seq LIMIT 1) FROM keys k "
+                    f"WHERE k.seq > {first_seq} ORDER BY k.seq"
+                )
+            ),
+        )
+        fh.write("}")
+        if conn.execute("SELECT 1 FROM irregular LIMIT 1").fetchone():
+            fh.write(',"irregular":{')
+            for i, kind in enumerate(("verbs", "nouns")):
+                fh.write(("," if i else "") + _dumps(kind) + ":{")
+                _write_members(
+                    fh,
+                    conn.execute(
+                        "SELECT key, cells FROM irregular WHERE kind = ? ORDER BY seq",
+                        (kind,),
+                    ),
+                )
+                fh.write("}")
+            fh.write("}")
+        fh.write("}")
+
+
+def _write_index(store, path):
+    """Write the reverse form index from the scratch database (see write_index)."""
+    with _replacing(path) as fh:
+        fh.write('{"index":{')
+        current = None
+        for form, hit in store.conn.execute(
+            "SELECT f.form, h.hit FROM index_forms f "
+            "JOIN index_hits h ON h.form = f.form ORDER BY f.seq, h.seq"
+        ):
+            if form != current:
+                fh.write("]," if current is not None else "")
+                fh.write(_dumps(form) + ":[")
+                current = form
+            else:
+                fh.write(",")
+            fh.write(hit)
+        fh.write("]" if current is not None else "")
+        fh.write("}}")
+
+
+def _write_forms(store, path):
+    """Write the form table from the scratch database (see write_forms)."""
+    with _replacing(path) as fh:
+        fh.write('{"forms":{')
+        _write_members(fh, store.conn.execute("SELECT id, cells FROM form_table ORDER BY seq"))
+        fh.write("}}")
+
+
+def _write_word_digests(store, path):
+    """Write the per-word input digests (see write_word_digests)."""
+    with _replacing(path) as fh:
+        fh.write('{"words":{')
+        _write_members(
+            fh,
+            (
+                (wid, _dumps(digest))
+                for wid, digest in store.conn.execute(
+                    "SELECT id, digest FROM word_digests ORDER BY seq"
+                )
+            ),
+        )
+        fh.write("}}")
+
+
+def precompute_streaming(
+    language,
+    vocab_path,
+    out_path,
+    analyzer,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    compress=False,
+    hashed=False,
+    profiler=NULL_PROFILER,
+):
+    """Precompute inflections with bounded memory, writing the compact layout.
+
+    Sentences are analysed chunk by chunk with the given Analyzer, which
+    the caller closes. Returns the number of words processed.
+    """
+    store = ScratchStore()
+    count = 0
+    has_spacy = None
+    chunks = iter_chunks(iter_json_array(vocab_path), chunk_size)
+    try:
+        while True:
+            with profiler.phase("load"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            count += len(chunk)
+            with profiler.phase("rules"):
+                _add_words(store, language, chunk)
+            with profiler.phase("analysis"):
+                chunk_spacy, analyses = analyzer.analyze(
+                    w.get("example") or "" for w in chunk
+                )
+            has_spacy = chunk_spacy if has_spacy is None else has_spacy and chunk_spacy
+            with profiler.phase("merge"):
+                _add_observed(store, collect_observed(chunk, analyses, language.normalize))
+        if has_spacy is None:
+            has_spacy, _ = analyzer.analyze(())
+        print("Streamed", count, language.name, "vocabulary entries")
+        print("spaCy available:", has_spacy)
+
+        with profiler.phase("merge"):
+            _merge(store, language)
+        with profiler.phase("index"):
+            _build_index(store)
+        with profiler.phase("serialize"):
+            inputs = input_fingerprint(language, vocab_path, has_spacy)
+            _write_output(store, out_path, has_spacy, inputs)
+            _write_word_digests(store, companion_path(out_path, "inputs"))
+            index_path = companion_path(out_path, "index")
+            _write_index(store, index_path)
+            forms_path = companion_path(out_path, "forms")
+            _write_forms(store, forms_path)
+        print("Wrote", language.name, "inflections to", out_path)
+    finally:
+        store.close()
+
+    written = [out_path, index_path, forms_path]
+    if hashed:
+        with profiler.phase("hash"):
+            written.extend(publish_hashed(out_path, written))
+    if compress:
+        with profiler.phase("compress"):
+            compress_outputs(written)
+    return count
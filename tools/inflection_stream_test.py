@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from inflection_core import Analyzer, _precompute, companion_path, precompute
+from inflection_profile import NULL_PROFILER
+from inflection_stream import iter_json_array, precompute_streaming
+
+
+def _outputs(out_path):
+    paths = [out_path] + [companion_path(out_path, k) for k in ("index", "forms", "inputs")]
+    outputs = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as fh:
+            outputs.append(json.load(fh))
+    return outputs
+
+
+@pytest.mark.parametrize("observed", [True, False])
+def test_stream_matches_in_memory(
+    tmp_path, language, vocab_path, analyzer, build_options, observed
+):
+    if not observed:
+        analyzer = Analyzer(language.model, cache_dir=None, enabled=False)
+    memory_path = str(tmp_path / "memory" / "vocabulary-de-inflections.json")
+    stream_path = str(tmp_path / "stream" / "vocabulary-de-inflections.json")
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "stream").mkdir()
+
+    _precompute(language, vocab_path, memory_path, analyzer, NULL_PROFILER, **build_options)
+    # Chunks smaller than the vocabulary, so entries are merged across chunks
+    precompute_streaming(language, vocab_path, stream_path, analyzer, chunk_size=7)
+
+    memory, stream = _outputs(memory_path), _outputs(stream_path)
+    assert bool(memory[0].get("irregular")) == observed
+    assert stream == memory
+
+
+def test_iter_json_array_small_reads(vocab_path, words):
+    assert list(iter_json_array(vocab_path, read_bytes=5)) == words
+
+
+def test_stream_notes_skipped_examples(tmp_path, capsys, language, vocab_path):
+    out_path = str(tmp_path / "vocabulary-de-inflections.json")
+    precompute(language, vocab_path, out_path, stream=True, use_spacy=False, cache_dir=None)
+    assert "does not write annotated examples" in capsys.readouterr().out
+    assert not (tmp_path / "vocabulary-de-examples.json").exists()
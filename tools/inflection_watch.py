@@ -0,0 +1,208 @@
+"""
+Watch mode for the precompute tools (--watch).
+
+The vocabulary file is polled for changes while the spaCy model stays
+loaded. Each word's rule-generated entry and observed forms are kept
+between rebuilds, so after an edit only added or changed words (compared
+by id) are regenerated and their example sentences analysed. The output
+is then reassembled from the kept results and replaced atomically; it
+matches what a full run of the tool writes. The annotated examples are
+rewritten too, since a changed word can change any sentence's matches.
+"""
+
+import json
+import os
+import pickle
+import time
+
+from inflection_core import (
+    annotate_example,
+    build_form_index,
+    build_form_table,
+    build_payload,
+    collect_observed,
+    compress_outputs,
+    input_fingerprint,
+    merge_collected,
+    merge_observations,
+    publish_hashed,
+    register_entries,
+    word_digests,
+    write_examples,
+    write_forms,
+    write_index,
+    write_payload,
+    write_word_digests,
+)
+
+DEFAULT_WATCH_INTERVAL = 0.2
+
+
+def word_keys(words):
+    """Key words by id, numbering repeated (or missing) ids in order."""
+    seen = {}
+    keys = []
+    for w in words:
+        wid = w.get("id")
+        n = seen.get(wid, 0)
+        seen[wid] = n + 1
+        keys.append((wid, n))
+    return keys
+
+
+class IncrementalBuild:
+    """Per-word results of the last build, updated from vocabulary edits."""
+
+    def __init__(self, language, analyzer):
+        self.language = language
+        self.analyzer = analyzer
+        self.has_spacy = False
+        self.keys = []
+        # key -> (word JSON, pickled (word_entry result, observed forms),
+        # example tokens), pickled because merging mutates them and every
+        # rebuild needs a copy
+        self.results = {}
+
+    def update(self, words):
+        """Regenerate added and changed words.
+
+        Returns (added, changed, removed, reordered) relative to the last
+        update.
+        """
+        keys = word_keys(words)
+        dirty = []
+        for key, w in zip(keys, words):
+            text = json.dumps(w, sort_keys=True, ensure_ascii=False)
+            previous = self.results.get(key)
+            if previous is None or previous[0] != text:
+                dirty.append((key, w, text))
+
+        analyses = {}
+        if dirty or not self.results:
+            self.has_spacy, analyses = self.analyzer.analyze(
+                w.get("example") or "" for _, w, _ in dirty
+            )
+        added = sum(1 for key, _, _ in dirty if key not in self.results)
+        for key, w, text in dirty:
+            observed = collect_observed([w], analyses, self.language.normalize)
+            result = (self.language.word_entry(w), observed)
+            tokens = analyses.get(w.get("example") or "", ())
+            self.results[key] = (text, pickle.dumps(result, pickle.HIGHEST_PROTOCOL), tokens)
+
+        current = set(keys)
+        removed = [key for key in self.results if key not in current]
+        for key in removed:
+            del self.results[key]
+        reordered = keys != self.keys
+        self.keys = keys
+        return added, len(dirty) - added, len(removed), reordered
+
+    def outputs(self, words, legacy_layout=False, inputs=None):
+        """Assemble the payload, form index and form table from the kept results."""
+        inflections = {}
+        observed = {}
+        for key in self.keys:
+            built, partial = pickle.loads(self.results[key][1])
+            register_entries((built,), inflections)
+            merge_collected(observed, partial)
+        irregular = merge_observations(self.language, inflections, observed)
+        index = build_form_index(words, inflections)
+        forms = build_form_table(words, inflections)
+        payload = build_payload(
+            self.has_spacy, inflections, irregular, legacy_layout=legacy_layout, inputs=inputs
+        )
+        return payload, index, forms
+
+    def examples(self, words, index):
+        """Annotate the example sentences against the current form index."""
+        examples = {}
+        for key, w in zip(self.keys, words):
+            example = w.get("example") or ""
+            if example.strip() and example not in examples:
+                examples[example] = annotate_example(
+                    example, index, self.results[key][2], self.language.stop_tokens
+                )
+        return examples
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_words(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh).get("words") or []
+
+
+def watch(
+    language,
+    vocab_path,
+    out_path,
+    analyzer,
+    legacy_layout=False,
+    compress=False,
+    examples=True,
+    hashed=False,
+    interval=DEFAULT_WATCH_INTERVAL,
+):
+    """Rebuild the output whenever the vocabulary file changes, until Ctrl+C.
+
+    The Analyzer (and with it the loaded model) is reused for every
+    rebuild; the caller closes it.
+    """
+    build = IncrementalBuild(language, analyzer)
+
+    def write(words):
+        inputs = input_fingerprint(language, vocab_path, build.has_spacy)
+        payload, index, forms = build.outputs(words, legacy_layout, inputs)
+        write_payload(out_path, payload, legacy_layout)
+        write_word_digests(out_path, word_digests(words))
+        written = [out_path, write_index(out_path, index), write_forms(out_path, forms)]
+        if examples:
+            annotated = build.examples(words, index)
+            written.append(write_examples(out_path, build.has_spacy, annotated))
+        if hashed:
+            written.extend(publish_hashed(out_path, written))
+        if compress:
+            compress_outputs(written)
+
+    if analyzer.enabled:
+        # Load now so the first edit does not wait for the model
+        analyzer.load()
+    signature = _signature(vocab_path)
+    words = _load_words(vocab_path)
+    print("Loaded", len(words), language.name, "vocabulary entries")
+    build.update(words)
+    write(words)
+    print("spaCy available:", build.has_spacy)
+    print("Wrote", language.name, "inflections to", out_path)
+    print("Watching", vocab_path, "for changes (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = _signature(vocab_path)
+            if current is None or current == signature:
+                continue
+            signature = current
+            start = time.perf_counter()
+            try:
+                words = _load_words(vocab_path)
+            except ValueError as e:
+                # Usually an editor caught mid-save; the next save fixes it
+                print("Skipping invalid vocabulary:", e)
+                continue
+            added, changed, removed, reordered = build.update(words)
+            if not (added or changed or removed or reordered):
+                continue
+            write(words)
+            print(
+                f"Updated {out_path}: {added} added, {changed} changed,",
+                f"{removed} removed in {(time.perf_counter() - start) * 1000:.0f} ms",
+            )
+    except KeyboardInterrupt:
+        print("Stopped watching", vocab_path)
@@ -0,0 +1,102 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pip>=26.0.1",
+#     "spacy>=3.8.11",
+# ]
+# ///
+"""
+Count the forms of vocabulary lemmas in large plain-text corpora.
+
+Text files (or directories of .txt files) are streamed through spaCy in
+worker processes; only tokens whose lemma is a vocabulary lemma are
+counted. Counts are checkpointed after every batch, so an interrupted run
+continues where it stopped when started again with the same arguments;
+appending text to a file and re-running ingests only the new lines. Pass
+--corpus to the precompute tools to merge the counts into a build.
+
+Usage:
+  python tools/ingest_corpus.py --lang de corpus/de/ [options]
+  python tools/ingest_corpus.py --lang en news.txt books/ --jobs 8
+  python tools/precompute_de_inflections.py --corpus
+"""
+
+import argparse
+import importlib
+import json
+import os
+
+from inflection_core import DEFAULT_BATCH_SIZE
+from inflection_corpus import DEFAULT_LINES, corpus_store_path, ingest_corpus
+from precompute_inflections import LANGUAGES
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Count vocabulary word forms in plain-text corpora."
+    )
+    parser.add_argument("paths", nargs="+", help="text files or directories of .txt files")
+    parser.add_argument(
+        "--lang", required=True, choices=sorted(LANGUAGES), help="language of the corpus"
+    )
+    parser.add_argument(
+        "--store",
+        help="where to keep the counts (default: .cache/inflections/corpus-<lang>.sqlite3)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes, each with its own spaCy model (default: all cores)",
+    )
+    parser.add_argument(
+        "--lines",
+        type=int,
+        default=DEFAULT_LINES,
+        help="lines of text per worker batch",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="texts per nlp.pipe batch",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="discard the stored counts and checkpoints and start over",
+    )
+    args = parser.parse_args()
+
+    module = importlib.import_module(LANGUAGES[args.lang])
+    with open(module.VOCAB_PATH, "r", encoding="utf-8") as fh:
+        words = json.load(fh).get("words") or []
+    store = args.store or corpus_store_path(args.lang)
+    try:
+        totals = ingest_corpus(
+            module.LANGUAGE,
+            words,
+            args.paths,
+            store,
+            jobs=args.jobs,
+            lines=args.lines,
+            batch_size=args.batch_size,
+            restart=args.restart,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume")
+        return
+    if totals:
+        files, lines, tokens, lemmas = totals
+        print(
+            f"{store}: {lines} lines from {files} file(s),",
+            f"{tokens} tokens of {lemmas} vocabulary lemmas",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "brotli>=1.1.0",
 #     "pip>=26.0.1",
 #     "spacy>=3.8.11",
 # ]
@@ -10,20 +11,26 @@
 Precompute German inflections for vocabulary-de.json.
 
 Usage as script:
-  python tools/precompute_de_inflections.py
+  python tools/precompute_de_inflections.py [options]
+  python tools/precompute_de_inflections.py --help
 
 Usage as library:
   from precompute_de_inflections import precompute_inflections
   result = precompute_inflections(vocab_path, out_path)
 """
 
-import json
+import argparse
 import os
 import re
 import sys
+from functools import lru_cache, partial
+
+from inflection_core import Language, add_common_arguments, load_tables, precompute
+from inflection_model import PersonTable
 
 VOCAB_PATH = os.path.join(os.getcwd(), "src", "data", "vocabulary-de.json")
 OUT_PATH = os.path.join(os.getcwd(), "public", "data", "vocabulary-de-inflections.json")
+SPACY_MODEL = "de_core_news_sm"
 
 
 def strip_article(s):
@@ -39,788 +46,362 @@ def normalize(s):
     return s
 
 
-IRREGULAR_PRESENT = {
-    "sein": {
-        "ich": "bin",
-        "du": "bist",
-        "er": "ist",
-        "wir": "sind",
-        "ihr": "seid",
-        "sie": "sind",
-    },
-    "haben": {
-        "ich": "habe",
-        "du": "hast",
-        "er": "hat",
-        "wir": "haben",
-        "ihr": "habt",
-        "sie": "haben",
-    },
-    "werden": {
-        "ich": "werde",
-        "du": "wirst",
-        "er": "wird",
-        "wir": "werden",
-        "ihr": "werdet",
-        "sie": "werden",
-    },
-    "gehen": {
-        "ich": "gehe",
-        "du": "gehst",
-        "er": "geht",
-        "wir": "gehen",
-        "ihr": "geht",
-        "sie": "gehen",
-    },
-    "sehen": {
-        "ich": "sehe",
-        "du": "siehst",
-        "er": "sieht",
-        "wir": "sehen",
-        "ihr": "seht",
-        "sie": "sehen",
-    },
-    "geben": {
-        "ich": "gebe",
-        "du": "gibst",
-        "er": "gibt",
-        "wir": "geben",
-        "ihr": "gebt",
-        "sie": "geben",
-    },
-    "nehmen": {
-        "ich": "nehme",
-        "du": "nimmst",
-        "er": "nimmt",
-        "wir": "nehmen",
-        "ihr": "nehmt",
-        "sie": "nehmen",
-    },
-    "sprechen": {
-        "ich": "spreche",
-        "du": "sprichst",
-        "er": "spricht",
-        "wir": "sprechen",
-        "ihr": "sprecht",
-        "sie": "sprechen",
-    },
-    "treffen": {
-        "ich": "treffe",
-        "du": "triffst",
-        "er": "trifft",
-        "wir": "treffen",
-        "ihr": "trefft",
-        "sie": "treffen",
-    },
-    "essen": {
-        "ich": "esse",
-        "du": "isst",
-        "er": "isst",
-        "wir": "essen",
-        "ihr": "esst",
-        "sie": "essen",
-    },
-    "vergessen": {
-        "ich": "vergesse",
-        "du": "vergisst",
-        "er": "vergisst",
-        "wir": "vergessen",
-        "ihr": "vergesst",
-        "sie": "vergessen",
-    },
-    "helfen": {
-        "ich": "helfe",
-        "du": "hilfst",
-        "er": "hilft",
-        "wir": "helfen",
-        "ihr": "helft",
-        "sie": "helfen",
-    },
-    "tragen": {
-        "ich": "trage",
-        "du": "trägst",
-        "er": "trägt",
-        "wir": "tragen",
-        "ihr": "tragt",
-        "sie": "tragen",
-    },
-    "fallen": {
-        "ich": "falle",
-        "du": "fällst",
-        "er": "fällt",
-        "wir": "fallen",
-        "ihr": "fallt",
-        "sie": "fallen",
-    },
-    "halten": {
-        "ich": "halte",
-        "du": "hältst",
-        "er": "hält",
-        "wir": "halten",
-        "ihr": "haltet",
-        "sie": "halten",
-    },
-    "lassen": {
-        "ich": "lasse",
-        "du": "lässt",
-        "er": "lässt",
-        "wir": "lassen",
-        "ihr": "lasst",
-        "sie": "lassen",
-    },
-    "laufen": {
-        "ich": "laufe",
-        "du": "läufst",
-        "er": "läuft",
-        "wir": "laufen",
-        "ihr": "lauft",
-        "sie": "laufen",
-    },
-    "fahren": {
-        "ich": "fahre",
-        "du": "fährst",
-        "er": "fährt",
-        "wir": "fahren",
-        "ihr": "fahrt",
-        "sie": "fahren",
-    },
-    "tragen": {
-        "ich": "trage",
-        "du": "trägst",
-        "er": "trägt",
-        "wir": "tragen",
-        "ihr": "tragt",
-        "sie": "tragen",
-    },
-    "schlafen": {
-        "ich": "schlafe",
-        "du": "schläfst",
-        "er": "schläft",
-        "wir": "schlafen",
-        "ihr": "schlaft",
-        "sie": "schlafen",
-    },
-    "wissen": {
-        "ich": "weiß",
-        "du": "weißt",
-        "er": "weiß",
-        "wir": "wissen",
-        "ihr": "wisst",
-        "sie": "wissen",
-    },
-    "wollen": {
-        "ich": "will",
-        "du": "willst",
-        "er": "will",
-        "wir": "wollen",
-        "ihr": "wollt",
-        "sie": "wollen",
-    },
-    "sollen": {
-        "ich": "soll",
-        "du": "sollst",
-        "er": "soll",
-        "wir": "sollen",
-        "ihr": "sollt",
-        "sie": "sollen",
-    },
-    "können": {
-        "ich": "kann",
-        "du": "kannst",
-        "er": "kann",
-        "wir": "können",
-        "ihr": "könnt",
-        "sie": "können",
-    },
-    "müssen": {
-        "ich": "muss",
-        "du": "musst",
-        "er": "muss",
-        "wir": "müssen",
-        "ihr": "müsst",
-        "sie": "müssen",
-    },
-    "dürfen": {
-        "ich": "darf",
-        "du": "darfst",
-        "er": "darf",
-        "wir": "dürfen",
-        "ihr": "dürft",
-        "sie": "dürfen",
-    },
-    "mögen": {
-        "ich": "mag",
-        "du": "magst",
-        "er": "mag",
-        "wir": "mögen",
-        "ihr": "mögt",
-        "sie": "mögen",
-    },
-}
+TABLES = load_tables("de")
 
-IRREGULAR_PAST = {
-    "sein": {
-        "ich": "war",
-        "du": "warst",
-        "er": "war",
-        "wir": "waren",
-        "ihr": "wart",
-        "sie": "waren",
-    },
-    "haben": {
-        "ich": "hatte",
-        "du": "hattest",
-        "er": "hatte",
-        "wir": "hatten",
-        "ihr": "hattet",
-        "sie": "hatten",
-    },
-    "werden": {
-        "ich": "wurde",
-        "du": "wurdest",
-        "er": "wurde",
-        "wir": "wurden",
-        "ihr": "wurdet",
-        "sie": "wurden",
-    },
-    "gehen": {
-        "ich": "ging",
-        "du": "gingst",
-        "er": "ging",
-        "wir": "gingen",
-        "ihr": "gingt",
-        "sie": "gingen",
-    },
-    "sehen": {
-        "ich": "sah",
-        "du": "sahst",
-        "er": "sah",
-        "wir": "sahen",
-        "ihr": "saht",
-        "sie": "sahen",
-    },
-    "geben": {
-        "ich": "gab",
-        "du": "gabst",
-        "er": "gab",
-        "wir": "gaben",
-        "ihr": "gabt",
-        "sie": "gaben",
-    },
-    "nehmen": {
-        "ich": "nahm",
-        "du": "nahmst",
-        "er": "nahm",
-        "wir": "nahmen",
-        "ihr": "nahmt",
-        "sie": "nahmen",
-    },
-    "sprechen": {
-        "ich": "sprach",
-        "du": "sprachst",
-        "er": "sprach",
-        "wir": "sprachen",
-        "ihr": "spracht",
-        "sie": "sprachen",
-    },
-    "treffen": {
-        "ich": "traf",
-        "du": "trafst",
-        "er": "traf",
-        "wir": "trafen",
-        "ihr": "traft",
-        "sie": "trafen",
-    },
-    "essen": {
-        "ich": "aß",
-        "du": "aßest",
-        "er": "aß",
-        "wir": "aßen",
-        "ihr": "aßet",
-        "sie": "aßen",
-    },
-    "vergessen": {
-        "ich": "vergaß",
-        "du": "vergaßt",
-        "er": "vergaß",
-        "wir": "vergaßen",
-        "ihr": "vergaßt",
-        "sie": "vergaßen",
-    },
-    "helfen": {
-        "ich": "half",
-        "du": "halfst",
-        "er": "half",
-        "wir": "halfen",
-        "ihr": "halft",
-        "sie": "halfen",
-    },
-    "tragen": {
-        "ich": "trug",
-        "du": "trugst",
-        "er": "trug",
-        "wir": "trugen",
-        "ihr": "trugt",
-        "sie": "trugen",
-    },
-    "fall": {
-        "ich": "fiel",
-        "du": "fielst",
-        "er": "fiel",
-        "wir": "fielen",
-        "ihr": "fielt",
-        "sie": "fielen",
-    },
-    "halten": {
-        "ich": "hielt",
-        "du": "hieltest",
-        "er": "hielt",
-        "wir": "hielten",
-        "ihr": "hieltet",
-        "sie": "hielten",
-    },
-    "lassen": {
-        "ich": "ließ",
-        "du": "ließest",
-        "er": "ließ",
-        "wir": "ließen",
-        "ihr": "ließet",
-        "sie": "ließen",
-    },
-    "laufen": {
-        "ich": "lief",
-        "du": "liefst",
-        "er": "lief",
-        "wir": "liefen",
-        "ihr": "lieft",
-        "sie": "liefen",
-    },
-    "fahren": {
-        "ich": "fuhr",
-        "du": "fuhrst",
-        "er": "fuhr",
-        "wir": "fuhren",
-        "ihr": "fuhrt",
-        "sie": "fuhren",
-    },
-    "schlafen": {
-        "ich": "schlief",
-        "du": "schliefst",
-        "er": "schlief",
-        "wir": "schliefen",
-        "ihr": "schlieft",
-        "sie": "schliefen",
-    },
-    "wissen": {
-        "ich": "wusste",
-        "du": "wusstest",
-        "er": "wusste",
-        "wir": "wussten",
-        "ihr": "wusstet",
-        "sie": "wussten",
-    },
-    "wollen": {
-        "ich": "wollte",
-        "du": "wolltest",
-        "er": "wollte",
-        "wir": "wollten",
-        "ihr": "wolltet",
-        "sie": "wollten",
-    },
-    "sollen": {
-        "ich": "sollte",
-        "du": "solltest",
-        "er": "sollte",
-        "wir": "sollten",
-        "ihr": "solltet",
-        "sie": "sollten",
-    },
-    "können": {
-        "ich": "konnte",
-        "du": "konntest",
-        "er": "konnte",
-        "wir": "konnten",
-        "ihr": "konntet",
-        "sie": "konnten",
-    },
-    "müssen": {
-        "ich": "musste",
-        "du": "musstest",
-        "er": "musste",
-        "wir": "mussten",
-        "ihr": "musstet",
-        "sie": "mussten",
-    },
-    "dürfen": {
-        "ich": "durfte",
-        "du": "durftest",
-        "er": "durfte",
-        "wir": "durften",
-        "ihr": "durftet",
-        "sie": "durften",
-    },
-    "mögen": {
-        "ich": "mochte",
-        "du": "mochtest",
-        "er": "mochte",
-        "wir": "mochten",
-        "ihr": "mochtet",
-        "sie": "mochten",
-    },
+PERSONS = tuple(TABLES["persons"])
+# Articles and forms of "sein", never blanked in exercises
+STOP_TOKENS = frozenset(TABLES["stop_tokens"])
+
+# spaCy Person (1/2/3) + Number (Sing/Plur) to our person keys
+PERSON_MAP = {
+    (feats["Person"], feats["Number"]): person
+    for person, feats in TABLES["person_features"].items()
 }
 
-IRREGULAR_PARTICIPLE = {
-    "sein": "gewesen",
-    "haben": "gehabt",
-    "werden": "geworden",
-    "gehen": "gegangen",
-    "lesen": "gelesen",
-    "spielen": "gespielt",
-    "machen": "gemacht",
-    "sprechen": "gesprochen",
-    "sehen": "gesehen",
-    "nehmen": "genommen",
-    "kommen": "gekommen",
-    "trinken": "getrunken",
-    "geben": "gegeben",
-    "helfen": "geholfen",
-    "treffen": "getroffen",
-    "essen": "gegessen",
-    "vergessen": "vergessen",
-    "laufen": "gelaufen",
-    "fahren": "gefahren",
-    "tragen": "getragen",
-    "fallen": "gefallen",
-    "halten": "gehalten",
-    "lassen": "gelassen",
-    "schlafen": "geschlafen",
-    "wissen": "gewusst",
-    "wollen": "gewollt",
-    "sollen": "gesollt",
-    "können": "gekonnt",
-    "müssen": "gemusst",
-    "dürfen": "gedurft",
-    "mögen": "gemocht",
+SUPPLETIVE_VERBS = TABLES["suppletive_verbs"]
+
+# Principal parts of strong and mixed verbs, flattened from the ablaut
+# classes: (changed present stem or None, preterite stem, past participle)
+STRONG_VERBS = {
+    verb: tuple(None if part == "-" else part for part in parts.split())
+    for verbs in TABLES["strong_verbs"].values()
+    for verb, parts in verbs.items()
 }
 
-INSEPARABLE_PREFIXES = ("be", "emp", "ent", "er", "ver", "miss", "zer")
+# (prefix, separable) pairs, longest first so "heraus" wins over "her"
+PREFIXES = sorted(
+    [(p, True) for p in TABLES["separable_prefixes"]]
+    + [(p, False) for p in TABLES["inseparable_prefixes"]],
+    key=lambda item: -len(item[0]),
+)
+INSEPARABLE_VERBS = frozenset(TABLES["inseparable_verbs"])
+SIMPLE_VERBS = frozenset(TABLES["simple_verbs"])
+
+NOUN_PLURALS = TABLES["noun_plurals"]
+NOUN_SUFFIXES = sorted(NOUN_PLURALS["suffixes"], key=lambda rule: -len(rule[0]))
+NOUN_EXCEPTIONS = NOUN_PLURALS["exceptions"]
+NOUN_EXCEPTION_KEYS = sorted(NOUN_EXCEPTIONS, key=len, reverse=True)
+LOANWORD_ENDINGS = tuple(NOUN_PLURALS["loanword_endings"])
+# Native diphthongs ("Frau", "Brei") that look like loanword vowel endings
+DIPHTHONG_ENDINGS = tuple(NOUN_PLURALS["diphthong_endings"])
+GENDERS = {"der": "masculine", "die": "feminine", "das": "neuter"}
+
+
+def verb_infinitive(verb):
+    """Return the normalized infinitive of a verb or verb phrase.
+
+    Drops reflexive pronouns and the other words of phrases such as
+    "in Kauf nehmen" or "sorgen für".
+    """
+    words = [normalize(w) for w in strip_article(str(verb)).split()]
+    words = [w for w in words if w and w != "sich"]
+    for w in reversed(words):
+        if len(w) > 2 and w.endswith("n"):
+            return w
+    return words[-1] if words else ""
+
+
+def _known_verb(verb):
+    return verb in STRONG_VERBS or verb in SUPPLETIVE_VERBS
+
+
+def _could_be_verb(rest):
+    """Whether a prefix could be split off leaving rest as the base verb."""
+    if _known_verb(rest):
+        return True
+    stem = re.sub(r"(eln|ern|en|n)$", "", rest)
+    return len(rest) > 3 and re.search(r"[aeiouäöü]", stem) is not None
+
+
+@lru_cache(maxsize=None)
+def split_verb(verb):
+    """Split an infinitive into (separable prefix, inseparable prefix, base).
+
+    A split that leads to a known strong verb wins; otherwise the longest
+    plausible prefix is split off, which is enough to place ge- correctly.
+    """
+    if _known_verb(verb) or verb in INSEPARABLE_VERBS or verb in SIMPLE_VERBS:
+        return "", "", verb
+    fallback = None
+    for prefix, separable in PREFIXES:
+        rest = verb[len(prefix) :]
+        if not verb.startswith(prefix) or not _could_be_verb(rest):
+            continue
+        sep, insep, base = split_verb(rest)
+        if separable:
+            split = (prefix + sep, insep, base)
+        elif sep:
+            # An inseparable prefix never precedes a separable one
+            split = ("", prefix, rest)
+        else:
+            split = ("", prefix + insep, base)
+        if _known_verb(split[2]):
+            return split
+        fallback = fallback or split
+    return fallback or ("", "", verb)
+
+
+def _weak_stem(verb):
+    """Return (stem, needs_e) for an infinitive; needs_e marks arbeit-e-t."""
+    if verb.endswith(("eln", "ern")):
+        return verb[:-1], False
+    stem = re.sub(r"e?n$", "", verb)
+    needs_e = stem.endswith(("t", "d", "chn")) or (
+        re.search(r"[^aeiouäöülrhmn][mn]$", stem) is not None
+    )
+    return stem, needs_e
+
+
+def _present(verb, stem, needs_e, change=None):
+    """Present tense forms in PERSONS order."""
+    ich = stem[:-2] + "le" if verb.endswith("eln") else stem + "e"
+    if change:
+        du = change + ("t" if change.endswith(("s", "ß", "x", "z")) else "st")
+        er = change if change.endswith("t") else change + "t"
+    elif needs_e:
+        du, er = stem + "est", stem + "et"
+    else:
+        du = stem + ("t" if stem.endswith(("s", "ß", "x", "z")) else "st")
+        er = stem + "t"
+    ihr = stem + ("et" if needs_e else "t")
+    return ich, du, er, verb, ihr, verb
+
+
+def _preterite(stem):
+    """Preterite forms in PERSONS order from the 1st/3rd singular stem."""
+    if stem.endswith("e"):
+        # Weak and mixed verbs ("machte", "brachte"), and "schrie"
+        return stem, stem + "st", stem, stem + "n", stem + "t", stem + "n"
+    du = stem + ("est" if stem.endswith(("d", "t", "s", "ß", "z")) else "st")
+    ihr = stem + ("et" if stem.endswith(("d", "t")) else "t")
+    return stem, du, stem, stem + "en", ihr, stem + "en"
+
+
+@lru_cache(maxsize=None)
+def conjugate(verb):
+    """Return (present, preterite, past participle) of a normalized infinitive.
+
+    present and preterite are tuples in PERSONS order. Prefixes stay
+    attached to finite forms, as in subordinate clauses ("dass er anfängt").
+    """
+    sep, insep, base = split_verb(verb)
+    prefix = sep + insep
+    stem, needs_e = _weak_stem(base)
+    if base in SUPPLETIVE_VERBS:
+        forms = SUPPLETIVE_VERBS[base]
+        present = forms["present"]
+        preterite_stem = forms["preterite"]
+        participle = forms["past_participle"]
+    else:
+        change, preterite_stem, participle = STRONG_VERBS.get(base, (None, None, None))
+        present = _present(base, stem, needs_e, change)
+        if preterite_stem is None:
+            preterite_stem = stem + ("ete" if needs_e else "te")
+
+    if participle is None:
+        ge = not (insep or base.endswith("ieren") or base in INSEPARABLE_VERBS)
+        participle = ("ge" if ge else "") + stem + ("et" if needs_e else "t")
+    elif insep and participle.startswith("ge"):
+        # Drop the ge- of the base participle, but not a ge- that belongs to
+        # the verb itself ("gewonnen", "gelungen")
+        if not base.startswith("ge") or participle.startswith("gege"):
+            participle = participle[2:]
+
+    return (
+        tuple(prefix + form for form in present),
+        tuple(prefix + form for form in _preterite(preterite_stem)),
+        prefix + participle,
+    )
+
+
+def _person_index(person):
+    return PERSONS.index(person) if person in PERSONS else PERSONS.index("er")
 
 
 def conj_present(verb, person="er"):
     """Conjugate verb in present tense."""
-    v = normalize(verb)
-    if v in IRREGULAR_PRESENT:
-        return IRREGULAR_PRESENT[v].get(person, IRREGULAR_PRESENT[v].get("er"))
-    stem = re.sub(r"(en|n)$", "", v)
-    if stem.endswith(("t", "d")):
-        if person == "du":
-            return stem + "est"
-        if person == "ich":
-            return stem + "e"
-        if person in ("er", "sie", "es"):
-            return stem + "et"
-        if person == "ihr":
-            return stem + "et"
-        return stem + "t"
-    if person == "ich":
-        return stem + "e"
-    if person == "du":
-        return stem + "st"
-    if person in ("er", "sie", "es"):
-        return stem + "t"
-    if person == "wir":
-        return v
-    if person == "ihr":
-        return stem + "t"
-    return stem + "t"
+    return conjugate(verb_infinitive(verb))[0][_person_index(person)]
 
 
 def conj_preterite(verb, person="er"):
     """Conjugate verb in preterite (simple past) tense."""
-    v = normalize(verb)
-    if v in IRREGULAR_PAST:
-        return IRREGULAR_PAST[v].get(person, IRREGULAR_PAST[v].get("er"))
-    stem = re.sub(r"(en|n)$", "", v)
-    endings = {
-        "ich": "te",
-        "du": "test",
-        "er": "te",
-        "wir": "ten",
-        "ihr": "tet",
-        "sie": "ten",
-    }
-    return stem + endings.get(person, "te")
+    return conjugate(verb_infinitive(verb))[1][_person_index(person)]
 
 
 def past_participle(verb):
     """Generate past participle of a verb."""
-    v = normalize(verb)
-    if v in IRREGULAR_PARTICIPLE:
-        return IRREGULAR_PARTICIPLE[v]
-    for p in INSEPARABLE_PREFIXES:
-        if v.startswith(p) and len(v) > len(p) + 1:
-            stem = re.sub(r"(en|n)$", "", v)
-            return stem + "t"
-    stem = re.sub(r"(en|n)$", "", v)
-    return "ge" + stem + "t"
+    return conjugate(verb_infinitive(verb))[2]
+
+
+def _capitalized(text, like):
+    return text[:1].upper() + text[1:] if like[:1].isupper() else text
 
 
 def pluralize_noun(noun):
-    """Generate plural form of a noun."""
-    s = strip_article(noun)
-    s_norm = s.lower()
-    if s_norm.endswith("in") and len(s_norm) > 3:
-        return s + "nen"
-    if s.endswith("e"):
+    """Generate plural form of a noun from the plural class tables.
+
+    The article, when present, selects gender-specific classes.
+    """
+    text = str(noun).strip()
+    m = re.match(r"^(der|die|das)(?:/(?:der|die|das))?\s+", text, flags=re.I)
+    gender = GENDERS[m.group(1).lower()] if m else None
+    s = text[m.end() :] if m else text
+    low = s.lower()
+
+    # Listed exceptions, also as the last part of a compound ("Fachkraft")
+    for key in NOUN_EXCEPTION_KEYS:
+        if low == key:
+            return _capitalized(NOUN_EXCEPTIONS[key], s)
+        if len(key) >= 4 and low.endswith(key):
+            return s[: len(s) - len(key)] + NOUN_EXCEPTIONS[key]
+
+    for suffix, ending, suffix_gender in NOUN_SUFFIXES:
+        if low.endswith(suffix) and len(low) > len(suffix):
+            if suffix_gender is None or suffix_gender == gender:
+                return s[: len(s) - len(suffix)] + ending
+
+    if low.endswith(LOANWORD_ENDINGS) and not low.endswith(DIPHTHONG_ENDINGS):
+        return s + "s"
+    if low.endswith("e"):
         return s + "n"
-    if s.endswith(("er", "el", "en")):
+    if gender == "feminine":
+        return s + ("n" if low.endswith(("el", "er")) else "en")
+    # Unstressed -el/-er/-en ("Mangel", "Zweifel"), but not "Ziel"
+    if re.search(r"[^aeiouäöü]e[lnr]$", low):
         return s
-    if len(s) <= 3:
-        return s + "er"
-    res = s + "e"
-    res = res.replace("a", "ä").replace("o", "ö").replace("u", "ü")
-    return res
-
-
-def precompute_inflections(vocab_path, out_path):
-    """Main function to precompute inflections from vocabulary."""
-    # Load spaCy if available
-    HAS_SPACY = False
-    nlp = None
+    return s + "e"
+
+
+def word_entry(w):
+    """Build the rule-generated entry for a vocabulary word.
+
+    Returns (key, alias_key, entry); alias_key is the normalized lookup key.
+    """
+    wid = w.get("id")
+    word_txt = w.get("word")
+    pos = w.get("partOfSpeech")
+    entry = {"base": word_txt, "pos": pos}
+    if pos == "verb":
+        lemma = strip_article(word_txt)
+        entry["present"] = PersonTable.build(PERSONS, partial(conj_present, lemma))
+        entry["preterite"] = PersonTable.build(PERSONS, partial(conj_preterite, lemma))
+        entry["past_participle"] = past_participle(lemma)
+    elif pos == "noun":
+        entry["plural"] = pluralize_noun(word_txt)
+        entry["lemma"] = strip_article(word_txt)
+    else:
+        entry["lemma"] = strip_article(word_txt)
     try:
-        import spacy
-        from spacy.cli import download_module
-
-        try:
-            download_module.download("de_core_news_sm")
-            nlp = spacy.load("de_core_news_sm")
-            HAS_SPACY = True
-        except Exception:
-            pass
+        norm_key = normalize(strip_article(word_txt))
     except Exception:
-        pass
-
-    print("spaCy available:", HAS_SPACY)
-
-    # Load vocabulary
-    if not os.path.exists(vocab_path):
-        print("Vocabulary file not found at", vocab_path)
-        return None
-
-    with open(vocab_path, "r", encoding="utf-8") as f:
-        vocab = json.load(f)
-
-    words = vocab.get("words") or []
-    print("Loaded", len(words), "words")
-
-    inflections = {}
-
-    # Generate inflections for each vocabulary word
-    for w in words:
-        wid = w.get("id")
-        word_txt = w.get("word")
-        pos = w.get("partOfSpeech")
-        entry = {"base": word_txt, "pos": pos}
-        if pos == "verb":
-            lemma = strip_article(word_txt)
-            entry["present"] = {
-                p: conj_present(lemma, p)
-                for p in ["ich", "du", "er", "wir", "ihr", "sie"]
-            }
-            entry["preterite"] = {
-                p: conj_preterite(lemma, p)
-                for p in ["ich", "du", "er", "wir", "ihr", "sie"]
-            }
-            entry["past_participle"] = past_participle(lemma)
-        elif pos == "noun":
-            entry["plural"] = pluralize_noun(word_txt)
-            entry["lemma"] = strip_article(word_txt)
-        else:
-            entry["lemma"] = strip_article(word_txt)
-        inflections[wid] = entry
-        try:
-            norm_key = normalize(strip_article(word_txt))
-            if norm_key and norm_key not in inflections:
-                inflections[norm_key] = entry
-        except Exception:
-            pass
-
-    # Collect observed forms from example sentences
-    observed = {}
-
-    for w in words:
-        example = w.get("example") or ""
-        if not example or not HAS_SPACY or not nlp:
-            continue
-
-        doc = nlp(example)
-        for tok in doc:
-            if not tok.is_alpha:
-                continue
-
-            # Map spaCy POS
-            if tok.pos_ == "VERB":
-                p = "verb"
-            elif tok.pos_ == "NOUN":
-                p = "noun"
-            elif tok.pos_ == "ADJ":
-                p = "adjective"
-            else:
-                continue
-
-            lemma_key = normalize(tok.lemma_ or tok.text)
-            if not lemma_key:
-                continue
-
-            # Extract features
-            feats = tok.morph.to_dict() if tok.morph else {}
-            form_key = tok.text  # Deduplicate by form text only
-
-            # Initialize or add to observed
-            if lemma_key not in observed:
-                observed[lemma_key] = {
-                    "forms": {},
-                    "pos": p,
-                    "lemma": tok.lemma_ or tok.text,
-                }
-
-            # Merge features for same form: if seen before, append case/number info
-            if form_key not in observed[lemma_key]["forms"]:
-                observed[lemma_key]["forms"][form_key] = {
-                    "form": tok.text,
-                    "features": [feats],
-                }
-            else:
-                observed[lemma_key]["forms"][form_key]["features"].append(feats)
-
-    # Merge observed forms and detect irregulars
-    irregular = {"verbs": {}, "nouns": {}}
-
-    for lemma_key, data in observed.items():
-        forms_dict = data["forms"]
-        pos = data["pos"]
-        lemma = data["lemma"]
-
-        # Flatten forms_dict and deduplicate feature sets per form
-        forms_list = []
-        for form_key, form_data in forms_dict.items():
-            feats_list = form_data["features"]
-            # Deduplicate feature dicts for this form
-            seen_feats = set()
-            unique_feats = []
-            for feats in feats_list:
-                feats_json = json.dumps(feats, sort_keys=True, ensure_ascii=False)
-                if feats_json not in seen_feats:
-                    seen_feats.add(feats_json)
-                    unique_feats.append(feats)
-            # Use first feature set (or merge?) for detection; store one entry with first feats
-            if unique_feats:
-                forms_list.append({"form": form_key, "features": unique_feats[0]})
-
-        # Get or create entry
-        entry = inflections.get(lemma_key)
-        if not entry:
-            entry = {"base": lemma, "pos": pos, "lemma": lemma}
-            if pos == "verb":
-                entry["present"] = {
-                    p: conj_present(lemma, p)
-                    for p in ["ich", "du", "er", "wir", "ihr", "sie"]
-                }
-                entry["preterite"] = {
-                    p: conj_preterite(lemma, p)
-                    for p in ["ich", "du", "er", "wir", "ihr", "sie"]
-                }
-                entry["past_participle"] = past_participle(lemma)
-            elif pos == "noun":
-                entry["plural"] = pluralize_noun(lemma)
-            inflections[lemma_key] = entry
-
-        entry["observed"] = forms_list
-
-        # Detect irregulars using spaCy morphological features
-        if pos == "verb":
-            gen_present = entry.get("present", {})
-            gen_pret = entry.get("preterite", {})
-            gen_part = entry.get("past_participle")
-
-            for obs in forms_list:
-                feats = obs.get("features", {})
+        norm_key = None
+    return wid, norm_key, entry
+
+
+def lemma_entry(lemma, pos):
+    """Build an entry for a lemma that only occurs in example sentences."""
+    entry = {"base": lemma, "pos": pos, "lemma": lemma}
+    if pos == "verb":
+        entry["present"] = PersonTable.build(PERSONS, partial(conj_present, lemma))
+        entry["preterite"] = PersonTable.build(PERSONS, partial(conj_preterite, lemma))
+        entry["past_participle"] = past_participle(lemma)
+    elif pos == "noun":
+        entry["plural"] = pluralize_noun(lemma)
+    return entry
+
+
+def merge_observed(entry, lemma_key, pos, forms_list, irregular):
+    """Attach observed forms to an entry and record irregular overrides."""
+    entry["observed"] = forms_list
+
+    # Detect irregulars using spaCy morphological features
+    if pos == "verb":
+        gen_present = entry.get("present", {})
+        gen_pret = entry.get("preterite", {})
+        gen_part = entry.get("past_participle")
+
+        for obs in forms_list:
+            feats = obs.get("features", {})
+            form_norm = normalize(obs["form"])
+
+            # Map spaCy Person (1/2/3) + Number (Sing/Plur) to our persons
+            person_val = feats.get("Person", "3")
+            number_val = feats.get("Number", "Sing")
+            person = PERSON_MAP.get((person_val, number_val), "er")
+
+            # Present tense
+            if feats.get("Tense") == "Pres":
+                gen_form = gen_present.get(person)
+                if gen_form and normalize(gen_form) != form_norm:
+                    irregular["verbs"].setdefault(lemma_key, {}).setdefault(
+                        "present", {}
+                    )[person] = obs["form"]
+                    entry["present"][person] = obs["form"]
+
+            # Past tense
+            elif feats.get("Tense") == "Past" and feats.get("VerbForm") != "Part":
+                gen_form = gen_pret.get(person)
+                if gen_form and normalize(gen_form) != form_norm:
+                    irregular["verbs"].setdefault(lemma_key, {}).setdefault(
+                        "preterite", {}
+                    )[person] = obs["form"]
+                    entry["preterite"][person] = obs["form"]
+
+            # Past participle
+            elif feats.get("VerbForm") == "Part":
+                if gen_part and normalize(gen_part) != form_norm:
+                    irregular["verbs"].setdefault(lemma_key, {})[
+                        "past_participle"
+                    ] = obs["form"]
+                    entry["past_participle"] = obs["form"]
+
+    elif pos == "noun":
+        gen_plural = entry.get("plural", "")
+
+        for obs in forms_list:
+            feats = obs.get("features", {})
+            num = feats.get("Number")
+
+            # Plural
+            if num == "Plur" and gen_plural:
                 form_norm = normalize(obs["form"])
+                if normalize(gen_plural) != form_norm:
+                    irregular["nouns"].setdefault(lemma_key, {})["plural"] = obs[
+                        "form"
+                    ]
+                    entry["plural"] = obs["form"]
+
 
-                # Map spaCy Person (1/2/3) + Number (Sing/Plur) to our persons
-                person_val = feats.get("Person", "3")
-                number_val = feats.get("Number", "Sing")
-                person_map = {
-                    ("1", "Sing"): "ich",
-                    ("2", "Sing"): "du",
-                    ("3", "Sing"): "er",
-                    ("1", "Plur"): "wir",
-                    ("2", "Plur"): "ihr",
-                    ("3", "Plur"): "sie",
-                }
-                person = person_map.get((person_val, number_val), "er")
-
-                # Present tense
-                if feats.get("Tense") == "Pres":
-                    gen_form = gen_present.get(person)
-                    if gen_form and normalize(gen_form) != form_norm:
-                        irregular["verbs"].setdefault(lemma_key, {}).setdefault(
-                            "present", {}
-                        )[person] = obs["form"]
-                        entry["present"][person] = obs["form"]
-
-                # Past tense
-                elif feats.get("Tense") == "Past" and feats.get("VerbForm") != "Part":
-                    gen_form = gen_pret.get(person)
-                    if gen_form and normalize(gen_form) != form_norm:
-                        irregular["verbs"].setdefault(lemma_key, {}).setdefault(
-                            "preterite", {}
-                        )[person] = obs["form"]
-                        entry["preterite"][person] = obs["form"]
-
-                # Past participle
-                elif feats.get("VerbForm") == "Part":
-                    if gen_part and normalize(gen_part) != form_norm:
-                        irregular["verbs"].setdefault(lemma_key, {})[
-                            "past_participle"
-                        ] = obs["form"]
-                        entry["past_participle"] = obs["form"]
-
-        elif pos == "noun":
-            gen_plural = entry.get("plural", "")
-
-            for obs in forms_list:
-                feats = obs.get("features", {})
-                num = feats.get("Number")
-
-                # Plural
-                if num == "Plur" and gen_plural:
-                    form_norm = normalize(obs["form"])
-                    if normalize(gen_plural) != form_norm:
-                        irregular["nouns"].setdefault(lemma_key, {})["plural"] = obs[
-                            "form"
-                        ]
-                        entry["plural"] = obs["form"]
-
-    # Add metadata
-    if irregular["verbs"] or irregular["nouns"]:
-        inflections["__meta"] = {"irregular": irregular}
-
-    # Write output
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {"meta": {"spaCy": HAS_SPACY}, "inflections": inflections},
-            f,
-            ensure_ascii=False,
-            indent=2,
-        )
-
-    print("Wrote inflections to", out_path)
+LANGUAGE = Language(
+    name="German",
+    code="de",
+    model=SPACY_MODEL,
+    normalize=normalize,
+    word_entry=word_entry,
+    lemma_entry=lemma_entry,
+    merge_observed=merge_observed,
+    stop_tokens=STOP_TOKENS,
+)
+
+
+def precompute_inflections(vocab_path, out_path, **options):
+    """Main function to precompute inflections from vocabulary.
+
+    Options are the keyword arguments of inflection_core.precompute.
+    """
+    return precompute(LANGUAGE, vocab_path, out_path, **options)
 
 
 def main():
     """CLI entry point."""
-    precompute_inflections(VOCAB_PATH, OUT_PATH)
+    parser = argparse.ArgumentParser(description="Precompute German inflections.")
+    args = add_common_arguments(parser).parse_args()
+    try:
+        result = precompute_inflections(VOCAB_PATH, OUT_PATH, **vars(args))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.check and not result:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,198 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "brotli>=1.1.0",
+# ]
+# ///
+"""
+Precompute distractor candidates for every vocabulary word.
+
+For each word the index lists candidate ids for the tiers getDistractors
+(src/utils/practiceUtils.js) draws from, most similar first:
+
+  levelPos      same level and part of speech
+  level         same level, other part of speech
+  pos           same part of speech, other level
+
+plus the most confusable words overall by spelling (orthographic).
+Words sharing a translation or the normalized word with the target are
+never candidates, since they could be correct answers too. Lists are ranked
+by spelling similarity, the Dice coefficient of character bigrams, found
+through a bigram index rather than by comparing every pair. Ties keep
+vocabulary order, so the output is deterministic. Clients can sample a
+slice of a list instead of rescanning the whole word pool.
+
+Usage:
+  python tools/precompute_distractors.py [--lang de,en] [--limit 7] [--compress] [--hashed]
+"""
+
+import argparse
+import heapq
+import importlib
+import json
+import os
+from collections import Counter, defaultdict
+
+from inflection_core import compress_outputs, publish_hashed, write_payload
+from precompute_inflections import LANGUAGES
+
+# MultipleChoice draws at most optionCount - 1 = 7 distractors
+DEFAULT_LIMIT = 7
+TIERS = ("levelPos", "level", "pos")
+
+
+def bigrams(text):
+    """Character bigrams of text, with start and end markers."""
+    padded = f"^{text}$"
+    return frozenset(padded[i : i + 2] for i in range(len(padded) - 1))
+
+
+class BigramIndex:
+    """Find items sharing bigrams with an item and score them by Dice."""
+
+    def __init__(self, features):
+        self.features = features
+        self.postings = defaultdict(list)
+        for i, grams in enumerate(features):
+            for gram in grams:
+                self.postings[gram].append(i)
+
+    def similar(self, i):
+        """Map other item positions to their similarity with item i."""
+        grams = self.features[i]
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings[gram])
+        shared.pop(i, None)
+        return {
+            j: 2 * count / (len(grams) + len(self.features[j]))
+            for j, count in shared.items()
+        }
+
+
+def _ranked(candidates, score, limit):
+    """Top candidates by score; ties keep vocabulary order."""
+    return heapq.nsmallest(limit, candidates, key=lambda j: (-score.get(j, 0.0), j))
+
+
+def build_distractors(words, normalize, limit=DEFAULT_LIMIT):
+    """Return {word id: {list name: [candidate ids]}} for the vocabulary."""
+    unique = list({w["id"]: w for w in reversed(words) if w.get("id")}.values())[::-1]
+    ids = [w["id"] for w in unique]
+    normalized = [normalize(w.get("word") or "") for w in unique]
+    spelling = BigramIndex([bigrams(text) for text in normalized])
+    translations = [
+        frozenset(t.strip().lower() for t in w.get("translations") or ()) for w in unique
+    ]
+    by_translation = defaultdict(list)
+    by_word = defaultdict(list)
+    for i, w in enumerate(unique):
+        for t in translations[i]:
+            by_translation[t].append(i)
+        by_word[normalized[i]].append(i)
+
+    groups = defaultdict(list)
+    for i, w in enumerate(unique):
+        groups[w.get("level"), w.get("partOfSpeech")].append(i)
+    by_level = defaultdict(list)
+    by_pos = defaultdict(list)
+    for (level, pos), members in groups.items():
+        by_level[level].append((pos, members))
+        by_pos[pos].append((level, members))
+
+    index = {}
+    for i, w in enumerate(unique):
+        level, pos = w.get("level"), w.get("partOfSpeech")
+        # Synonyms and homographs would be right answers too
+        excluded = {i, *by_word[normalized[i]]}
+        for t in translations[i]:
+            excluded.update(by_translation[t])
+        score = spelling.similar(i)
+
+        tiers = {
+            "levelPos": groups[level, pos],
+            "level": [j for p, members in by_level[level] if p != pos for j in members],
+            "pos": [j for lv, members in by_pos[pos] if lv != level for j in members],
+            "orthographic": score,
+        }
+        lists = {
+            name: _ranked([j for j in tiers[name] if j not in excluded], score, limit)
+            for name in (*TIERS, "orthographic")
+        }
+        index[ids[i]] = {
+            name: [ids[j] for j in ranked] for name, ranked in lists.items() if ranked
+        }
+    return index
+
+
+def distractors_path(module, code):
+    """Output path next to the language's inflections file."""
+    return os.path.join(os.path.dirname(module.OUT_PATH), f"vocabulary-{code}-distractors.json")
+
+
+def precompute_distractors(code, limit=DEFAULT_LIMIT, compress=False, hashed=False):
+    """Build and write the distractor index of one language.
+
+    With hashed set, a content-hashed copy is listed in the language's
+    manifest next to the inflection outputs (see publish_hashed).
+    """
+    module = importlib.import_module(LANGUAGES[code])
+    if not os.path.exists(module.VOCAB_PATH):
+        print("Vocabulary file not found:", module.VOCAB_PATH)
+        return None
+    with open(module.VOCAB_PATH, "r", encoding="utf-8") as fh:
+        words = json.load(fh).get("words") or []
+
+    index = build_distractors(words, module.LANGUAGE.normalize, limit)
+    out_path = distractors_path(module, code)
+    write_payload(out_path, {"meta": {"limit": limit}, "distractors": index})
+    print("Wrote", len(index), module.LANGUAGE.name, "distractor lists to", out_path)
+    written = [out_path]
+    if hashed:
+        written.extend(publish_hashed(module.OUT_PATH, written))
+    if compress:
+        compress_outputs(written)
+    return index
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Precompute ranked distractor candidates for vocabulary words."
+    )
+    parser.add_argument(
+        "--lang",
+        default=",".join(LANGUAGES),
+        help="comma-separated language codes (default: all)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        help="candidates kept per list",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="also write maximum-compression .gz and .br files",
+    )
+    parser.add_argument(
+        "--hashed",
+        action="store_true",
+        help="also write a content-hashed copy listed in the language's manifest",
+    )
+    args = parser.parse_args()
+
+    codes = [code for code in args.lang.split(",") if code]
+    unknown = [code for code in codes if code not in LANGUAGES]
+    if unknown:
+        parser.error(f"unknown language(s): {', '.join(unknown)}")
+    for code in codes:
+        precompute_distractors(
+            code, limit=args.limit, compress=args.compress, hashed=args.hashed
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+from precompute_distractors import build_distractors
+
+
+def _word(wid, word, level, pos, translation):
+    return {
+        "id": wid,
+        "word": word,
+        "level": level,
+        "partOfSpeech": pos,
+        "translations": [translation],
+    }
+
+
+WORDS = [
+    _word("ban", "ban", "B2", "verb", "tilt"),
+    _word("bar", "bar", "B2", "noun", "kocsma"),
+    _word("prohibit", "prohibit", "B2", "verb", "Tilt"),
+    _word("bane", "bane", "B2", "noun", "átok"),
+    _word("ban_2", "Ban", "C1", "noun", "bán"),
+    _word("bank", "bank", "C1", "noun", "bank"),
+]
+
+
+def test_excludes_synonyms_and_homographs():
+    lists = build_distractors(WORDS, str.lower)["ban"]
+    listed = {wid for ids in lists.values() for wid in ids}
+    assert listed == {"bar", "bane", "bank"}
+    assert "translation" not in lists
+
+
+def test_ranked_by_spelling_and_capped():
+    index = build_distractors(WORDS, str.lower, limit=2)
+    assert index["ban"]["orthographic"] == ["bane", "bank"]
+    assert index["ban"]["level"] == ["bane", "bar"]
+    assert all(len(ids) <= 2 for lists in index.values() for ids in lists.values())
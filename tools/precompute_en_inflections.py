@@ -2,6 +2,7 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "brotli>=1.1.0",
 #     "pip>=26.0.1",
 #     "spacy>=3.8.11",
 # ]
@@ -9,297 +10,59 @@
 """Precompute English inflections for vocabulary-en.json.
 
 Usage as script:
-  python tools/precompute_en_inflections.py
+  python tools/precompute_en_inflections.py [options]
+  python tools/precompute_en_inflections.py --help
 
 Usage as library:
   from precompute_en_inflections import precompute_inflections
   result = precompute_inflections(vocab_path, out_path)
 """
 
-import json
+import argparse
 import os
 import re
+import sys
+from functools import lru_cache, partial
+
+from inflection_core import Language, add_common_arguments, load_tables, precompute
+from inflection_model import PersonTable
 
 VOCAB_PATH = os.path.join(os.getcwd(), "src", "data", "vocabulary-en.json")
 OUT_PATH = os.path.join(os.getcwd(), "public", "data", "vocabulary-en-inflections.json")
+SPACY_MODEL = "en_core_web_sm"
 
 DETERMINERS = ("the", "a", "an")
 VOWELS = "aeiou"
 
-IRREGULAR_VERBS = {
-    "be": {
-        "present": {"I": "am", "you": "are", "he": "is", "we": "are", "they": "are"},
-        "preterite": {
-            "I": "was",
-            "you": "were",
-            "he": "was",
-            "we": "were",
-            "they": "were",
-        },
-        "past_participle": "been",
-    },
-    "have": {
-        "present": {
-            "I": "have",
-            "you": "have",
-            "he": "has",
-            "we": "have",
-            "they": "have",
-        },
-        "preterite": {
-            "I": "had",
-            "you": "had",
-            "he": "had",
-            "we": "had",
-            "they": "had",
-        },
-        "past_participle": "had",
-    },
-    "do": {
-        "present": {"I": "do", "you": "do", "he": "does", "we": "do", "they": "do"},
-        "preterite": {
-            "I": "did",
-            "you": "did",
-            "he": "did",
-            "we": "did",
-            "they": "did",
-        },
-        "past_participle": "done",
-    },
-    "go": {
-        "present": {"I": "go", "you": "go", "he": "goes", "we": "go", "they": "go"},
-        "preterite": {
-            "I": "went",
-            "you": "went",
-            "he": "went",
-            "we": "went",
-            "they": "went",
-        },
-        "past_participle": "gone",
-    },
-    "say": {
-        "present": {"I": "say", "you": "say", "he": "says", "we": "say", "they": "say"},
-        "preterite": {
-            "I": "said",
-            "you": "said",
-            "he": "said",
-            "we": "said",
-            "they": "said",
-        },
-        "past_participle": "said",
-    },
-    "make": {
-        "present": {
-            "I": "make",
-            "you": "make",
-            "he": "makes",
-            "we": "make",
-            "they": "make",
-        },
-        "preterite": {
-            "I": "made",
-            "you": "made",
-            "he": "made",
-            "we": "made",
-            "they": "made",
-        },
-        "past_participle": "made",
-    },
-    "know": {
-        "present": {
-            "I": "know",
-            "you": "know",
-            "he": "knows",
-            "we": "know",
-            "they": "know",
-        },
-        "preterite": {
-            "I": "knew",
-            "you": "knew",
-            "he": "knew",
-            "we": "knew",
-            "they": "knew",
-        },
-        "past_participle": "known",
-    },
-    "think": {
-        "present": {
-            "I": "think",
-            "you": "think",
-            "he": "thinks",
-            "we": "think",
-            "they": "think",
-        },
-        "preterite": {
-            "I": "thought",
-            "you": "thought",
-            "he": "thought",
-            "we": "thought",
-            "they": "thought",
-        },
-        "past_participle": "thought",
-    },
-    "take": {
-        "present": {
-            "I": "take",
-            "you": "take",
-            "he": "takes",
-            "we": "take",
-            "they": "take",
-        },
-        "preterite": {
-            "I": "took",
-            "you": "took",
-            "he": "took",
-            "we": "took",
-            "they": "took",
-        },
-        "past_participle": "taken",
-    },
-    "see": {
-        "present": {"I": "see", "you": "see", "he": "sees", "we": "see", "they": "see"},
-        "preterite": {
-            "I": "saw",
-            "you": "saw",
-            "he": "saw",
-            "we": "saw",
-            "they": "saw",
-        },
-        "past_participle": "seen",
-    },
-    "come": {
-        "present": {
-            "I": "come",
-            "you": "come",
-            "he": "comes",
-            "we": "come",
-            "they": "come",
-        },
-        "preterite": {
-            "I": "came",
-            "you": "came",
-            "he": "came",
-            "we": "came",
-            "they": "came",
-        },
-        "past_participle": "come",
-    },
-    "write": {
-        "present": {
-            "I": "write",
-            "you": "write",
-            "he": "writes",
-            "we": "write",
-            "they": "write",
-        },
-        "preterite": {
-            "I": "wrote",
-            "you": "wrote",
-            "he": "wrote",
-            "we": "wrote",
-            "they": "wrote",
-        },
-        "past_participle": "written",
-    },
-    "eat": {
-        "present": {"I": "eat", "you": "eat", "he": "eats", "we": "eat", "they": "eat"},
-        "preterite": {
-            "I": "ate",
-            "you": "ate",
-            "he": "ate",
-            "we": "ate",
-            "they": "ate",
-        },
-        "past_participle": "eaten",
-    },
-    "run": {
-        "present": {"I": "run", "you": "run", "he": "runs", "we": "run", "they": "run"},
-        "preterite": {
-            "I": "ran",
-            "you": "ran",
-            "he": "ran",
-            "we": "ran",
-            "they": "ran",
-        },
-        "past_participle": "run",
-    },
-    "give": {
-        "present": {
-            "I": "give",
-            "you": "give",
-            "he": "gives",
-            "we": "give",
-            "they": "give",
-        },
-        "preterite": {
-            "I": "gave",
-            "you": "gave",
-            "he": "gave",
-            "we": "gave",
-            "they": "gave",
-        },
-        "past_participle": "given",
-    },
-    "bring": {
-        "present": {
-            "I": "bring",
-            "you": "bring",
-            "he": "brings",
-            "we": "bring",
-            "they": "bring",
-        },
-        "preterite": {
-            "I": "brought",
-            "you": "brought",
-            "he": "brought",
-            "we": "brought",
-            "they": "brought",
-        },
-        "past_participle": "brought",
-    },
-    "buy": {
-        "present": {"I": "buy", "you": "buy", "he": "buys", "we": "buy", "they": "buy"},
-        "preterite": {
-            "I": "bought",
-            "you": "bought",
-            "he": "bought",
-            "we": "bought",
-            "they": "bought",
-        },
-        "past_participle": "bought",
-    },
-    "feel": {
-        "present": {
-            "I": "feel",
-            "you": "feel",
-            "he": "feels",
-            "we": "feel",
-            "they": "feel",
-        },
-        "preterite": {
-            "I": "felt",
-            "you": "felt",
-            "he": "felt",
-            "we": "felt",
-            "they": "felt",
-        },
-        "past_participle": "felt",
-    },
-}
+TABLES = load_tables("en")
 
-IRREGULAR_NOUNS = {
-    "man": "men",
-    "woman": "women",
-    "child": "children",
-    "person": "people",
-    "mouse": "mice",
-    "goose": "geese",
-    "foot": "feet",
-    "tooth": "teeth",
-    "ox": "oxen",
-}
+PERSON_KEYS = tuple(TABLES["persons"])
 
-PERSON_KEYS = ["I", "you", "he", "we", "they"]
+# Articles and forms of "be", never blanked in exercises
+STOP_TOKENS = frozenset(TABLES["stop_tokens"])
+
+# be and have, whose present (and for be, preterite) forms vary by person
+SPECIAL_VERBS = TABLES["special_verbs"]
+# Irregular verb -> (preterite, past participle)
+IRREGULAR_VERBS = {
+    verb: tuple(parts.split()) for verb, parts in TABLES["irregular_verbs"].items()
+}
+VERB_PREFIXES = sorted(TABLES["verb_prefixes"], key=len, reverse=True)
+REGULAR_VERBS = frozenset(TABLES["regular_verbs"])
+# Verbs of more than one syllable that still double their final consonant
+DOUBLE_FINAL = frozenset(TABLES["double_final"])
+# Verbs in -ic that take a k before -ed ("panicked")
+CK_VERBS = frozenset(TABLES["ck_verbs"])
+# Verbs and nouns in -z that double it before -es and -ed ("quizzes")
+DOUBLE_Z = frozenset(TABLES["double_z"])
+
+NOUNS = TABLES["nouns"]
+IRREGULAR_NOUNS = NOUNS["irregular"]
+NOUNS_VES = frozenset(NOUNS["f_to_ves"])
+NOUNS_OES = frozenset(NOUNS["o_to_oes"])
+INVARIANT_NOUNS = frozenset(NOUNS["invariant"])
+NOUN_SUFFIXES = NOUNS["suffixes"]
+REGULAR_NOUNS = frozenset(NOUNS["regular"])
 
 
 def strip_determiner(text):
@@ -323,83 +86,139 @@ def add_third_person_s(base):
     """Add -s or -es for third person singular present."""
     if base.endswith("y") and len(base) > 1 and base[-2] not in VOWELS:
         return base[:-1] + "ies"
+    if base in DOUBLE_Z:
+        return base + "zes"
     if base.endswith(("o", "ch", "s", "sh", "x", "z")):
         return base + "es"
     return base + "s"
 
 
+def split_phrase(verb):
+    """Split a verb or phrasal verb into (head verb, rest of the phrase).
+
+    The rest keeps its leading space, so "break down" gives ("break", " down").
+    """
+    words = strip_determiner(verb).lower().split()
+    if len(words) > 1 and words[0] == "to":
+        words = words[1:]
+    if not words:
+        return "", ""
+    rest = " ".join(words[1:])
+    return re.sub(r"[^a-z]", "", words[0]), " " + rest if rest else ""
+
+
+@lru_cache(maxsize=None)
+def principal_parts(verb):
+    """Return (preterite, past participle) of an irregular verb, or None.
+
+    Prefixed forms of irregular verbs ("undertake", "forecast") are
+    irregular too.
+    """
+    if verb in IRREGULAR_VERBS:
+        return IRREGULAR_VERBS[verb]
+    if verb in REGULAR_VERBS:
+        return None
+    for prefix in VERB_PREFIXES:
+        base = verb[len(prefix) :]
+        if verb.startswith(prefix) and base in IRREGULAR_VERBS:
+            return tuple(prefix + part for part in IRREGULAR_VERBS[base])
+    return None
+
+
+def doubles_final(verb):
+    """Whether the final consonant doubles before -ed ("ban", "admit")."""
+    if verb in DOUBLE_FINAL or verb in DOUBLE_Z:
+        return True
+    return (
+        len(re.findall(r"[aeiou]+", verb)) == 1
+        and re.search(r"[^aeiou][aeiou][^aeiouwxy]$", verb) is not None
+    )
+
+
+def regular_past(verb):
+    """Build the -ed form of a regular verb."""
+    if verb.endswith("e"):
+        return verb + "d"
+    if verb.endswith("y") and len(verb) > 1 and verb[-2] not in VOWELS:
+        return verb[:-1] + "ied"
+    if verb in CK_VERBS:
+        return verb + "ked"
+    if doubles_final(verb):
+        return verb + verb[-1] + "ed"
+    return verb + "ed"
+
+
+def _person_index(person):
+    return PERSON_KEYS.index(person) if person in PERSON_KEYS else 0
+
+
 def conj_present(verb, person="he"):
     """Conjugate verb in present tense."""
-    base = normalize(verb)
-    info = IRREGULAR_VERBS.get(base, {})
-    if info.get("present"):
-        return info["present"].get(
-            person, base if person != "he" else add_third_person_s(base)
-        )
-    if person == "he":
-        return add_third_person_s(base)
-    return base
+    head, rest = split_phrase(verb)
+    special = SPECIAL_VERBS.get(head, {})
+    if "present" in special:
+        form = special["present"][_person_index(person)]
+    elif person == "he":
+        form = add_third_person_s(head)
+    else:
+        form = head
+    return form + rest
 
 
 def conj_preterite(verb, person=None):
     """Conjugate verb in past tense."""
-    base = normalize(verb)
-    info = IRREGULAR_VERBS.get(base, {})
-    preterite = info.get("preterite")
-    if preterite:
-        return preterite.get(person, preterite.get("I", base + "ed"))
-    if base.endswith("e"):
-        return base + "d"
-    if base.endswith("y") and len(base) > 1 and base[-2] not in VOWELS:
-        return base[:-1] + "ied"
-    if (
-        len(base) >= 3
-        and base[-1] not in VOWELS
-        and base[-2] in VOWELS
-        and base[-3] not in VOWELS
-    ):
-        return base + base[-1] + "ed"
-    return base + "ed"
+    head, rest = split_phrase(verb)
+    special = SPECIAL_VERBS.get(head, {})
+    parts = principal_parts(head)
+    if "preterite" in special:
+        form = special["preterite"][_person_index(person)]
+    elif parts:
+        form = parts[0]
+    else:
+        form = regular_past(head)
+    return form + rest
 
 
 def past_participle(verb):
     """Generate past participle of verb."""
-    base = normalize(verb)
-    info = IRREGULAR_VERBS.get(base, {})
-    if info.get("past_participle"):
-        return info["past_participle"]
-    return conj_preterite(verb)
+    head, rest = split_phrase(verb)
+    special = SPECIAL_VERBS.get(head, {})
+    parts = principal_parts(head)
+    if "past_participle" in special:
+        form = special["past_participle"]
+    elif parts:
+        form = parts[1]
+    else:
+        form = regular_past(head)
+    return form + rest
 
 
 def pluralize_noun(noun):
-    """Generate plural form of noun."""
+    """Generate plural form of noun; compounds pluralize their last word."""
     base = strip_determiner(noun)
-    norm = normalize(base)
-    if norm in IRREGULAR_NOUNS:
-        return IRREGULAR_NOUNS[norm]
+    head = base[base.rfind(" ") + 1 :]
+    low = head.lower()
+    if low in INVARIANT_NOUNS:
+        return base
+    if low in IRREGULAR_NOUNS:
+        return base[: len(base) - len(head)] + IRREGULAR_NOUNS[low]
+    if low in NOUNS_VES:
+        return re.sub(r"fe?$", "ves", base)
+    if low in NOUNS_OES:
+        return base + "es"
+    if low not in REGULAR_NOUNS:
+        for suffix, ending in NOUN_SUFFIXES:
+            if low.endswith(suffix):
+                return base[: len(base) - len(suffix)] + ending
     if base.endswith("y") and len(base) > 1 and base[-2].lower() not in VOWELS:
         return base[:-1] + "ies"
+    if low in DOUBLE_Z:
+        return base + "zes"
     if base.endswith(("s", "sh", "ch", "x", "z")):
         return base + "es"
     return base + "s"
 
 
-def load_spacy():
-    """Load spaCy English model if available."""
-    try:
-        import spacy
-        from spacy.cli import download as download_module
-
-        try:
-            download_module("en_core_web_sm")
-        except Exception:
-            pass
-        nlp = spacy.load("en_core_web_sm")
-        return True, nlp
-    except Exception:
-        return False, None
-
-
 def map_person_number(person, number):
     """Map spaCy Person/Number to English person key."""
     if person == "1" and number == "Sing":
@@ -413,193 +232,124 @@ def map_person_number(person, number):
     return "he"
 
 
-def flatten_forms(forms_dict):
-    """Deduplicate forms by flattening feature lists."""
-    forms_list = []
-    for form_key, data in forms_dict.items():
-        feats_seen = set()
-        unique_feats = []
-        for feats in data["features"]:
-            feats_json = json.dumps(feats, sort_keys=True, ensure_ascii=False)
-            if feats_json not in feats_seen:
-                feats_seen.add(feats_json)
-                unique_feats.append(feats)
-        if unique_feats:
-            forms_list.append({"form": data["form"], "features": unique_feats[0]})
-    return forms_list
-
-
-def precompute_inflections(vocab_path, out_path):
-    """Main function to precompute inflections from vocabulary."""
-    has_spacy, nlp = load_spacy()
-    print("spaCy available:", has_spacy)
-
-    if not os.path.exists(vocab_path):
-        print("Vocabulary file not found:", vocab_path)
+def word_entry(w):
+    """Build the rule-generated entry for a vocabulary word.
+
+    Returns (key, alias_key, entry), or None for incomplete words.
+    """
+    wid = w.get("id")
+    word_txt = w.get("word") or ""
+    pos = w.get("partOfSpeech")
+    lemma = strip_determiner(word_txt)
+    if not wid or not word_txt:
         return None
 
-    with open(vocab_path, "r", encoding="utf-8") as fh:
-        vocab = json.load(fh)
-
-    words = vocab.get("words") or []
-    print("Loaded", len(words), "English vocabulary entries")
-
-    inflections = {}
-
-    # Generate inflections for each vocabulary word
-    for w in words:
-        wid = w.get("id")
-        word_txt = w.get("word") or ""
-        pos = w.get("partOfSpeech")
-        lemma = strip_determiner(word_txt)
-        if not wid or not word_txt:
-            continue
-
-        entry = {"base": word_txt, "pos": pos, "lemma": lemma}
-
-        if pos == "verb":
-            entry["present"] = {p: conj_present(word_txt, p) for p in PERSON_KEYS}
-            entry["preterite"] = {p: conj_preterite(word_txt, p) for p in PERSON_KEYS}
-            entry["past_participle"] = past_participle(word_txt)
-        elif pos == "noun":
-            entry["plural"] = pluralize_noun(word_txt)
-
-        inflections[wid] = entry
-        norm_key = normalize(lemma)
-        if norm_key and norm_key not in inflections:
-            inflections[norm_key] = entry
-
-    # Collect observed forms from example sentences
-    observed = {}
-
-    for w in words:
-        example = w.get("example") or ""
-        if not example or not has_spacy or not nlp:
-            continue
-
-        doc = nlp(example)
-        for tok in doc:
-            if not tok.is_alpha:
-                continue
-
-            # Map spaCy POS
-            if tok.pos_ == "VERB":
-                p = "verb"
-            elif tok.pos_ == "NOUN":
-                p = "noun"
-            elif tok.pos_ == "ADJ":
-                p = "adjective"
-            else:
-                continue
-
-            lemma_key = normalize(tok.lemma_ or tok.text)
-            if not lemma_key:
-                continue
-
-            feats = tok.morph.to_dict() if tok.morph else {}
-            form_key = tok.text
-
-            if lemma_key not in observed:
-                observed[lemma_key] = {
-                    "forms": {},
-                    "pos": p,
-                    "lemma": tok.lemma_ or tok.text,
-                }
-
-            forms = observed[lemma_key]["forms"]
-            if form_key not in forms:
-                forms[form_key] = {"form": tok.text, "features": [feats]}
-            else:
-                forms[form_key]["features"].append(feats)
-
-    # Merge observed forms and detect irregulars
-    irregular = {"verbs": {}, "nouns": {}}
-
-    for lemma_key, data in observed.items():
-        forms_list = flatten_forms(data["forms"])
-        pos = data["pos"]
-        lemma = data["lemma"]
-
-        entry = inflections.get(lemma_key)
-        if not entry:
-            entry = {"base": lemma, "pos": pos, "lemma": lemma}
-            if pos == "verb":
-                entry["present"] = {p: conj_present(lemma, p) for p in PERSON_KEYS}
-                entry["preterite"] = {p: conj_preterite(lemma, p) for p in PERSON_KEYS}
-                entry["past_participle"] = past_participle(lemma)
-            elif pos == "noun":
-                entry["plural"] = pluralize_noun(lemma)
-            inflections[lemma_key] = entry
-
-        entry["observed"] = forms_list
-
-        if pos == "verb":
-            gen_present = entry.get("present", {})
-            gen_pret = entry.get("preterite", {})
-            gen_part = entry.get("past_participle")
-
-            for obs in forms_list:
-                feats = obs.get("features", {})
-                person = map_person_number(feats.get("Person"), feats.get("Number"))
-                form_norm = normalize(obs["form"])
-
-                # Present tense (exclude gerunds and participles)
-                if feats.get("Tense") == "Pres" and feats.get("VerbForm") != "Ger" and feats.get("VerbForm") != "Part":
-                    gen_form = gen_present.get(person)
-                    if gen_form and normalize(gen_form) != form_norm:
-                        irregular["verbs"].setdefault(lemma_key, {}).setdefault(
-                            "present", {}
-                        )[person] = obs["form"]
-                        entry["present"][person] = obs["form"]
-
-                # Past tense
-                elif feats.get("Tense") == "Past" and feats.get("VerbForm") != "Part":
-                    gen_form = gen_pret.get(person)
-                    if gen_form and normalize(gen_form) != form_norm:
-                        irregular["verbs"].setdefault(lemma_key, {}).setdefault(
-                            "preterite", {}
-                        )[person] = obs["form"]
-                        entry["preterite"][person] = obs["form"]
-
-                # Past participle
-                elif feats.get("VerbForm") == "Part":
-                    if gen_part and normalize(gen_part) != form_norm:
-                        irregular["verbs"].setdefault(lemma_key, {})[
-                            "past_participle"
-                        ] = obs["form"]
-                        entry["past_participle"] = obs["form"]
-
-        elif pos == "noun":
-            gen_plural = entry.get("plural", "")
-            for obs in forms_list:
-                feats = obs.get("features", {})
-                if feats.get("Number") == "Plur" and gen_plural:
-                    if normalize(gen_plural) != normalize(obs["form"]):
-                        irregular["nouns"].setdefault(lemma_key, {})["plural"] = obs[
-                            "form"
-                        ]
-                        entry["plural"] = obs["form"]
-
-    # Add metadata
-    if irregular["verbs"] or irregular["nouns"]:
-        inflections["__meta"] = {"irregular": irregular}
-
-    # Write output
-    with open(out_path, "w", encoding="utf-8") as fh:
-        json.dump(
-            {"meta": {"spaCy": has_spacy}, "inflections": inflections},
-            fh,
-            ensure_ascii=False,
-            indent=2,
-        )
-
-    print("Wrote English inflections to", out_path)
-    return inflections
+    entry = {"base": word_txt, "pos": pos, "lemma": lemma}
+
+    if pos == "verb":
+        entry["present"] = PersonTable.build(PERSON_KEYS, partial(conj_present, word_txt))
+        entry["preterite"] = PersonTable.build(PERSON_KEYS, partial(conj_preterite, word_txt))
+        entry["past_participle"] = past_participle(word_txt)
+    elif pos == "noun":
+        entry["plural"] = pluralize_noun(word_txt)
+
+    return wid, normalize(lemma), entry
+
+
+def lemma_entry(lemma, pos):
+    """Build an entry for a lemma that only occurs in example sentences."""
+    entry = {"base": lemma, "pos": pos, "lemma": lemma}
+    if pos == "verb":
+        entry["present"] = PersonTable.build(PERSON_KEYS, partial(conj_present, lemma))
+        entry["preterite"] = PersonTable.build(PERSON_KEYS, partial(conj_preterite, lemma))
+        entry["past_participle"] = past_participle(lemma)
+    elif pos == "noun":
+        entry["plural"] = pluralize_noun(lemma)
+    return entry
+
+
+def merge_observed(entry, lemma_key, pos, forms_list, irregular):
+    """Attach observed forms to an entry and record irregular overrides."""
+    entry["observed"] = forms_list
+
+    if pos == "verb":
+        gen_present = entry.get("present", {})
+        gen_pret = entry.get("preterite", {})
+        gen_part = entry.get("past_participle")
+
+        for obs in forms_list:
+            feats = obs.get("features", {})
+            person = map_person_number(feats.get("Person"), feats.get("Number"))
+            form_norm = normalize(obs["form"])
+
+            # Present tense (exclude gerunds and participles)
+            if feats.get("Tense") == "Pres" and feats.get("VerbForm") != "Ger" and feats.get("VerbForm") != "Part":
+                gen_form = gen_present.get(person)
+                if gen_form and normalize(gen_form) != form_norm:
+                    irregular["verbs"].setdefault(lemma_key, {}).setdefault(
+                        "present", {}
+                    )[person] = obs["form"]
+                    entry["present"][person] = obs["form"]
+
+            # Past tense
+            elif feats.get("Tense") == "Past" and feats.get("VerbForm") != "Part":
+                gen_form = gen_pret.get(person)
+                if gen_form and normalize(gen_form) != form_norm:
+                    irregular["verbs"].setdefault(lemma_key, {}).setdefault(
+                        "preterite", {}
+                    )[person] = obs["form"]
+                    entry["preterite"][person] = obs["form"]
+
+            # Past participle
+            elif feats.get("VerbForm") == "Part":
+                if gen_part and normalize(gen_part) != form_norm:
+                    irregular["verbs"].setdefault(lemma_key, {})[
+                        "past_participle"
+                    ] = obs["form"]
+                    entry["past_participle"] = obs["form"]
+
+    elif pos == "noun":
+        gen_plural = entry.get("plural", "")
+        for obs in forms_list:
+            feats = obs.get("features", {})
+            if feats.get("Number") == "Plur" and gen_plural:
+                if normalize(gen_plural) != normalize(obs["form"]):
+                    irregular["nouns"].setdefault(lemma_key, {})["plural"] = obs[
+                        "form"
+                    ]
+                    entry["plural"] = obs["form"]
+
+
+LANGUAGE = Language(
+    name="English",
+    code="en",
+    model=SPACY_MODEL,
+    normalize=normalize,
+    word_entry=word_entry,
+    lemma_entry=lemma_entry,
+    merge_observed=merge_observed,
+    stop_tokens=STOP_TOKENS,
+)
+
+
+def precompute_inflections(vocab_path, out_path, **options):
+    """Main function to precompute inflections from vocabulary.
+
+    Options are the keyword arguments of inflection_core.precompute.
+    """
+    return precompute(LANGUAGE, vocab_path, out_path, **options)
 
 
 def main():
     """CLI entry point."""
-    precompute_inflections(VOCAB_PATH, OUT_PATH)
+    parser = argparse.ArgumentParser(description="Precompute English inflections.")
+    args = add_common_arguments(parser).parse_args()
+    try:
+        result = precompute_inflections(VOCAB_PATH, OUT_PATH, **vars(args))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.check and not result:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
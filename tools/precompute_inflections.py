@@ -0,0 +1,148 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "brotli>=1.1.0",
+#     "pip>=26.0.1",
+#     "spacy>=3.8.11",
+# ]
+# ///
+"""
+Precompute inflections for several languages at once.
+
+Each language runs in its own worker process, so a full rebuild takes
+about as long as the slowest language. The language-specific rules live in
+the precompute_<code>_inflections modules; everything else is shared
+through inflection_core.
+
+Usage:
+  python tools/precompute_inflections.py [--lang de,en] [options]
+  python tools/precompute_inflections.py --help
+"""
+
+import argparse
+import importlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from inflection_core import add_common_arguments
+
+# Language code -> module holding its rules, vocabulary and output paths
+LANGUAGES = {
+    "de": "precompute_de_inflections",
+    "en": "precompute_en_inflections",
+}
+
+
+def run_language(code, options):
+    """Precompute one language; returns (code, seconds, captured output)."""
+    module = importlib.import_module(LANGUAGES[code])
+    if options.get("watch"):
+        # Watchers run until interrupted, so they print as they go
+        module.precompute_inflections(module.VOCAB_PATH, module.OUT_PATH, **options)
+        return code, 0.0, ""
+    log = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(log):
+        module.precompute_inflections(module.VOCAB_PATH, module.OUT_PATH, **options)
+    return code, time.perf_counter() - start, log.getvalue()
+
+
+def language_options(code, options, several):
+    """Give each language its own profile, corpus and database files when running several."""
+    if not several:
+        return options
+    options = dict(options)
+    for name in ("profile_output", "corpus_store", "sqlite_path"):
+        if options.get(name):
+            root, ext = os.path.splitext(options[name])
+            options[name] = f"{root}-{code}{ext}"
+    return options
+
+
+def check_languages(codes, **options):
+    """Check every language in codes in this process (see --check).
+
+    Returns the codes whose outputs are stale.
+    """
+    stale = []
+    for code in codes:
+        module = importlib.import_module(LANGUAGES[code])
+        language_opts = language_options(code, options, len(codes) > 1)
+        if not module.precompute_inflections(
+            module.VOCAB_PATH, module.OUT_PATH, **language_opts
+        ):
+            stale.append(code)
+    return stale
+
+
+def precompute_languages(codes, workers=None, **options):
+    """Precompute every language in codes, in parallel worker processes.
+
+    Options are the keyword arguments of inflection_core.precompute.
+    Returns a dict of wall-clock seconds per language.
+    """
+    unknown = [code for code in codes if code not in LANGUAGES]
+    if unknown:
+        raise ValueError(f"unknown language(s): {', '.join(unknown)}")
+
+    several = len(codes) > 1
+    timings = {}
+    with ProcessPoolExecutor(max_workers=workers or len(codes)) as pool:
+        futures = [
+            pool.submit(run_language, code, language_options(code, options, several))
+            for code in codes
+        ]
+        for future in futures:
+            code, seconds, log = future.result()
+            for line in log.splitlines():
+                print(f"[{code}] {line}")
+            timings[code] = seconds
+    return timings
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Precompute inflections for several languages in parallel."
+    )
+    parser.add_argument(
+        "--lang",
+        default=",".join(LANGUAGES),
+        help="comma-separated language codes (default: all)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of worker processes (default: one per language)",
+    )
+    options = vars(add_common_arguments(parser).parse_args())
+    codes = [code for code in options.pop("lang").split(",") if code]
+    workers = options.pop("workers")
+
+    if options["check"]:
+        unknown = [code for code in codes if code not in LANGUAGES]
+        if unknown:
+            parser.error(f"unknown language(s): {', '.join(unknown)}")
+        # Checking only hashes files, so worker processes would cost more than they save
+        sys.exit(1 if check_languages(codes, **options) else 0)
+
+    start = time.perf_counter()
+    try:
+        timings = precompute_languages(codes, workers=workers, **options)
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        return
+    print(
+        f"Precomputed {', '.join(timings)} in {time.perf_counter() - start:.2f}s",
+        f"({', '.join(f'{code} {s:.2f}s' for code, s in timings.items())})",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pip>=26.0.1",
+#     "spacy>=3.8.11",
+# ]
+# ///
+"""
+Serve the inflection rules and spaCy analysis over a local JSON API.
+
+The spaCy models are loaded once at startup and stay warm; repeated
+queries are answered from a bounded LRU cache. The server only listens on
+localhost (or a Unix socket) and never needs the network.
+
+Endpoints:
+  GET  /health   languages, spaCy availability and cache statistics
+  POST /inflect  {"lang": "de", "op": "conj_present", "word": "gehen", "person": "er"}
+                 or {"lang": "de", "requests": [{"op": ..., "word": ...}, ...]}
+  POST /analyze  {"lang": "de", "sentences": ["Er ging nach Hause.", ...]}
+
+Operations: conj_present and conj_preterite (word, optional person),
+past_participle and pluralize_noun (word), entry (word, pos).
+
+Usage:
+  python tools/serve_inflections.py [--port 8765 | --socket PATH] [options]
+  curl -s localhost:8765/inflect -d '{"lang": "de", "op": "past_participle", "word": "anfangen"}'
+"""
+
+import argparse
+import importlib
+import json
+import os
+import socketserver
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from inflection_core import DEFAULT_BATCH_SIZE, DEFAULT_CACHE_DIR, Analyzer
+from inflection_model import to_json
+from precompute_inflections import LANGUAGES
+
+DEFAULT_PORT = 8765
+DEFAULT_LRU_SIZE = 65536
+# Largest request body accepted, in bytes
+MAX_BODY = 16 << 20
+
+# Operation -> optional request fields passed after the word
+OPERATIONS = {
+    "conj_present": ("person",),
+    "conj_preterite": ("person",),
+    "past_participle": (),
+    "pluralize_noun": (),
+    "entry": ("pos",),
+}
+
+
+class RequestError(ValueError):
+    """A request the service cannot answer; reported back to the client."""
+
+
+def _persons(module):
+    """Person keys a language module conjugates for."""
+    return getattr(module, "PERSONS", None) or module.PERSON_KEYS
+
+
+class LRUCache:
+    """A thread-safe mapping that forgets the least recently used keys."""
+
+    def __init__(self, maxsize=DEFAULT_LRU_SIZE):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return self.data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def stats(self):
+        return {"size": len(self.data), "hits": self.hits, "misses": self.misses}
+
+
+class InflectionService:
+    """Answer inflection and analysis queries for a set of languages."""
+
+    def __init__(
+        self,
+        codes,
+        use_spacy=True,
+        cache_size=DEFAULT_LRU_SIZE,
+        cache_dir=DEFAULT_CACHE_DIR,
+        download=False,
+        batch_size=DEFAULT_BATCH_SIZE,
+    ):
+        unknown = [code for code in codes if code not in LANGUAGES]
+        if unknown:
+            raise ValueError(f"unknown language(s): {', '.join(unknown)}")
+        self.modules = {code: importlib.import_module(LANGUAGES[code]) for code in codes}
+        self.analyzers = {
+            code: Analyzer(
+                module.LANGUAGE.model,
+                cache_dir=cache_dir,
+                download=download,
+                batch_size=batch_size,
+                enabled=use_spacy,
+            )
+            for code, module in self.modules.items()
+        }
+        self.has_spacy = {code: False for code in codes}
+        # spaCy pipelines are not safe to share between request threads
+        self.analyzer_lock = threading.Lock()
+        self.cache = LRUCache(cache_size)
+
+    def warm(self):
+        """Load every spaCy model up front."""
+        for code, analyzer in self.analyzers.items():
+            self.has_spacy[code] = analyzer.enabled and analyzer.load()
+
+    def close(self):
+        for analyzer in self.analyzers.values():
+            analyzer.close()
+
+    def _module(self, code):
+        if code not in self.modules:
+            raise RequestError(f"unknown language: {code!r}")
+        return self.modules[code]
+
+    def inflect(self, code, request):
+        """Answer one inflection request: a dict with op, word and options."""
+        module = self._module(code)
+        if not isinstance(request, dict):
+            raise RequestError("request must be a JSON object")
+        op = request.get("op")
+        if op not in OPERATIONS:
+            raise RequestError(f"unknown op: {op!r}")
+        word = request.get("word")
+        if not isinstance(word, str) or not word:
+            raise RequestError("word must be a non-empty string")
+        extra = tuple(
+            request[name] for name in OPERATIONS[op] if request.get(name) is not None
+        )
+        for name, value in zip(OPERATIONS[op], extra):
+            if not isinstance(value, str):
+                raise RequestError(f"{name} must be a string")
+        if op in ("conj_present", "conj_preterite") and extra:
+            persons = _persons(module)
+            if extra[0] not in persons:
+                raise RequestError(
+                    f"unknown person: {extra[0]!r} (expected one of {', '.join(persons)})"
+                )
+
+        key = ("inflect", code, op, word, extra)
+        result = self.cache.get(key)
+        if result is None:
+            if op == "entry":
+                pos = extra[0] if extra else None
+                result = module.LANGUAGE.lemma_entry(word, pos)
+            else:
+                result = getattr(module, op)(word, *extra)
+            self.cache.put(key, result)
+        return result
+
+    def inflect_batch(self, code, requests):
+        """Answer a list of requests; failures are reported per item."""
+        results = []
+        for request in requests:
+            try:
+                results.append({"result": self.inflect(code, request)})
+            except RequestError as e:
+                results.append({"error": str(e)})
+        return results
+
+    def analyze(self, code, sentences):
+        """Return the tokens of each sentence, parsing cache misses in one batch."""
+        self._module(code)
+        if not all(isinstance(s, str) for s in sentences):
+            raise RequestError("sentences must be strings")
+        found = {s: self.cache.get(("analyze", code, s)) for s in dict.fromkeys(sentences)}
+        missing = [s for s, tokens in found.items() if tokens is None]
+        if missing:
+            with self.analyzer_lock:
+                has_spacy, analyses = self.analyzers[code].analyze(missing)
+            self.has_spacy[code] = has_spacy
+            if not has_spacy:
+                raise RequestError(f"spaCy is not available for {code!r}")
+            for s in missing:
+                tokens = [t._asdict() for t in analyses.get(s, ())]
+                found[s] = tokens
+                self.cache.put(("analyze", code, s), tokens)
+        return [found[s] for s in sentences]
+
+    def health(self):
+        return {
+            "languages": list(self.modules),
+            "spaCy": self.has_spacy,
+            "cache": self.cache.stats(),
+        }
+
+
+class Handler(BaseHTTPRequestHandler):
+    """JSON over HTTP; the service is attached to the server."""
+
+    server_version = "InflectionService/1"
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=to_json).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        """Read a body of the declared length, at most MAX_BODY bytes."""
+        value = self.headers.get("Content-Length") or "0"
+        if not (value.isascii() and value.isdigit()):
+            # The body cannot be skipped without a length; drop the connection
+            self.close_connection = True
+            raise RequestError(f"invalid Content-Length: {value!r}")
+        if int(value) > MAX_BODY:
+            self.close_connection = True
+            raise RequestError(f"request body larger than {MAX_BODY} bytes")
+        return self.rfile.read(int(value))
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.server.service.health())
+        else:
+            self._send(404, {"error": f"no such endpoint: {self.path}"})
+
+    def do_POST(self):
+        service = self.server.service
+        try:
+            try:
+                request = json.loads(self._read_body() or b"{}")
+            except ValueError as e:
+                raise RequestError(f"invalid JSON: {e}") from None
+            if not isinstance(request, dict):
+                raise RequestError("request must be a JSON object")
+            code = request.get("lang")
+
+            if self.path == "/inflect":
+                if "requests" in request:
+                    batch = request["requests"]
+                    if not isinstance(batch, list):
+                        raise RequestError("requests must be a list")
+                    self._send(200, {"results": service.inflect_batch(code, batch)})
+                else:
+                    self._send(200, {"result": service.inflect(code, request)})
+            elif self.path == "/analyze":
+                sentences = request.get("sentences")
+                if not isinstance(sentences, list):
+                    raise RequestError("sentences must be a list")
+                self._send(200, {"results": service.analyze(code, sentences)})
+            else:
+                self._send(404, {"error": f"no such endpoint: {self.path}"})
+        except RequestError as e:
+            self._send(400, {"error": str(e)})
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, host="127.0.0.1", port=DEFAULT_PORT, socket_path=None):
+    """Create a threaded HTTP server on a TCP port or a Unix socket."""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), Handler)
+    server.service = service
+    return server
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Serve inflection rules and spaCy analysis on localhost."
+    )
+    parser.add_argument(
+        "--lang",
+        default=",".join(LANGUAGES),
+        help="comma-separated language codes to serve (default: all)",
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="address to listen on (default: localhost)"
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument(
+        "--lru-size",
+        type=int,
+        default=DEFAULT_LRU_SIZE,
+        help="number of answers kept in the in-memory LRU cache",
+    )
+    parser.add_argument(
+        "--no-spacy",
+        dest="use_spacy",
+        action="store_false",
+        help="serve the rule functions only; /analyze is unavailable",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="directory of the sentence analysis cache",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="do not read or write the sentence analysis cache",
+    )
+    parser.add_argument(
+        "--download-model",
+        action="store_true",
+        help="download the spaCy models if they are not installed",
+    )
+    args = parser.parse_args()
+
+    codes = [code for code in args.lang.split(",") if code]
+    try:
+        service = InflectionService(
+            codes,
+            use_spacy=args.use_spacy,
+            cache_size=args.lru_size,
+            cache_dir=args.cache_dir,
+            download=args.download_model,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    service.warm()
+    print("spaCy available:", ", ".join(f"{c}={v}" for c, v in service.has_spacy.items()))
+
+    server = make_server(service, args.host, args.port, args.socket)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print("Serving inflections for", ", ".join(codes), "on", where, "(Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+import serve_inflections
+from serve_inflections import InflectionService, make_server
+
+
+@pytest.fixture
+def server():
+    service = InflectionService(["de"], use_spacy=False, cache_dir=None)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, body, length):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    conn.putrequest("POST", "/inflect")
+    conn.putheader("Content-Length", length)
+    conn.endheaders()
+    conn.send(body)
+    response = conn.getresponse()
+    result = response.status, json.loads(response.read())
+    conn.close()
+    return result
+
+
+def test_inflect(server):
+    body = json.dumps({"lang": "de", "op": "past_participle", "word": "machen"}).encode()
+    assert _post(server, body, str(len(body))) == (200, {"result": "gemacht"})
+
+
+@pytest.mark.parametrize("length", ["abc", "-1", "+2", "1e3"])
+def test_invalid_content_length(server, length):
+    status, payload = _post(server, b"{}", length)
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_body_too_large(server, monkeypatch):
+    monkeypatch.setattr(serve_inflections, "MAX_BODY", 8)
+    status, payload = _post(server, b"{}", "9")
+    assert status == 400
+    assert "larger than 8 bytes" in payload["error"]